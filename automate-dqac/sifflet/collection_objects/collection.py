@@ -2,12 +2,15 @@ from __future__ import annotations
 from collections import OrderedDict
 
 import os
+import sys
 import typing as t
 from typing import List
 from uuid import UUID
 
 
-from sifflet.utils import dump_dict_to_yaml_file, merge_yaml_files, read_yaml_file
+from sifflet.layered_values import layer_values
+from sifflet.utils import dump_dict_to_yaml_file, read_yaml_file
+from .discovery import IgnoreRules, scan_collection
 from .monitor import Monitor
 from .errors.classes import check_data_structure
 from .types import CollectionMonitorsFileDict
@@ -25,24 +28,143 @@ class Collection:
     def __init__(
         self,
         collection_root: str,
-        database: Database,
+        database: t.Optional[Database],
         parent_collection: t.Optional[Collection] = None,
+        default_values: t.Optional[OrderedDict] = None,
+        load_monitors: bool = True,
+        ignore_rules: t.Optional[IgnoreRules] = None,
+        tree_monitors: t.Optional[t.Dict[str, Monitor]] = None,
     ) -> None:
+        """
+        Args:
+            collection_root (str): The path to the collection folder
+            database (Database): The database storing the monitors uuids. None
+                when the uuids are not needed, e.g. to check the monitors.
+            parent_collection (Collection): [Optional] The parent collection, whose
+                default values are merged with the collection's ones.
+            default_values (dict): [Optional] The already merged default values of
+                the collection, e.g. computed by another process. The default values
+                files are not read when given.
+            load_monitors (bool): Read the monitors files. Defaults to True. When
+                False, the monitors are loaded later with `load_monitors`.
+            ignore_rules (IgnoreRules): [Optional] The `.dqacignore` rules of the
+                parent folders. Defaults to the parent collection's rules.
+            tree_monitors (dict): [Optional] The monitors of the whole collections
+                tree by key, shared by its collections to check that the keys are
+                unique across collections. Defaults to the parent collection's.
+        """
         self.database = database
         self.collection_root = collection_root
-        self.default_values = self.get_default_values(parent_collection)
+        # Shared by the names of all the monitors of the collection
+        self.name = sys.intern(collection_root.replace(os.sep, "."))
+        self.name_parts = tuple(self.name.split("."))
+        self.parent_collection = parent_collection
+        # Child collections by folder name, filled when they are built
+        self.child_collections: t.Dict[str, Collection] = {}
+        if ignore_rules is None:
+            ignore_rules = (
+                parent_collection.ignore_rules
+                if parent_collection is not None
+                else IgnoreRules()
+            )
+        self.inherited_ignore_rules = ignore_rules
+        # The folder is listed once, for its child collections and monitors files
+        entries = scan_collection(collection_root, ignore_rules)
+        self.ignore_rules = entries.ignore_rules
+        self.child_collections_roots = entries.child_collections_roots
+        self.monitors_files = entries.monitors_files
+        self.has_default_values = entries.has_default_values
+        if default_values is None:
+            default_values = self.get_default_values(parent_collection)
+        self.default_values = default_values
+        # Default values of the monitors files, by file name: the collection's
+        # default values and the file's ones they were merged from, and the result
+        self.files_default_values: t.Dict[
+            str, t.Tuple[OrderedDict, OrderedDict, OrderedDict]
+        ] = {}
+        if tree_monitors is None and parent_collection is not None:
+            tree_monitors = parent_collection.tree_monitors
+        self.tree_monitors = tree_monitors
+        self.monitors: List[Monitor] = []
+        # The monitors by key, maintained with `self.monitors`
+        self.monitors_by_key: t.Dict[str, Monitor] = {}
+        if load_monitors:
+            self.load_monitors()
+        # Only linked once built, so that the subtree of the parent does not contain
+        # a collection that failed to build
+        if parent_collection is not None:
+            parent_collection.child_collections[self.name_parts[-1]] = self
+
+    def load_monitors(self) -> None:
+        """
+        Reads the monitors files of the collection, and checks that the monitors
+        have a unique name.
+        """
         self.monitors = self.get_monitors()
         self.check_monitors_unicity()
 
+    def iter_ancestors(self) -> t.Iterator[Collection]:
+        """
+        Returns:
+            Iterator[Collection]: The parent collections, from the closest one
+        """
+        collection = self.parent_collection
+        while collection is not None:
+            yield collection
+            collection = collection.parent_collection
+
+    def iter_subtree(self) -> t.Iterator[Collection]:
+        """
+        Returns:
+            Iterator[Collection]: The collection and all its built children,
+                parents first
+        """
+        yield self
+        for child_collection in self.child_collections.values():
+            yield from child_collection.iter_subtree()
+
     def check_monitors_unicity(self) -> None:
         """
-        Check that all the monitors have a unique name
+        Indexes all the monitors by key, and checks that they have a unique name.
+        The monitors added later are indexed one by one with `index_monitor`.
         """
-        monitors_names = [str(monitor) for monitor in self.monitors]
-        if len(monitors_names) != len(set(monitors_names)):
-            raise ValueError(
-                f"Monitors identifiers must be unique in the collection {self.collection_root}"
-            )
+        if self.tree_monitors is not None:
+            for key, monitor in self.monitors_by_key.items():
+                if self.tree_monitors.get(key) is monitor:
+                    del self.tree_monitors[key]
+        self.monitors_by_key = {}
+        for monitor in self.monitors:
+            self.index_monitor(monitor)
+
+    def index_monitor(
+        self, monitor: Monitor, replaced_monitor: t.Optional[Monitor] = None
+    ) -> None:
+        """
+        Indexes a monitor by key, in the collection and in the collections tree if
+        any, and checks that its key is unique.
+
+        Args:
+            monitor (Monitor): The monitor to index
+            replaced_monitor (Monitor): [Optional] The monitor with the same key
+                that the monitor replaces
+        """
+        key = str(monitor)
+        if self.monitors_by_key.get(key, replaced_monitor) is not replaced_monitor:
+            self.raise_duplicate_monitors()
+        if self.tree_monitors is not None:
+            tree_monitor = self.tree_monitors.get(key, replaced_monitor)
+            if tree_monitor is not replaced_monitor:
+                raise ValueError(
+                    f"Monitor {key} is declared in both collections "
+                    f"{tree_monitor.collection} and {self}"
+                )
+            self.tree_monitors[key] = monitor
+        self.monitors_by_key[key] = monitor
+
+    def raise_duplicate_monitors(self) -> None:
+        raise ValueError(
+            f"Monitors identifiers must be unique in the collection {self.collection_root}"
+        )
 
     def get_default_values(
         self, parent_collection: t.Optional[Collection]
@@ -58,23 +180,56 @@ class Collection:
         Returns:
             dict: The default values of the collection
         """
-        collection_default_values_file = os.path.join(
-            self.collection_root, DEFAULT_VALUES_FILENAME
-        )
-        if not os.path.exists(collection_default_values_file):
+        if not self.has_default_values:
             default_values = OrderedDict({})
         else:
-            default_values = read_yaml_file(collection_default_values_file)
+            default_values = read_yaml_file(
+                os.path.join(self.collection_root, DEFAULT_VALUES_FILENAME)
+            )
 
         if parent_collection is None:
             return default_values
 
-        merged_default_values = merge_yaml_files(
-            parent_collection.default_values, default_values
-        )
+        return layer_values(parent_collection.default_values, default_values)
+
+    def get_file_default_values(
+        self, filename: str, file_default_values: t.Optional[OrderedDict]
+    ) -> OrderedDict:
+        """
+        Returns the default values of the monitors of a file: the default values of
+        the collection, overridden by the `default_values` key of the file. The
+        merge is computed once per file, and again only if the default values of
+        the collection are replaced or the ones of the file changed.
 
+        Args:
+            filename (str): The name of the monitors file
+            file_default_values (dict): The `default_values` key of the file, if any
+
+        Returns:
+            dict: The default values to merge the monitors of the file with
+        """
+        if not file_default_values:
+            return self.default_values
+        cached = self.files_default_values.get(filename)
+        if (
+            cached is not None
+            and cached[0] is self.default_values
+            and cached[1] == file_default_values
+        ):
+            return cached[2]
+        merged_default_values = layer_values(self.default_values, file_default_values)
+        self.files_default_values[filename] = (
+            self.default_values,
+            file_default_values,
+            merged_default_values,
+        )
         return merged_default_values
 
+    def get_database(self) -> Database:
+        if self.database is None:
+            raise ValueError(f"The collection {self} was loaded without a database")
+        return self.database
+
     def get_monitor_uuid(self, monitor_identifier: str) -> UUID:
         """
         Reads the database to retrieve the uuid of the monitor and write it to the
@@ -83,23 +238,34 @@ class Collection:
             monitor_identifier (str): The monitor identifier
             uuid_value (str): The uuid value
         """
-        uuid_value = self.database.read_uuid(monitor_identifier)
+        database = self.get_database()
+        uuid_value = database.read_uuid(monitor_identifier)
         if not uuid_value:
-            uuid_value = self.database.add_uuid(monitor_identifier)
+            uuid_value = database.add_uuid(monitor_identifier)
         return uuid_value
 
-    def get_monitors_files(self) -> List[str]:
+    def get_monitors_uuids(self, read_only: bool = False) -> t.Dict[str, str]:
         """
+        Resolves the uuids of all the monitors of the collection in a single database
+        operation. Monitors that are not in the database are added, unless
+        `read_only` is set.
+        Args:
+            read_only (bool): Raise an error if a monitor is not in the database.
+
         Returns:
-            list[str]: The list of monitors files
+            dict: The uuid of each monitor, by monitor name
         """
-        monitors_files = [
-            file
-            for file in os.listdir(self.collection_root)
-            if file.endswith((".yaml", ".yml")) and file != DEFAULT_VALUES_FILENAME
-        ]
+        return self.get_database().read_or_add_many(
+            [str(monitor) for monitor in self.monitors], read_only=read_only
+        )
 
-        return monitors_files
+    def get_monitors_files(self) -> List[str]:
+        """
+        Returns:
+            list[str]: The names of the monitors files, found when the collection
+                was built
+        """
+        return list(self.monitors_files)
 
     def check_files_format(
         self, files_path: List[str]
@@ -139,17 +305,54 @@ class Collection:
         files_config = self.check_files_format(yaml_files_paths)
 
         for file_config, filename in zip(files_config, yaml_files_names):
+            default_values = self.get_file_default_values(
+                filename, file_config.get("default_values")
+            )
             for dataset in file_config["datasets"]:
                 for monitor in dataset["monitors"]:
-                    monitor = self.build_monitor(monitor, dataset["dataset"], filename)
+                    monitor = self.build_monitor(
+                        monitor, dataset["dataset"], filename, default_values
+                    )
                     monitors.append(monitor)
         return monitors
 
+    def iter_monitors_by_file(self) -> t.Iterator[List[Monitor]]:
+        """
+        Reads the yaml files of the collection one at a time, without storing their
+        monitors in the collection. Only the names of the monitors are kept, to
+        check that they are unique.
+
+        Returns:
+            Iterator[list[Monitor]]: The monitors of each file, merged with the
+                default values
+        """
+        monitors_names: t.Set[str] = set()
+        for filename in self.get_monitors_files():
+            file_config = self.check_files_format(
+                [os.path.join(self.collection_root, filename)]
+            )[0]
+            default_values = self.get_file_default_values(
+                filename, file_config.get("default_values")
+            )
+            monitors = [
+                self.build_monitor(
+                    monitor, dataset["dataset"], filename, default_values
+                )
+                for dataset in file_config["datasets"]
+                for monitor in dataset["monitors"]
+            ]
+            for monitor in monitors:
+                if str(monitor) in monitors_names:
+                    self.raise_duplicate_monitors()
+                monitors_names.add(str(monitor))
+            yield monitors
+
     def build_monitor(
         self,
         monitor: OrderedDict,
         dataset: str,
         filename: t.Optional[str] = None,
+        default_values: t.Optional[OrderedDict] = None,
     ) -> Monitor:
         """
         Build a monitor from a dict. The dict is merged with the default values
@@ -159,11 +362,15 @@ class Collection:
             dataset (str): The dataset to which the monitor belongs\n
             filename (str): [Optional] The filename of the monitor file if the monitor.
             comes from a file.
+            default_values (dict): [Optional] The default values of the monitor's
+                file, from `get_file_default_values`. Defaults to the collection's.
 
         Returns:
             Monitor: the Monitor object
         """
-        monitor = merge_yaml_files(self.default_values, monitor)
+        if default_values is None:
+            default_values = self.default_values
+        monitor = layer_values(default_values, monitor)
         kargs = {}
         if filename:
             kargs["filepath"] = os.path.join(self.collection_root, filename)
@@ -178,28 +385,32 @@ class Collection:
         filename: t.Optional[str] = None,
         **kargs,
     ) -> None:
-        merged_monitor = merge_yaml_files(self.default_values, monitor)
-        monitor_to_add = self.build_monitor(merged_monitor, dataset, filename)
-        if str(monitor_to_add) in [str(monitor) for monitor in self.monitors]:
-            if kargs.get("update_monitor", False):
-                self.remove_monitor_from_files(str(monitor_to_add))
-                self.monitors = [
-                    monitor
-                    for monitor in self.monitors
-                    if str(monitor) != str(monitor_to_add)
-                ]
-                self.monitors.append(monitor_to_add)
-            else:
-                raise ValueError(
-                    f"Monitor {monitor_to_add} already exists "
-                    f"in collection {self}.\n"
-                    "If you want to replace it, use the --update_monitor flag."
-                )
+        monitor_filename = filename or self.find_file_for_dataset(dataset)
+        default_values = None
+        if monitor_filename is not None:
+            default_values = self.get_file_default_values(
+                monitor_filename,
+                read_yaml_file(
+                    os.path.join(self.collection_root, monitor_filename)
+                ).get("default_values"),
+            )
+        monitor_to_add = self.build_monitor(
+            monitor, dataset, monitor_filename, default_values
+        )
+        replaced_monitor = self.monitors_by_key.get(str(monitor_to_add))
+        if replaced_monitor is not None and not kargs.get("update_monitor", False):
+            raise ValueError(
+                f"Monitor {monitor_to_add} already exists "
+                f"in collection {self}.\n"
+                "If you want to replace it, use the --update_monitor flag."
+            )
+        self.index_monitor(monitor_to_add, replaced_monitor)
+        if replaced_monitor is not None:
+            self.remove_monitor_from_files(str(monitor_to_add))
+            self.monitors[self.monitors.index(replaced_monitor)] = monitor_to_add
         else:
             self.monitors.append(monitor_to_add)
 
-        self.check_monitors_unicity()
-
         if not filename:
             filename = self.get_filename_for_dataset(dataset)
 
@@ -242,6 +453,20 @@ class Collection:
             f"Monitor {monitor_identifier} is not in collection {self.collection_root}"
         )
 
+    def find_file_for_dataset(self, dataset: str) -> t.Optional[str]:
+        """
+        Returns:
+            str: The name of the first monitors file containing the dataset, if any
+        """
+        for monitors_file in self.get_monitors_files():
+            file_config = read_yaml_file(
+                os.path.join(self.collection_root, monitors_file)
+            )
+            datasets_id = [dataset["dataset"] for dataset in file_config["datasets"]]
+            if dataset in datasets_id:
+                return monitors_file
+        return None
+
     def get_filename_for_dataset(self, dataset: str) -> str:
         """
         Get the filename for a dataset. If the dataset is not in a file of the collection,
@@ -254,14 +479,9 @@ class Collection:
         Returns:
             str: The filename containing the dataset
         """
-        monitors_files = self.get_monitors_files()
-        for monitors_file in monitors_files:
-            file_config = read_yaml_file(
-                os.path.join(self.collection_root, monitors_file)
-            )
-            datasets_id = [dataset["dataset"] for dataset in file_config["datasets"]]
-            if dataset in datasets_id:
-                return monitors_file
+        monitors_file = self.find_file_for_dataset(dataset)
+        if monitors_file is not None:
+            return monitors_file
 
         filename = f"{dataset}.yaml"
         init_file_data = OrderedDict(
@@ -271,6 +491,7 @@ class Collection:
             os.path.join(self.collection_root, filename),
             init_file_data,
         )
+        self.monitors_files.append(filename)
         return filename
 
     def __len__(self) -> int:
@@ -283,7 +504,7 @@ class Collection:
         return self.monitors[index]
 
     def __str__(self) -> str:
-        return self.collection_root.replace(os.sep, ".")
+        return self.name
 
     def __repr__(self) -> str:
         return f"Collection({self.collection_root})"
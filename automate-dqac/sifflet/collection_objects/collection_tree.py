@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import typing as t
+from typing import Dict, List, Optional
+
+from .collection import Collection
+from .monitor import Monitor
+
+
+class CollectionTree:
+    """
+    Index of the collections of a workspace by name (i.e. str(collection)). The
+    collections link to their parent and children, so that subtrees and ancestors
+    are walked without scanning the whole index.
+
+    Args:
+        index_monitors (bool): Also index the monitors of all the collections by
+            key, to check that the keys are unique across collections. Defaults to
+            False.
+    """
+
+    def __init__(self, index_monitors: bool = False) -> None:
+        self.collections: Dict[str, Collection] = {}
+        self.root_collections: Dict[str, Collection] = {}
+        # Shared with the root collections, which fill it with their children
+        self.monitors: Optional[Dict[str, Monitor]] = {} if index_monitors else None
+
+    def add(self, collection: Collection) -> None:
+        """
+        Indexes a collection. Its parent, if any, must be indexed first.
+        """
+        self.collections[collection.name] = collection
+        if collection.parent_collection is None:
+            self.root_collections[collection.name] = collection
+
+    def get(self, collection_name: str) -> Optional[Collection]:
+        return self.collections.get(collection_name)
+
+    def get_subtree(self, collection_name: str) -> List[Collection]:
+        """
+        Returns:
+            list[Collection]: The collection and all its children, parents first,
+                i.e. the collections whose name components start with the given
+                name's. Empty if the collection is not indexed.
+        """
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            return []
+        return list(collection.iter_subtree())
+
+    def get_ancestors(self, collection_name: str) -> List[Collection]:
+        """
+        Returns:
+            list[Collection]: The parent collections, from the closest one
+        """
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            return []
+        return list(collection.iter_ancestors())
+
+    def __contains__(self, collection_name: object) -> bool:
+        return collection_name in self.collections
+
+    def __iter__(self) -> t.Iterator[Collection]:
+        return iter(self.collections.values())
+
+    def __len__(self) -> int:
+        return len(self.collections)
@@ -0,0 +1,155 @@
+"""
+Discovery of the child collections and monitors files of a collection, in a single
+os.scandir pass over its folder. The type of each entry comes from the directory
+listing, so most filesystems need no stat call. Hidden entries (e.g. `.git`) are
+skipped, and so are the entries matching the glob patterns of the `.dqacignore`
+files of the collection and its parent folders.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+from .settings import DEFAULT_VALUES_FILENAME, IGNORE_FILENAME
+
+MONITORS_FILES_EXTENSIONS = (".yaml", ".yml")
+
+
+class IgnorePattern(NamedTuple):
+    # The folder of the .dqacignore file, which relative paths are matched from
+    folder: str
+    pattern: str
+    only_folders: bool
+
+
+class IgnoreRules:
+    """
+    The glob patterns of `.dqacignore` files. The patterns of a file apply to its
+    folder and all its subfolders, one pattern per line. Lines starting with `#`
+    are comments.
+
+    A pattern containing a `/` is matched against the path of the entry relative to
+    the folder of its file, other patterns against the name of the entry. Patterns
+    ending with `/` only match folders.
+    """
+
+    def __init__(self, patterns: Tuple[IgnorePattern, ...] = ()) -> None:
+        self.patterns = patterns
+
+    def extend(self, folder: str) -> IgnoreRules:
+        """
+        Returns:
+            IgnoreRules: These rules and the ones of the `.dqacignore` file of the
+                folder, if any
+        """
+        try:
+            with open(
+                os.path.join(folder, IGNORE_FILENAME), "r", encoding="utf-8"
+            ) as ignore_file:
+                lines = ignore_file.read().splitlines()
+        except FileNotFoundError:
+            return self
+
+        patterns = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            only_folders = line.endswith("/")
+            patterns.append(IgnorePattern(folder, line.strip("/"), only_folders))
+        return IgnoreRules(self.patterns + tuple(patterns))
+
+    def is_ignored(self, path: str, is_folder: bool) -> bool:
+        name = os.path.basename(path)
+        for ignore_pattern in self.patterns:
+            if ignore_pattern.only_folders and not is_folder:
+                continue
+            if "/" in ignore_pattern.pattern:
+                matched = os.path.relpath(path, ignore_pattern.folder).replace(
+                    os.sep, "/"
+                )
+            else:
+                matched = name
+            if fnmatch.fnmatchcase(matched, ignore_pattern.pattern):
+                return True
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IgnoreRules) and self.patterns == other.patterns
+
+    def __repr__(self) -> str:
+        return f"IgnoreRules({list(self.patterns)})"
+
+
+class CollectionEntries(NamedTuple):
+    # Paths of the child collections folders, sorted
+    child_collections_roots: List[str]
+    # Names of the monitors files, sorted
+    monitors_files: List[str]
+    has_default_values: bool
+    # The rules applying to the collection's folder, including its own .dqacignore
+    ignore_rules: IgnoreRules
+
+
+def scan_collection(
+    collection_root: str, ignore_rules: Optional[IgnoreRules] = None
+) -> CollectionEntries:
+    """
+    Lists the folder of a collection once, sorting its entries into child
+    collections and monitors files.
+
+    Args:
+        collection_root (str): The path to the collection folder
+        ignore_rules (IgnoreRules): [Optional] The rules of the parent folders
+
+    Returns:
+        CollectionEntries: The entries of the collection
+    """
+    if ignore_rules is None:
+        ignore_rules = IgnoreRules()
+    folders: List[str] = []
+    files: List[str] = []
+    has_default_values = False
+    has_ignore_file = False
+    with os.scandir(collection_root) as entries:
+        for entry in entries:
+            if entry.name == IGNORE_FILENAME:
+                has_ignore_file = True
+            elif entry.name.startswith("."):
+                continue
+            elif entry.is_dir():
+                folders.append(entry.name)
+            elif entry.name == DEFAULT_VALUES_FILENAME:
+                has_default_values = True
+            elif entry.name.endswith(MONITORS_FILES_EXTENSIONS):
+                files.append(entry.name)
+
+    if has_ignore_file:
+        ignore_rules = ignore_rules.extend(collection_root)
+
+    def is_kept(name: str, is_folder: bool) -> bool:
+        return not ignore_rules.is_ignored(
+            os.path.join(collection_root, name), is_folder
+        )
+
+    return CollectionEntries(
+        [
+            os.path.join(collection_root, folder)
+            for folder in sorted(folders)
+            if is_kept(folder, True)
+        ],
+        [file for file in sorted(files) if is_kept(file, False)],
+        has_default_values,
+        ignore_rules,
+    )
+
+
+def get_workspace_ignore_rules(collections_yaml_file: str) -> IgnoreRules:
+    """
+    Returns:
+        IgnoreRules: The rules of the `.dqacignore` file next to the collections
+            declaration file, applying to all the collections
+    """
+    return IgnoreRules().extend(os.path.dirname(collections_yaml_file) or os.curdir)
@@ -1,2 +1,3 @@
 from .classes import check_data_structure
 from .check_type_and_structure import check_structure_and_type
+from .validators import get_validator
@@ -1,7 +1,10 @@
 from typing import Any, List, Type, get_type_hints, Literal, Union
 from collections import OrderedDict
+from collections.abc import Mapping
 from typing_extensions import NotRequired
 
+DICT_TYPES = (dict, OrderedDict)
+
 
 def is_literal(typ: Type) -> bool:
     """Check if a type is a Literal type."""
@@ -18,12 +21,21 @@ def get_detailed_type(data):
     return basic_type
 
 
+def get_actual_type(data: Any) -> type:
+    """Get the type data is checked as, shared with the compiled validators."""
+    actual_type = type(data)
+    if actual_type not in DICT_TYPES and isinstance(data, Mapping):
+        # Views of merged values are checked like the dicts they stand for
+        return OrderedDict
+    return actual_type
+
+
 def check_structure_and_type(
     data: Any, expected_type: Type, path: str = ""
 ) -> List[str]:
     """Recursively check structure and type of a given data against expected type."""
     errors = []
-    actual_type = type(data)
+    actual_type = get_actual_type(data)
 
     if is_literal(expected_type):
         if data not in expected_type.__args__:
@@ -58,6 +70,13 @@ def check_structure_and_type(
             errors.extend(item_errors)
         return errors
 
+    # Plain dicts have no schema, e.g. default values that are only checked once
+    # merged with the monitors
+    if expected_type in [dict, OrderedDict]:
+        if actual_type not in [dict, OrderedDict]:
+            errors.append(f"Expected {expected_type} at {path}, but got {actual_type}")
+        return errors
+
     if actual_type in [dict, OrderedDict]:
         expected_keys = get_type_hints(expected_type)
 
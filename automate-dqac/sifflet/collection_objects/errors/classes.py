@@ -2,9 +2,9 @@ from __future__ import annotations
 import typing as t
 from typing_extensions import OrderedDict
 
+from sifflet.source_marks import get_source_mark
 from sifflet.utils import get_dict_as_yaml_string
-from .check_type_and_structure import check_structure_and_type
-from ..settings import COLLECTION_MONITOR_IDENTIFIER_KEY
+from .validators import get_validator
 
 TABULATION = "   "
 
@@ -114,7 +114,7 @@ class WrongCollectionMonitorFormatError(Exception):
     """
     Raised when a monitor inside a collection file has a wrong format. If
         a filepath is provided, the error message will also contain the line
-        number of the monitor in the file.
+        and column of the monitor in the file, recorded when it was loaded.
 
         Additionnal arguments:
             filepath (str): The path to the file containing the monitor
@@ -126,7 +126,10 @@ class WrongCollectionMonitorFormatError(Exception):
     def __init__(self, wrong_value: OrderedDict, **kargs) -> None:
         self.monitor = wrong_value
         self.kargs = kargs
-        super().__init__()
+        # Resolved now, as the mark of the monitor is lost when the error is
+        # pickled, e.g. to be raised again by the main process of a parallel render
+        self.source_mark = get_source_mark(wrong_value)
+        super().__init__(wrong_value)
 
     @property
     def filepath_message(self) -> str:
@@ -145,19 +148,11 @@ class WrongCollectionMonitorFormatError(Exception):
 
     @property
     def file_line_error_message(self) -> str:
-        filepath = self.kargs.get("filepath")
-        if not filepath:
+        if not self.kargs.get("filepath"):
             return ""
-
-        monitor_identifier = self.monitor.get(COLLECTION_MONITOR_IDENTIFIER_KEY)
-        if not monitor_identifier:
+        if self.source_mark is None:
             return ""
-
-        with open(filepath, encoding="utf-8") as datasetsfile:
-            for index, line in enumerate(datasetsfile):
-                if monitor_identifier in line:
-                    return f", line {index + 1}"
-        return ""
+        return f", line {self.source_mark.line}, column {self.source_mark.column}"
 
     @property
     def merged_monitor(self) -> str:
@@ -198,7 +193,7 @@ def check_data_structure(dic_to_check: dict, expected_type: t.Type[T], **kargs)
         filepath (str): The path to the file containing `dic_to_check`
     """
 
-    errors = check_structure_and_type(dic_to_check, expected_type)
+    errors = get_validator(expected_type)(dic_to_check, "")
     if errors:
         kargs["wrong_value"] = dic_to_check
         kargs["format_error"] = "- " + "\n- ".join(errors)
@@ -0,0 +1,183 @@
+"""
+Validators compiled from the TypedDicts describing the yaml files and monitors.
+`check_structure_and_type` walks the types on every call; the validators do the
+same checks, and return the same errors, with everything that only depends on the
+expected type computed once per process: the type hints and keys of the
+TypedDicts, the allowed values of the literals and the branches of the unions.
+"""
+
+import typing as t
+from typing import Any, Callable, Dict, List, Literal, Union, get_type_hints
+
+from typing_extensions import NotRequired
+
+from .check_type_and_structure import (
+    DICT_TYPES,
+    check_structure_and_type,
+    get_actual_type,
+)
+
+# Checks data against a type, and returns the errors like check_structure_and_type
+Validator = Callable[[Any, str], List[str]]
+
+BASIC_TYPES = (str, int, float, bool, list)
+
+VALIDATORS: Dict[Any, Validator] = {}
+# Types being compiled, whose validators are looked up when they are called, for
+# recursive types
+COMPILING: t.Set[Any] = set()
+
+
+def join_path(path: str, key: Any) -> Any:
+    return ".".join([path, key]) if path else key
+
+
+def compile_literal(expected_type: Any) -> Validator:
+    values = expected_type.__args__
+    try:
+        hashed_values: t.FrozenSet[Any] = frozenset(values)
+    except TypeError:
+        hashed_values = frozenset()
+    message_start = f"Expected one of {values} at "
+
+    def validate_literal(data: Any, path: str) -> List[str]:
+        try:
+            if data in hashed_values:
+                return []
+        except TypeError:
+            pass
+        if data in values:
+            return []
+        return [f"{message_start}{path}, but got value: {data}"]
+
+    return validate_literal
+
+
+def compile_union(expected_type: Any) -> Validator:
+    branches = [get_validator(branch) for branch in expected_type.__args__]
+
+    def validate_union(data: Any, path: str) -> List[str]:
+        union_errors: List[str] = []
+        for branch in branches:
+            union_errors = branch(data, path)
+            if not union_errors:
+                break
+        return list(union_errors)
+
+    return validate_union
+
+
+def compile_keys(
+    expected_type: Any,
+) -> t.Optional[t.Tuple[t.List[t.Tuple[str, bool, Validator]], t.FrozenSet[Any]]]:
+    """
+    Returns:
+        tuple: For each expected key, its name, whether it is required and its
+            validator, and the set of the expected keys. None if the type hints
+            of the type cannot be read.
+    """
+    try:
+        expected_keys = get_type_hints(expected_type)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    keys = []
+    for key, expected_key_type in expected_keys.items():
+        not_required = getattr(expected_key_type, "__origin__", None) == NotRequired
+        keys.append(
+            (
+                key,
+                not not_required,
+                get_validator(
+                    expected_key_type.__args__[0] if not_required else expected_key_type
+                ),
+            )
+        )
+    return keys, frozenset(expected_keys)
+
+
+def compile_type(expected_type: Any) -> Validator:
+    is_list = getattr(expected_type, "__origin__", None) == list
+    item_validator: t.Optional[Validator] = None
+    if is_list and getattr(expected_type, "__args__", None):
+        child_expected_type = expected_type.__args__[0]
+        if child_expected_type:
+            item_validator = get_validator(child_expected_type)
+    is_plain_dict = expected_type in DICT_TYPES
+    keys = None if is_plain_dict else compile_keys(expected_type)
+    is_basic_type = expected_type in BASIC_TYPES
+    mismatch_message_start = f"Expected {expected_type} at "
+
+    def validate_keys(data: Any, path: str) -> List[str]:
+        if keys is None:
+            return check_structure_and_type(data, expected_type, path)
+        errors: List[str] = []
+        for key, required, validator in keys[0]:
+            if key not in data:
+                if required:
+                    errors.append(f"Missing key: {join_path(path, key)}")
+            else:
+                errors.extend(validator(data[key], join_path(path, key)))
+        expected_keys = keys[1]
+        for key in data.keys():
+            if key not in expected_keys:
+                errors.append(f"Extra key: {join_path(path, key)}")
+        return errors
+
+    def validate(data: Any, path: str) -> List[str]:
+        actual_type = get_actual_type(data)
+        if actual_type is expected_type and is_basic_type and not is_list:
+            return []
+        if actual_type == list and is_list:
+            if item_validator is None:
+                return []
+            errors: List[str] = []
+            for index, item in enumerate(data):
+                errors.extend(item_validator(item, f"{path}[{index}]"))
+            return errors
+        if is_plain_dict:
+            if actual_type not in DICT_TYPES:
+                return [f"{mismatch_message_start}{path}, but got {actual_type}"]
+            return []
+        if actual_type in DICT_TYPES:
+            return validate_keys(data, path)
+        if actual_type != expected_type and is_basic_type:
+            return [f"{mismatch_message_start}{path}, but got {actual_type}"]
+        return []
+
+    return validate
+
+
+def compile_validator(expected_type: Any) -> Validator:
+    """
+    Returns:
+        Validator: A function checking data against the type, returning the same
+            errors as `check_structure_and_type(data, expected_type, path)`
+    """
+    origin = getattr(expected_type, "__origin__", None)
+    if origin == Literal:
+        return compile_literal(expected_type)
+    if origin == Union:
+        return compile_union(expected_type)
+    return compile_type(expected_type)
+
+
+def get_validator(expected_type: Any) -> Validator:
+    """
+    Returns:
+        Validator: The validator of the type, compiled on the first call
+    """
+    try:
+        validator = VALIDATORS.get(expected_type)
+    except TypeError:  # Unhashable type arguments
+        return compile_validator(expected_type)
+    if validator is not None:
+        return validator
+    if expected_type in COMPILING:
+        return lambda data, path: VALIDATORS[expected_type](data, path)
+    COMPILING.add(expected_type)
+    try:
+        validator = compile_validator(expected_type)
+    finally:
+        COMPILING.discard(expected_type)
+    VALIDATORS[expected_type] = validator
+    return validator
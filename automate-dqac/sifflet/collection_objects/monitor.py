@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from collections import OrderedDict
 
+import sys
 import typing as t
 
 
 from sifflet.collection_objects.errors.classes import check_data_structure
+from sifflet.layered_values import materialize
 
 from .types.collection import CollectionMonitorDict, DQACMonitorDict
 from .settings import (
@@ -24,6 +26,11 @@ class Monitor:
     The default values of the collection must be merged with the monitor.values dict before
     creating the monitor object.
 
+    Monitors are compact records, as a render holds all the monitors of the
+    collections: they have no instance dict, the dataset ids are interned so that
+    monitors of the same dataset share them, and the monitor name is only built
+    when first needed.
+
     Args:
         monitor (dict): The monitor configuration, already merged with the default values
         collection (Collection): The collection containing the monitor
@@ -32,6 +39,8 @@ class Monitor:
             Defaults to None.
     """
 
+    __slots__ = ("values", "collection", "dataset", "_key")
+
     def __init__(
         self,
         monitor: OrderedDict,
@@ -43,18 +52,33 @@ class Monitor:
             monitor, CollectionMonitorDict, filepath=filepath
         )
         self.collection = collection
-        self.dataset = dataset
+        self.dataset = sys.intern(str(dataset))
+        self._key: t.Optional[str] = None
+
+    @property
+    def identifier(self) -> str:
+        return self.values[COLLECTION_MONITOR_IDENTIFIER_KEY]
 
     def __str__(self) -> str:
-        collection_name = str(self.collection)
-        monitor_name = self.values[COLLECTION_MONITOR_IDENTIFIER_KEY]
-        return f"{collection_name}.{monitor_name}"
-
-    def clear_fields_for_api(self) -> DQACMonitorDict:
-        cleared_monitor = OrderedDict(self.values)
-        cleared_monitor[DQAC_MONITOR_ID_KEY] = self.collection.get_monitor_uuid(
-            str(self)
-        )
+        if self._key is None:
+            self._key = f"{self.collection}.{self.identifier}"
+        return self._key
+
+    def clear_fields_for_api(
+        self, monitor_uuid: t.Optional[str] = None
+    ) -> DQACMonitorDict:
+        """
+        Returns the monitor in the DQAC format expected by the CLI.
+
+        Args:
+            monitor_uuid (str, optional): The uuid of the monitor, if already resolved
+                with the other monitors of the render. Read from the collection's
+                database otherwise.
+        """
+        cleared_monitor = materialize(self.values)
+        if monitor_uuid is None:
+            monitor_uuid = self.collection.get_monitor_uuid(str(self))  # type: ignore
+        cleared_monitor[DQAC_MONITOR_ID_KEY] = monitor_uuid
         del cleared_monitor[COLLECTION_MONITOR_IDENTIFIER_KEY]
         cleared_monitor[COLLECTION_MONITOR_DATASETS_KEY] = [
             {DQAC_MONITOR_ID_KEY: str(self.dataset)}
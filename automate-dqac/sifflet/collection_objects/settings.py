@@ -3,3 +3,4 @@ DEFAULT_VALUES_FILENAME = "$default.yaml"
 COLLECTION_MONITOR_IDENTIFIER_KEY = "identifier"
 DQAC_MONITOR_ID_KEY = "id"
 COLLECTION_MONITOR_DATASETS_KEY = "datasets"
+IGNORE_FILENAME = ".dqacignore"
@@ -1,19 +1,90 @@
 import argparse
-from sifflet.renderer.commands import render_monitors, add_monitor, create_collection
+from sifflet.renderer.commands import (
+    render_monitors,
+    add_monitor,
+    create_collection,
+    import_database,
+    collect_garbage,
+    check_collections,
+)
+from sifflet.renderer.database import DATABASE_BACKENDS, get_database
+from sifflet.renderer.output import FILES_OUTPUT, OUTPUT_MODES
+from sifflet.renderer.settings import (
+    DATABASE_BACKEND,
+    DATABASE_FILES,
+    DATABASE_OPTIONS,
+    YAML_CACHE_FOLDER,
+)
 from sifflet.utils import print_error
+from sifflet.yaml_cache import use_yaml_cache
 
 
-COMMANDS = {"render": render_monitors, "add": add_monitor, "create": create_collection}
+COMMANDS = {
+    "render": render_monitors,
+    "add": add_monitor,
+    "create": create_collection,
+    "import": import_database,
+    "gc": collect_garbage,
+    "check": check_collections,
+}
+# Commands that leave the workspace untouched, e.g. to run before each commit: the
+# yaml cache is not used
+READ_ONLY_COMMANDS = {"check"}
 
 COMMANDS_DESCRIPTION = argparse.ArgumentParser(
     description="Project aiming at generating monitors at scale."
 )
 subparsers = COMMANDS_DESCRIPTION.add_subparsers(dest="command", required=True)
 
+
+def add_database_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--database_backend",
+        type=str,
+        choices=list(DATABASE_BACKENDS),
+        help=f"Backend storing the monitors uuids. Defaults to {DATABASE_BACKEND}.",
+    )
+    parser.add_argument(
+        "--database_file",
+        type=str,
+        help="Path to the database file. Defaults to the backend's file in settings.",
+    )
+    parser.add_argument(
+        "--uuid_namespace",
+        type=str,
+        help="Namespace of the uuids derived by the deterministic backend.",
+    )
+
+
 render_parser = subparsers.add_parser("render", help="Run the project")
 render_parser.add_argument(
     "collections_yaml_file", type=str, help="The name of the file to render."
 )
+render_parser.add_argument(
+    "--read_only",
+    action="store_true",
+    help="Fail on monitors missing from the database instead of adding them.",
+)
+render_parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Number of processes loading and rendering the collections. Defaults to 1.",
+)
+render_parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Render one file at a time to bound memory usage by the largest file.",
+)
+render_parser.add_argument(
+    "--output_mode",
+    type=str,
+    choices=list(OUTPUT_MODES),
+    default=FILES_OUTPUT,
+    help="Render a file per monitor, a multi-document file per collection, "
+    f"or a single multi-document file. Defaults to {FILES_OUTPUT}.",
+)
+add_database_arguments(render_parser)
 
 add_parser = subparsers.add_parser("add", help="Add a monitor to a dataset")
 add_parser.add_argument(
@@ -43,6 +114,8 @@ add_parser.add_argument(
     action="store_true",
     help="Replace the monitor if it already exists in the collection",
 )
+add_database_arguments(add_parser)
+
 create_parser = subparsers.add_parser("create", help="Create a new collection")
 
 create_parser.add_argument(
@@ -51,6 +124,47 @@ create_parser.add_argument(
     help="The path to the collection where the monitor is added, in the format path.to.collection",
 )
 
+import_parser = subparsers.add_parser(
+    "import", help="Import the uuids of a json database into the database"
+)
+import_parser.add_argument(
+    "json_database_file", type=str, help="The path to the json database to import."
+)
+import_parser.add_argument(
+    "--collections_file",
+    type=str,
+    help="The file declaring the root collections, required by the sharded backend.",
+)
+add_database_arguments(import_parser)
+
+gc_parser = subparsers.add_parser(
+    "gc", help="Remove the monitors that are not in the collections from the database"
+)
+gc_parser.add_argument(
+    "collections_yaml_file",
+    type=str,
+    help="The file declaring the collections. Monitors of other collections are removed.",
+)
+gc_parser.add_argument(
+    "--dry_run",
+    action="store_true",
+    help="Only list the monitors that would be removed.",
+)
+add_database_arguments(gc_parser)
+
+check_parser = subparsers.add_parser(
+    "check",
+    help="Check all the monitors and report every error, without rendering them",
+)
+check_parser.add_argument(
+    "collections_yaml_file", type=str, help="The file declaring the collections."
+)
+check_parser.add_argument(
+    "--jobs",
+    type=int,
+    help="Number of processes checking the collections. Defaults to the number of CPUs.",
+)
+
 
 def parse_environment_variables(env_list):
     """Convert a list of strings in format 'key=value' to a dictionary."""
@@ -61,17 +175,44 @@ def parse_environment_variables(env_list):
     return env_dict
 
 
-def run_command_from_args(args: argparse.Namespace) -> None:
+def parse_database_arguments(kwargs: dict) -> None:
+    """
+    Replace the database arguments by the database object if any is given.
+    The database from settings is used otherwise.
+    """
+    backend = kwargs.pop("database_backend", None)
+    database_file = kwargs.pop("database_file", None)
+    uuid_namespace = kwargs.pop("uuid_namespace", None)
+    if backend is None and database_file is None and uuid_namespace is None:
+        return
+    backend = backend or DATABASE_BACKEND
+    options = dict(DATABASE_OPTIONS.get(backend, {}))
+    if uuid_namespace:
+        options["uuid_namespace"] = uuid_namespace
+    kwargs["database"] = get_database(
+        backend, database_file or DATABASE_FILES[backend], **options
+    )
+
+
+def run_command_from_args(args: argparse.Namespace) -> int:
+    """
+    Returns:
+        int: The exit code of the command, 1 if it failed
+    """
     kwargs = vars(args)
     command = kwargs.pop("command")
     if command in COMMANDS:
         if command == "add" and args.env:
             # Convert the env list to a dictionary
             kwargs["env"] = parse_environment_variables(args.env)
+        parse_database_arguments(kwargs)
+        use_cache = command not in READ_ONLY_COMMANDS
         try:
-            COMMANDS[command](**kwargs)
+            with use_yaml_cache(YAML_CACHE_FOLDER if use_cache else None):
+                COMMANDS[command](**kwargs)
         except Exception as exc:  # pylint: disable=broad-except
             print_error(exc)
-
+            return 1
+        return 0
     else:
         raise NotImplementedError(f"Command {args.command} is not implemented.")
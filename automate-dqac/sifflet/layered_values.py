@@ -0,0 +1,90 @@
+"""
+Read-only views of yaml values merged from several layers: the default values of
+the parent collections, of the collection and of the file, then the values of a
+monitor. The layers are shared by every view built on top of them instead of being
+copied for each monitor, and nested mappings are only merged when they are read.
+Views are turned into plain dicts when the monitors are dumped.
+"""
+
+from collections import OrderedDict
+from collections.abc import Mapping
+import typing as t
+
+
+class LayeredValues(Mapping):
+    """
+    Read-only mapping merging layers of yaml values like `merge_yaml_files`: the
+    values of a layer override the ones of the previous layers, and nested mappings
+    are merged key by key.
+
+    Args:
+        layers (Mapping): The layers, from the lowest priority (e.g. the default
+            values of a root collection) to the highest (the monitor's values)
+    """
+
+    __slots__ = ("layers",)
+
+    def __init__(self, *layers: t.Mapping[str, t.Any]) -> None:
+        self.layers = layers
+
+    def __getitem__(self, key: str) -> t.Any:
+        nested_layers = []
+        for layer in reversed(self.layers):
+            if key not in layer:
+                continue
+            value = layer[key]
+            if not isinstance(value, Mapping):
+                # A value replaces the lower layers, and stops the merge of the
+                # mappings of the higher layers
+                if not nested_layers:
+                    return value
+                break
+            nested_layers.append(value)
+        if not nested_layers:
+            raise KeyError(key)
+        if len(nested_layers) == 1:
+            return nested_layers[0]
+        return LayeredValues(*reversed(nested_layers))
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self.layers)
+
+    def __iter__(self) -> t.Iterator[str]:
+        keys: t.Dict[str, None] = {}
+        for layer in self.layers:
+            keys.update(dict.fromkeys(layer))
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"LayeredValues({dict(materialize(self))!r})"
+
+
+def layer_values(
+    default_values: t.Mapping[str, t.Any], values: t.Mapping[str, t.Any]
+) -> LayeredValues:
+    """
+    Returns:
+        LayeredValues: A view of `values` merged on top of `default_values`. The
+            layers of the default values are reused when they already are a view.
+    """
+    if isinstance(default_values, LayeredValues):
+        return LayeredValues(*default_values.layers, values)
+    return LayeredValues(default_values, values)
+
+
+def materialize(values: t.Mapping[str, t.Any]) -> OrderedDict:
+    """
+    Returns:
+        OrderedDict: A new dict with the values of the mapping, where the nested
+            views are turned into dicts too
+    """
+    return OrderedDict(
+        (
+            key,
+            materialize(value) if isinstance(value, LayeredValues) else value,
+        )
+        for key, value in values.items()
+    )
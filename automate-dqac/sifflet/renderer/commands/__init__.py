@@ -1,3 +1,6 @@
 from .render import render_monitors
 from .add import add_monitor
 from .create import create_collection
+from .import_database import import_database
+from .gc import collect_garbage
+from .check import check_collections
@@ -4,7 +4,7 @@ from termcolor import colored
 from sifflet.renderer.structure_manager import StructureManager
 
 from ..template_renderer import render_jinja2_template_to_dict
-from ..settings import DATABASE
+from ..settings import get_default_database
 
 
 def print_end_of_adding(monitor_values, collection_root):
@@ -24,16 +24,19 @@ def add_monitor(
     template: str,
     collections_file: t.Optional[str],
     env: t.Optional[t.Dict[str, str]] = None,
-    database=DATABASE,
+    database=None,
     **kargs,
 ) -> None:
     if not env:
         env = {}
+    if database is None:
+        database = get_default_database()
 
     if not collections_file:
         collections_file = "collections.yaml"
     monitor_values = render_jinja2_template_to_dict(template, env)
-    collection_manager = StructureManager(collections_file, database)
+    collection_manager = StructureManager(collections_file, database, lazy=True)
     collection = collection_manager.get_collection(collection_root.replace("/", "."))
     collection.add_monitor_to_files(monitor_values, dataset, **kargs)
+    database.flush()
     print_end_of_adding(monitor_values, collection_root)
@@ -0,0 +1,210 @@
+"""
+Checks the monitors files and the merged monitors of the declared collections,
+and reports all their errors at once, grouped by file. The collections are checked
+in parallel processes. Nothing is rendered and the uuids database is not used, so
+that the check can run before each commit.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import os
+import typing as t
+from typing import Dict, List, NamedTuple, Optional
+
+from termcolor import colored
+from sifflet.collection_objects.collection import Collection
+from sifflet.collection_objects.discovery import IgnoreRules
+from sifflet.collection_objects.errors.classes import TABULATION
+
+from ..structure_manager import StructureManager
+
+
+class FileCheck(NamedTuple):
+    filepath: str
+    errors: List[str]
+    # Identifiers of the valid monitors, to check that they are unique
+    identifiers: List[str]
+
+
+def check_monitors_file(collection: Collection, filename: str) -> FileCheck:
+    """
+    Checks the format of a monitors file, then each of its monitors merged with
+    the default values.
+    """
+    filepath = os.path.join(collection.collection_root, filename)
+    try:
+        file_config = collection.check_files_format([filepath])[0]
+        default_values = collection.get_file_default_values(
+            filename, file_config.get("default_values")
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        return FileCheck(filepath, [str(error)], [])
+
+    errors = []
+    identifiers = []
+    try:
+        datasets = [
+            (dataset["dataset"], list(dataset["monitors"]))
+            for dataset in file_config["datasets"]
+        ]
+    except Exception as error:  # pylint: disable=broad-except
+        return FileCheck(filepath, [f"Could not read the datasets: {error!r}"], [])
+    for dataset, monitors in datasets:
+        for monitor in monitors:
+            try:
+                built_monitor = collection.build_monitor(
+                    monitor, dataset, filename, default_values
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(str(error))
+            else:
+                identifiers.append(built_monitor.identifier)
+    return FileCheck(filepath, errors, identifiers)
+
+
+def check_collection(
+    collection_root: str, default_values: t.Any, ignore_rules: IgnoreRules
+) -> List[FileCheck]:
+    """
+    Checks the monitors files of a collection, possibly in a worker process.
+
+    Args:
+        collection_root (str): The path to the collection folder
+        default_values (dict): The merged default values of the collection
+        ignore_rules (IgnoreRules): The `.dqacignore` rules of the parent folders
+
+    Returns:
+        list[FileCheck]: The check of each file
+    """
+    collection = Collection(
+        collection_root,
+        database=None,
+        default_values=default_values,
+        load_monitors=False,
+        ignore_rules=ignore_rules,
+    )
+    return [
+        check_monitors_file(collection, filename)
+        for filename in collection.get_monitors_files()
+    ]
+
+
+def check_collections_in_processes(
+    collections: List[Collection], jobs: int
+) -> Dict[str, List[FileCheck]]:
+    """
+    Returns:
+        dict: The checks of the files of each collection, by collection name
+    """
+    arguments = [
+        (
+            collection.collection_root,
+            collection.default_values,
+            collection.inherited_ignore_rules,
+        )
+        for collection in collections
+    ]
+    if jobs == 1 or len(collections) == 1:
+        results = [check_collection(*collection) for collection in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(check_collection, *zip(*arguments)))
+    return {
+        str(collection): files_checks
+        for collection, files_checks in zip(collections, results)
+    }
+
+
+def add_duplicate_identifiers_errors(
+    collection_name: str, files_checks: List[FileCheck]
+) -> None:
+    """
+    Adds an error to the files containing monitors whose identifier is not unique
+    in the collection.
+    """
+    counts = Counter(
+        identifier
+        for file_check in files_checks
+        for identifier in file_check.identifiers
+    )
+    for file_check in files_checks:
+        for identifier in dict.fromkeys(file_check.identifiers):
+            if counts[identifier] > 1:
+                file_check.errors.append(
+                    f"Monitor identifier {identifier} is not unique in the "
+                    f"collection {collection_name}"
+                )
+
+
+def print_files_errors(files_checks: List[FileCheck]) -> None:
+    for file_check in files_checks:
+        print(
+            colored(f"\n{file_check.filepath}", "red", attrs=["bold"]),
+            colored(
+                f"({len(file_check.errors)} "
+                f"{'errors' if len(file_check.errors) > 1 else 'error'})",
+                "red",
+            ),
+        )
+        for error in file_check.errors:
+            print(TABULATION + error.strip().replace("\n", f"\n{TABULATION}") + "\n")
+
+
+def check_collections(collections_yaml_file: str, jobs: Optional[int] = None) -> None:
+    """
+    Checks the monitors of the declared collections and their children, and
+    prints all the errors grouped by file.
+
+    Parameters:
+        - collections_yaml_file (str): Path to the collections file.
+        - jobs (int): Number of processes checking the collections. Defaults to
+            the number of CPUs.
+
+    Raises:
+        ValueError: If any monitors file or monitor is not valid
+    """
+    print(f"\nChecking monitors from {collections_yaml_file}...")
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"The number of jobs must be at least 1, got {jobs}")
+
+    collections_manager = StructureManager(
+        collections_yaml_file, None, load_monitors=False, lazy=True, collect_errors=True
+    )
+    collections = collections_manager.collections_to_render
+    checks = check_collections_in_processes(collections, jobs)
+
+    # The collections that could not be built, e.g. with wrong default values, are
+    # reported with the folder of the collection, and their monitors are not checked
+    files_checks = [
+        FileCheck(collection_root, [str(error)], [])
+        for collection_root, error in collections_manager.errors.items()
+    ]
+    for collection_name, collection_files_checks in checks.items():
+        add_duplicate_identifiers_errors(collection_name, collection_files_checks)
+        files_checks.extend(collection_files_checks)
+    wrong_files_checks = [
+        file_check for file_check in files_checks if file_check.errors
+    ]
+    number_of_errors = sum(len(file_check.errors) for file_check in wrong_files_checks)
+    if wrong_files_checks:
+        print_files_errors(wrong_files_checks)
+        raise ValueError(
+            f"Found {number_of_errors} "
+            f"{'errors' if number_of_errors > 1 else 'error'} in "
+            f"{len(wrong_files_checks)} of {len(files_checks)} files"
+        )
+
+    number_of_monitors = sum(len(file_check.identifiers) for file_check in files_checks)
+    print(
+        colored("\n[SUCCESS]", "green", attrs=["bold"]),
+        colored(
+            f"Checked {number_of_monitors} "
+            f"{'monitors' if number_of_monitors > 1 else 'monitor'} in "
+            f"{len(files_checks)} {'files' if len(files_checks) > 1 else 'file'} "
+            f"from {len(collections)} "
+            f"{'collections' if len(collections) > 1 else 'collection'}",
+            "green",
+        ),
+    )
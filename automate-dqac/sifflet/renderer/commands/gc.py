@@ -0,0 +1,62 @@
+import typing as t
+
+from termcolor import colored
+from sifflet.renderer.database import Database
+from sifflet.renderer.structure_manager import StructureManager
+
+from ..settings import get_default_database
+
+
+def print_pruned_monitors(pruned_keys, number_of_monitors: int, dry_run: bool):
+    verb = "Would prune" if dry_run else "Pruned"
+    for key in pruned_keys:
+        print(f"{verb} {key}")
+    print(
+        colored("\n[SUCCESS]", "green", attrs=["bold"]),
+        colored(
+            f"{verb} {len(pruned_keys)} of {number_of_monitors} "
+            f"{'monitors' if number_of_monitors > 1 else 'monitor'} from the database",
+            "green",
+        ),
+    )
+
+
+def collect_garbage(
+    collections_yaml_file: str,
+    dry_run: bool = False,
+    database: t.Optional[Database] = None,
+) -> None:
+    """
+    Remove from the database the monitors that are not in the collections anymore,
+    i.e. deleted, renamed or moved monitors, and compact the database. Only the
+    monitors of the declared root collections are pruned, so that the monitors of
+    other root collections sharing the database are kept.
+
+    Parameters:
+        - collections_yaml_file (str): Path to the collections file. All the monitors
+            of the declared root collections and their children are kept.
+        - dry_run (bool): Only report the monitors that would be removed.
+        - database (Database): Database to be used. Defaults to the database
+            from settings.
+    """
+    print(f"\nCollecting monitors from {collections_yaml_file}...")
+    if database is None:
+        database = get_default_database()
+    collections_manager = StructureManager(
+        collections_yaml_file, database, index_monitors=True
+    )
+    live_keys = collections_manager.tree.monitors or {}
+    roots_prefixes = tuple(
+        f"{root_name}." for root_name in collections_manager.tree.root_collections
+    )
+    database_keys = database.get_monitor_keys()
+    pruned_keys = [
+        key
+        for key in database_keys
+        if key.startswith(roots_prefixes) and key not in live_keys
+    ]
+
+    if pruned_keys and not dry_run:
+        database.delete_many(pruned_keys)
+        database.flush()
+    print_pruned_monitors(pruned_keys, len(database_keys), dry_run)
@@ -0,0 +1,51 @@
+import json
+import os
+import typing as t
+
+from termcolor import colored
+from sifflet.renderer.database import Database
+from sifflet.renderer.structure_manager import get_root_collections
+
+from ..settings import get_default_database
+
+
+def import_database(
+    json_database_file: str,
+    collections_file: t.Optional[str] = None,
+    database: t.Optional[Database] = None,
+) -> None:
+    """
+    Import the monitors uuids of a json database into the database.
+    Monitors already in the database keep their uuid.
+
+    Args:
+        json_database_file (str): The path to the json database to import
+        collections_file (str, optional): The file declaring the root collections,
+            registered to the database before the import.
+        database (Database): Database to import into. Defaults to the
+            database from settings.
+    """
+    with open(json_database_file, "r", encoding="utf-8") as json_database:
+        uuids = json.load(json_database)
+    if database is None:
+        database = get_default_database()
+
+    if collections_file:
+        # Only the root collections are read, the monitors are not needed
+        database.register_root_collections(
+            [
+                root.replace(os.sep, ".")
+                for root in get_root_collections(collections_file)
+            ]
+        )
+
+    number_of_monitors = database.import_uuids(uuids)
+    database.flush()
+    print(
+        colored("\n[SUCCESS]", "green", attrs=["bold"]),
+        colored(
+            f"Imported {number_of_monitors} of {len(uuids)} "
+            f"monitors from {json_database_file}",
+            "green",
+        ),
+    )
@@ -1,12 +1,18 @@
+from concurrent.futures import ProcessPoolExecutor
 import os
-import shutil
+import pickle
+import typing as t
+from typing import Dict, List, Optional, Tuple
 
 from termcolor import colored
 from sifflet.collection_objects.collection import Collection
+from sifflet.collection_objects.discovery import IgnoreRules
 from sifflet.renderer.database import Database
-from sifflet.utils import dump_dict_to_yaml_file
+from sifflet.utils import dump_dict_to_yaml_file, ordered_dump
+from ..manifest import ADDED, CHANGED, REMOVED, UNCHANGED, RenderManifest
+from ..output import FILES_OUTPUT, RenderOutput
 from ..structure_manager import StructureManager
-from ..settings import DATABASE, RENDERED_FOLDER
+from ..settings import RENDERED_FOLDER, get_default_database
 
 
 def validate_file_extension(workspace_file: str) -> None:
@@ -14,18 +20,201 @@ def validate_file_extension(workspace_file: str) -> None:
         raise ValueError(f"Workspace file must be a yaml file, got {workspace_file}")
 
 
-def render_collection_to_folder(collection: Collection, rendered_folder: str) -> None:
+def render_collection_to_folder(
+    collection: Collection,
+    rendered_folder: str,
+    monitors_uuids: t.Optional[t.Dict[str, str]] = None,
+    output: t.Optional[RenderOutput] = None,
+) -> None:
+    if monitors_uuids is None:
+        monitors_uuids = collection.get_monitors_uuids()
     for monitor in collection:
+        monitor_ready_for_api = monitor.clear_fields_for_api(
+            monitors_uuids[str(monitor)]
+        )
+        if output is not None:
+            output.write_monitor(str(monitor), ordered_dump(monitor_ready_for_api))
+            continue
         filepath = os.path.join(rendered_folder, f"{monitor}.yaml")
-        monitor_ready_for_api = monitor.clear_fields_for_api()
         dump_dict_to_yaml_file(filepath, monitor_ready_for_api)  # type: ignore
 
 
-def print_end_of_rendering(collections_manager: StructureManager):
-    num_collections = len(collections_manager.collections_to_render)
-    number_of_monitors = sum(
-        len(collection) for collection in collections_manager.collections_to_render
+def render_collections(
+    collections_manager: StructureManager,
+    database: Database,
+    output: RenderOutput,
+    read_only: bool,
+) -> None:
+    """
+    Renders the collections one after the other, resolving the uuids of all their
+    monitors at once.
+    """
+    monitors_uuids = database.read_or_add_many(
+        (
+            str(monitor)
+            for collection in collections_manager.collections_to_render
+            for monitor in collection
+        ),
+        read_only=read_only,
     )
+
+    for collection in collections_manager.collections_to_render:
+        print(f"Rendering monitors from {collection}...")
+        output.start_collection(str(collection))
+        render_collection_to_folder(
+            collection, output.manifest.rendered_folder, monitors_uuids, output
+        )
+
+
+def stream_collections(
+    collections_manager: StructureManager,
+    database: Database,
+    output: RenderOutput,
+    read_only: bool,
+) -> int:
+    """
+    Renders the collections one file at a time: the monitors of a file are built,
+    their uuids resolved and their yaml written before the next file is read.
+    The collections must be created without loading their monitors.
+
+    Returns:
+        int: The number of rendered monitors
+    """
+    number_of_monitors = 0
+    for collection in collections_manager.collections_to_render:
+        print(f"Rendering monitors from {collection}...")
+        output.start_collection(str(collection))
+        for monitors in collection.iter_monitors_by_file():
+            monitors_uuids = database.read_or_add_many(
+                [str(monitor) for monitor in monitors], read_only=read_only
+            )
+            for monitor in monitors:
+                output.write_monitor(
+                    str(monitor),
+                    ordered_dump(
+                        monitor.clear_fields_for_api(monitors_uuids[str(monitor)])
+                    ),
+                )
+            number_of_monitors += len(monitors)
+    return number_of_monitors
+
+
+# Database of the render worker processes, unpickled once per process
+WORKER_DATABASE: Optional[Database] = None
+
+
+def init_render_worker(pickled_database: bytes) -> None:
+    """
+    Initializes a render worker process with its own copy of the database, so that
+    no file handle or connection is shared with the main process.
+    """
+    global WORKER_DATABASE  # pylint: disable=global-statement
+    WORKER_DATABASE = pickle.loads(pickled_database)
+
+
+def render_collection_in_worker(
+    collection_root: str,
+    default_values: t.Any,
+    ignore_rules: IgnoreRules,
+    read_only: bool,
+) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Loads the monitors of a collection and renders them in a worker process.
+    The uuids of the monitors missing from the database are not written by the
+    worker, but returned to the main process, which writes them all at once.
+
+    Args:
+        collection_root (str): The path to the collection folder
+        default_values (dict): The merged default values of the collection
+        ignore_rules (IgnoreRules): The `.dqacignore` rules of the parent folders
+        read_only (bool): Fail on monitors missing from the database
+
+    Returns:
+        tuple: The name and the rendered yaml of each monitor, and the new uuids
+            that are not written to the database yet
+    """
+    database = t.cast(Database, WORKER_DATABASE)
+    collection = Collection(
+        collection_root,
+        database=database,
+        default_values=default_values,
+        ignore_rules=ignore_rules,
+    )
+    monitors_uuids = collection.get_monitors_uuids(read_only=read_only)
+    rendered_monitors = [
+        (
+            str(monitor),
+            ordered_dump(monitor.clear_fields_for_api(monitors_uuids[str(monitor)])),
+        )
+        for monitor in collection
+    ]
+    return rendered_monitors, database.take_pending_uuids()
+
+
+def render_collections_in_parallel(
+    collections: List[Collection],
+    database: Database,
+    output: RenderOutput,
+    read_only: bool,
+    jobs: int,
+) -> int:
+    """
+    Loads and renders the collections in `jobs` processes. The rendered files are
+    written by the main process in the order of the collections, so the output is
+    the same as a serial render. The new uuids of the workers are added to the
+    database of the main process, and written by its final flush.
+
+    Returns:
+        int: The number of rendered monitors
+    """
+    database.flush()
+    pickled_database = pickle.dumps(database)
+    unique_collections: Dict[str, Collection] = {
+        str(collection): collection for collection in collections
+    }
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_render_worker,
+        initargs=(pickled_database,),
+    ) as executor:
+        futures = {
+            collection_name: executor.submit(
+                render_collection_in_worker,
+                collection.collection_root,
+                collection.default_values,
+                collection.inherited_ignore_rules,
+                read_only,
+            )
+            for collection_name, collection in unique_collections.items()
+        }
+        number_of_monitors = 0
+        for collection in collections:
+            print(f"Rendering monitors from {collection}...")
+            rendered_monitors, pending_uuids = futures[str(collection)].result()
+            database.add_pending_uuids(pending_uuids)
+            output.start_collection(str(collection))
+            for monitor_key, content in rendered_monitors:
+                output.write_monitor(monitor_key, content)
+            number_of_monitors += len(rendered_monitors)
+    return number_of_monitors
+
+
+def print_rendered_files_summary(manifest: RenderManifest) -> None:
+    summary = manifest.summary
+    print(
+        f"\nRendered files: {summary[ADDED]} added, {summary[CHANGED]} changed, "
+        f"{summary[REMOVED]} removed, {summary[UNCHANGED]} unchanged"
+    )
+
+
+def print_end_of_rendering(
+    collections_manager: StructureManager, number_of_monitors: Optional[int] = None
+):
+    num_collections = len(collections_manager.collections_to_render)
+    if number_of_monitors is None:
+        number_of_monitors = sum(
+            len(collection) for collection in collections_manager.collections_to_render
+        )
     print(
         colored("\n[SUCCESS]", "green", attrs=["bold"]),
         colored(
@@ -38,36 +227,84 @@ def print_end_of_rendering(collections_manager: StructureManager):
 
 
 def render_monitors(
-    database: Database = DATABASE,
+    database: Optional[Database] = None,
     rendered_folder: str = RENDERED_FOLDER,
     collections_yaml_file: str = "collections.yaml",
+    read_only: bool = False,
+    manifest_file: t.Optional[str] = None,
+    jobs: int = 1,
+    stream: bool = False,
+    output_mode: str = FILES_OUTPUT,
 ) -> None:
     """
     Renders monitors from a given workspace file using helper functions.
 
     Parameters:
         - workspace_file (str): Path to the workspace file.
-        - database (Database): Database to be used. Defaults to DATABASE.
+        - database (Database): Database to be used. Defaults to the database
+            from settings.
         - rendered_folder (str): Folder to save rendered monitors. Defaults to RENDERED_FOLDER.
+        - read_only (bool): Fail on monitors missing from the database instead of
+            adding them. Defaults to False.
+        - manifest_file (str): Manifest of the hashes of the rendered files, used to
+            only write the files that changed. Defaults to the rendered folder name
+            followed by .manifest.json.
+        - jobs (int): Number of processes loading and rendering the collections.
+            Defaults to 1.
+        - stream (bool): Render the collections one file at a time, so that memory
+            is bounded by the largest file instead of the whole workspace. Defaults
+            to False.
+        - output_mode (str): "files" to render a file per monitor, "collection" to
+            render a multi-document file per collection, or "render" to render all
+            the monitors to a single multi-document file. Defaults to "files".
 
     Returns:
         None
     """
     print(f"\nRendering monitors from {collections_yaml_file}...")
     validate_file_extension(collections_yaml_file)
+    if database is None:
+        database = get_default_database()
+
+    if jobs < 1:
+        raise ValueError(f"The number of jobs must be at least 1, got {jobs}")
+    if stream and jobs > 1:
+        raise ValueError("Streaming renders can not run in several processes")
 
-    collections_manager = StructureManager(collections_yaml_file, database)
+    # Parallel and streaming renders only read the default values here, the
+    # monitors are loaded later one collection or file at a time
+    collections_manager = StructureManager(
+        collections_yaml_file,
+        database,
+        load_monitors=jobs == 1 and not stream,
+        lazy=True,
+    )
     print(
         f"Found {len(collections_manager.collections_to_render)} "
         f"{'collections' if len(collections_manager.collections_to_render) > 1 else 'collection'}\n"
     )
 
-    shutil.rmtree(rendered_folder, ignore_errors=True)
+    manifest = RenderManifest(rendered_folder, manifest_file)
+    output = RenderOutput(manifest, output_mode)
 
-    os.makedirs(rendered_folder, exist_ok=True)
-
-    for collection in collections_manager.collections_to_render:
-        print(f"Rendering monitors from {collection}...")
-        render_collection_to_folder(collection, rendered_folder)
+    if jobs > 1:
+        number_of_monitors: Optional[int] = render_collections_in_parallel(
+            collections_manager.collections_to_render,
+            database,
+            output,
+            read_only,
+            jobs,
+        )
+    elif stream:
+        number_of_monitors = stream_collections(
+            collections_manager, database, output, read_only
+        )
+    else:
+        number_of_monitors = None
+        render_collections(collections_manager, database, output, read_only)
 
-    print_end_of_rendering(collections_manager)
+    output.close()
+    manifest.save()
+    database.flush()
+    print_rendered_files_summary(manifest)
+    print_end_of_rendering(collections_manager, number_of_monitors)
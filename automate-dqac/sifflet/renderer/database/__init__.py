@@ -0,0 +1,15 @@
+from .base import ConflictingUuidsError, Database
+from .json_database import (
+    DatabaseManager,
+    BufferedDatabaseManager,
+    write_bytes_atomically,
+    write_json_atomically,
+)
+from .sqlite_database import SqliteDatabaseManager
+from .sharded_database import ShardedDatabaseManager
+from .log_database import LogDatabaseManager
+from .deterministic_database import (
+    DeterministicDatabaseManager,
+    DEFAULT_UUID_NAMESPACE,
+)
+from .backends import DATABASE_BACKENDS, get_database
@@ -0,0 +1,39 @@
+import typing as t
+
+from .base import Database
+from .json_database import BufferedDatabaseManager
+from .sqlite_database import SqliteDatabaseManager
+from .sharded_database import ShardedDatabaseManager
+from .log_database import LogDatabaseManager
+from .deterministic_database import DeterministicDatabaseManager
+
+DATABASE_BACKENDS: t.Dict[str, t.Callable[..., Database]] = {
+    "json": BufferedDatabaseManager,
+    "sqlite": SqliteDatabaseManager,
+    "sharded": ShardedDatabaseManager,
+    "log": LogDatabaseManager,
+    "deterministic": DeterministicDatabaseManager,
+}
+
+
+def get_database(backend: str, database_file: str, **options) -> Database:
+    """
+    Instantiate the database of the given backend.
+
+    Args:
+        backend (str): The name of the backend, one of DATABASE_BACKENDS
+        database_file (str): The path to the database file, or folder for
+            the sharded backend
+
+    Additionnal arguments:
+        Passed to the backend, e.g. uuid_namespace for the deterministic backend
+
+    Returns:
+        Database: The database object
+    """
+    if backend not in DATABASE_BACKENDS:
+        raise ValueError(
+            f"Unknown database backend {backend}. "
+            f"Available backends: {', '.join(DATABASE_BACKENDS)}"
+        )
+    return DATABASE_BACKENDS[backend](database_file, **options)
@@ -0,0 +1,158 @@
+"""
+A database stores a list of key / values, where keys are CollectionMonitor
+names and values are uuids.
+"""
+
+from abc import ABC, abstractmethod
+import typing as t
+from typing import Dict, List, Optional
+import uuid
+
+MAX_MISSING_MONITORS_IN_ERROR = 10
+
+
+def raise_missing_monitors(missing_keys: List[str]) -> None:
+    """
+    Raise an error listing the monitors missing from the database, if any.
+    """
+    if not missing_keys:
+        return
+    listed_keys = [f"- {key}" for key in missing_keys[:MAX_MISSING_MONITORS_IN_ERROR]]
+    if len(missing_keys) > MAX_MISSING_MONITORS_IN_ERROR:
+        listed_keys.append(
+            f"... and {len(missing_keys) - MAX_MISSING_MONITORS_IN_ERROR} more"
+        )
+    listed_keys_message = "\n".join(listed_keys)
+    raise ValueError(
+        f"{len(missing_keys)} monitors are missing from the read-only database:\n"
+        f"{listed_keys_message}"
+    )
+
+
+class ConflictingUuidsError(ValueError):
+    """
+    Raised when pending uuids are written to a database in which another process
+    added the same monitors with other uuids. The stored uuids are kept, so the
+    files rendered with the pending ones are outdated.
+
+    Args:
+        conflicting_uuids (dict): The stored uuids of the conflicting monitors
+    """
+
+    def __init__(self, conflicting_uuids: Dict[str, str]) -> None:
+        self.conflicting_uuids = conflicting_uuids
+        super().__init__(conflicting_uuids)
+
+    def __str__(self) -> str:
+        keys = list(self.conflicting_uuids)
+        listed_keys = "\n".join(
+            f"- {key}" for key in keys[:MAX_MISSING_MONITORS_IN_ERROR]
+        )
+        return (
+            f"{len(keys)} monitors were added to the database by another process "
+            "with other uuids, their rendered files are outdated. Render them again "
+            f"to use the stored uuids:\n{listed_keys}"
+        )
+
+
+class Database(ABC):
+    @abstractmethod
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        """
+        Generates an uuid and adds the monitor to the database.
+        Args:
+            monitor_key (str): The monitor name (i.e. str(monitor))
+        Raises:
+            ValueError: If the monitor already exists in the database.
+        """
+
+    @abstractmethod
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        pass
+
+    @abstractmethod
+    def delete_uuid(self, monitor_key: str) -> None:
+        pass
+
+    @abstractmethod
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        """
+        Adds already generated uuids to the database. Monitors that are already
+        in the database keep their uuid.
+        Args:
+            uuids (dict): The monitor names and their uuids
+        Returns:
+            int: The number of imported monitors
+        """
+
+    @abstractmethod
+    def get_monitor_keys(self) -> List[str]:
+        """
+        Returns:
+            list[str]: The names of all the monitors in the database
+        """
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        """
+        Deletes monitors from the database, and compacts it.
+        Args:
+            monitor_keys (Iterable[str]): The monitor names (i.e. str(monitor))
+        Raises:
+            ValueError: If a monitor does not exist in the database.
+        """
+        for key in monitor_keys:
+            self.delete_uuid(key)
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        """
+        Returns the uuids of all the given monitors at once. The monitors missing
+        from the database are added to it.
+        Args:
+            monitor_keys (Iterable[str]): The monitor names (i.e. str(monitor))
+            read_only (bool): Raise an error instead of adding missing monitors.
+        Raises:
+            ValueError: If read_only is set and monitors are missing from the database.
+        """
+        uuids = {key: self.read_uuid(key) for key in monitor_keys}
+        missing_keys = [key for key, value in uuids.items() if not value]
+        if read_only:
+            raise_missing_monitors(missing_keys)
+        for key in missing_keys:
+            uuids[key] = self.add_uuid(key)
+        return uuids  # type: ignore
+
+    def register_root_collections(self, root_collections: List[str]) -> None:
+        """
+        Called with the names of the root collections of the workspace before the
+        database is used. Databases that do not depend on them have nothing to do.
+        Args:
+            root_collections (list[str]): The root collections names (i.e. str(collection))
+        """
+
+    def take_pending_uuids(self) -> Dict[str, str]:
+        """
+        Returns the uuids added since the last flush and not persisted yet, and
+        forgets them, so that another copy of the database persists them, e.g. the
+        one of the main process for the uuids added in a worker process. Databases
+        writing every change directly to disk have nothing pending.
+        """
+        return {}
+
+    def add_pending_uuids(self, uuids: Dict[str, str]) -> None:
+        """
+        Adds uuids taken from another copy of the database with
+        `take_pending_uuids`. Databases writing every change directly to disk
+        import them.
+        """
+        self.import_uuids(uuids)
+
+    def flush(self) -> None:
+        """
+        Persist the pending changes. Databases writing every change directly
+        to disk have nothing to do.
+        Raises:
+            ConflictingUuidsError: If another process added some of the pending
+                monitors with other uuids
+        """
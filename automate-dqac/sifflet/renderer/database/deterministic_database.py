@@ -0,0 +1,92 @@
+"""
+The uuid of a monitor is derived from its name with uuid5, so rendering needs no
+database lookup. Monitors created before switching to this mode keep their random
+uuid, pinned in a json file of overrides.
+"""
+
+import typing as t
+from typing import Dict, List, Optional
+import uuid
+
+from .base import Database
+from .json_database import BufferedDatabaseManager
+
+DEFAULT_UUID_NAMESPACE = "9d7e3f0e-6a53-4a4e-8c1b-5f2d8f4a3c11"
+
+
+class DeterministicDatabaseManager(Database):
+    """
+    Database deriving the uuid of each monitor from a namespace and the monitor
+    name. The overrides file pins the uuids that must not change, i.e. the random
+    uuids of monitors that already exist in Sifflet. Importing a json database
+    pins all of its uuids.
+    """
+
+    def __init__(
+        self, overrides_file: str, uuid_namespace: str = DEFAULT_UUID_NAMESPACE
+    ) -> None:
+        self.uuid_namespace = uuid.UUID(uuid_namespace)
+        self.overrides = BufferedDatabaseManager(overrides_file)
+
+    def derive_uuid(self, monitor_key: str) -> str:
+        return str(uuid.uuid5(self.uuid_namespace, monitor_key))
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        """
+        Every monitor already has a uuid, derived or pinned, so there is nothing to
+        add: `read_uuid` never returns None and callers never need this method.
+
+        Raises:
+            ValueError: Always, as the monitor already exists in database
+        """
+        raise ValueError(f"Monitor {monitor_key} already exists in database")
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        pinned_uuid = self.overrides.read_uuid(monitor_key)
+        if pinned_uuid:
+            return pinned_uuid
+        return self.derive_uuid(monitor_key)  # type: ignore
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        """
+        Removes the pinned uuid of the monitor, if any. The monitor then gets its
+        derived uuid.
+        """
+        if self.overrides.read_uuid(monitor_key):
+            self.overrides.delete_uuid(monitor_key)
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        """
+        Pins the uuids that differ from the derived ones.
+        """
+        return self.overrides.import_uuids(
+            {
+                key: value
+                for key, value in uuids.items()
+                if value != self.derive_uuid(key)
+            }
+        )
+
+    def get_monitor_keys(self) -> List[str]:
+        """
+        Returns:
+            list[str]: The monitors with a pinned uuid. The other monitors are not
+                stored anywhere.
+        """
+        return self.overrides.get_monitor_keys()
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        self.overrides.delete_many(
+            [key for key in monitor_keys if key in self.overrides.index]
+        )
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        pinned_uuids = self.overrides.index
+        return {
+            key: pinned_uuids.get(key) or self.derive_uuid(key) for key in monitor_keys
+        }
+
+    def flush(self) -> None:
+        self.overrides.flush()
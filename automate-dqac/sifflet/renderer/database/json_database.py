@@ -0,0 +1,285 @@
+"""
+The database is a json file. It stores a list of key / values, where keys are
+CollectionMonitor names and values are uuids.
+"""
+
+import os
+import shutil
+import tempfile
+import typing as t
+from typing import Dict, List, Optional
+import uuid
+import json
+
+from .base import ConflictingUuidsError, Database, raise_missing_monitors
+from .locking import file_lock
+
+
+def write_bytes_atomically(path: str, content: bytes) -> None:
+    """
+    Write a file through a temporary file renamed over the target, so that a crash
+    during the write leaves the previous file untouched.
+
+    Args:
+        path (str): The path of the file to write
+        content (bytes): The content of the file
+    """
+    dirs = os.path.dirname(path) or "."
+    file_descriptor, tmp_path = tempfile.mkstemp(dir=dirs, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as tmp_file:
+            tmp_file.write(content)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def write_text_atomically(path: str, content: str) -> None:
+    """
+    Write a text file atomically, see `write_bytes_atomically`.
+
+    Args:
+        path (str): The path of the file to write
+        content (str): The content of the file
+    """
+    write_bytes_atomically(path, content.encode("utf-8"))
+
+
+def write_json_atomically(json_path: str, data: dict) -> None:
+    """
+    Write data to a json file atomically, see `write_text_atomically`.
+
+    Args:
+        json_path (str): The path of the json file to write
+        data (dict): The data to dump
+    """
+    write_text_atomically(json_path, json.dumps(data))
+
+
+def read_json_file(json_path: str) -> Dict[str, str]:
+    with open(json_path, "r", encoding="utf-8") as database:
+        return json.load(database)
+
+
+def allocate_missing_uuids(
+    data: Dict[str, str], monitor_keys: t.Iterable[str], read_only: bool
+) -> t.Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Look up the uuids of the monitors in the json data, and generate uuids for
+    the missing ones.
+
+    Returns:
+        tuple: The uuids of all the monitors, and the newly generated uuids
+    """
+    uuids = {key: data.get(key) for key in monitor_keys}
+    missing_keys = [key for key, value in uuids.items() if value is None]
+    if read_only:
+        raise_missing_monitors(missing_keys)
+    new_uuids = {key: str(uuid.uuid4()) for key in missing_keys}
+    uuids.update(new_uuids)
+    return uuids, new_uuids  # type: ignore
+
+
+def delete_keys(data: Dict[str, str], monitor_keys: t.Iterable[str]) -> None:
+    """
+    Delete the monitors from the json data. The data is left untouched if any of
+    the monitors is missing.
+    """
+    monitor_keys = list(monitor_keys)
+    for key in monitor_keys:
+        if key not in data:
+            raise ValueError(f"Monitor {key} does not exist in database")
+    for key in monitor_keys:
+        del data[key]
+
+
+class DatabaseManager(Database):
+    """
+    Json database read and written on every call. Writes re-read the file under
+    an exclusive lock, so that concurrent processes do not lose each other's changes.
+    """
+
+    def __init__(self, json_path: str) -> None:
+        self.database_file = json_path
+        self.create_database()
+
+    def create_database(self) -> None:
+        """
+        Create the database file if it does not exist.
+        """
+        dirs = os.path.dirname(self.database_file)
+        if dirs and not os.path.exists(dirs):
+            os.makedirs(dirs, exist_ok=True)
+        if os.path.exists(self.database_file):
+            return
+        with file_lock(self.database_file):
+            if not os.path.exists(self.database_file):
+                write_json_atomically(self.database_file, {})
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            if monitor_key in data:
+                raise ValueError(f"Monitor {monitor_key} already exists in database")
+            data[monitor_key] = str(uuid.uuid4())
+            write_json_atomically(self.database_file, data)
+        return data[monitor_key]  # type: ignore
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        return read_json_file(self.database_file).get(monitor_key)  # type: ignore
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            if not monitor_key in data:
+                raise ValueError(f"Monitor {monitor_key} does not exist in database")
+            del data[monitor_key]
+            write_json_atomically(self.database_file, data)
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            new_uuids = {key: value for key, value in uuids.items() if key not in data}
+            data.update(new_uuids)
+            write_json_atomically(self.database_file, data)
+        return len(new_uuids)
+
+    def get_monitor_keys(self) -> List[str]:
+        return list(read_json_file(self.database_file))
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            delete_keys(data, monitor_keys)
+            write_json_atomically(self.database_file, data)
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        monitor_keys = list(monitor_keys)
+        data = read_json_file(self.database_file)
+        uuids, new_uuids = allocate_missing_uuids(data, monitor_keys, read_only)
+        if not new_uuids:
+            return uuids
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            uuids, new_uuids = allocate_missing_uuids(data, monitor_keys, read_only)
+            data.update(new_uuids)
+            write_json_atomically(self.database_file, data)
+        return uuids
+
+
+class BufferedDatabaseManager(DatabaseManager):
+    """
+    Json database loaded once into an in-memory index. Changes are kept in memory
+    and written back in a single atomic write when `flush` is called, instead of
+    rewriting the whole file for every added monitor.
+
+    Writes are merged with the current content of the file under an exclusive lock,
+    so that concurrent processes keep each other's changes. If two processes add the
+    same monitor, the first one to write its uuid wins: the flush of the other one
+    reads the stored uuid back and raises a ConflictingUuidsError.
+    """
+
+    def __init__(self, json_path: str) -> None:
+        super().__init__(json_path)
+        self._index: Optional[Dict[str, str]] = None
+        self._added_uuids: Dict[str, str] = {}
+        self._deleted_keys: t.Set[str] = set()
+
+    @property
+    def index(self) -> Dict[str, str]:
+        """
+        The monitor key / uuid mapping, read from the json file on first access.
+        """
+        if self._index is None:
+            self._index = read_json_file(self.database_file)
+        return self._index
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        if monitor_key in self.index:
+            raise ValueError(f"Monitor {monitor_key} already exists in database")
+        self.index[monitor_key] = str(uuid.uuid4())
+        self._added_uuids[monitor_key] = self.index[monitor_key]
+        self._deleted_keys.discard(monitor_key)
+        return self.index[monitor_key]  # type: ignore
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        return self.index.get(monitor_key)  # type: ignore
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        self.delete_many([monitor_key])
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        new_uuids = {
+            key: value for key, value in uuids.items() if key not in self.index
+        }
+        self.index.update(new_uuids)
+        self._added_uuids.update(new_uuids)
+        self._deleted_keys.difference_update(new_uuids)
+        return len(new_uuids)
+
+    def get_monitor_keys(self) -> List[str]:
+        return list(self.index)
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        monitor_keys = list(monitor_keys)
+        delete_keys(self.index, monitor_keys)
+        for key in monitor_keys:
+            self._added_uuids.pop(key, None)
+        self._deleted_keys.update(monitor_keys)
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        uuids, new_uuids = allocate_missing_uuids(
+            self.index, list(monitor_keys), read_only
+        )
+        self.add_pending_uuids(new_uuids)
+        return uuids
+
+    def take_pending_uuids(self) -> Dict[str, str]:
+        added_uuids = self._added_uuids
+        self._added_uuids = {}
+        return added_uuids
+
+    def add_pending_uuids(self, uuids: Dict[str, str]) -> None:
+        self.index.update(uuids)
+        self._added_uuids.update(uuids)
+        self._deleted_keys.difference_update(uuids)
+
+    def flush(self) -> None:
+        if self._added_uuids or self._deleted_keys:
+            self.merge_and_write()
+
+    def merge_and_write(self) -> None:
+        """
+        Re-reads the json file under lock, applies the pending changes on top of
+        it, and writes it back. The index is refreshed with the changes made by
+        other processes.
+
+        Raises:
+            ConflictingUuidsError: If another process added some of the pending
+                monitors with other uuids. The stored uuids are kept, and read
+                back into the index.
+        """
+        conflicting_uuids = {}
+        with file_lock(self.database_file):
+            data = read_json_file(self.database_file)
+            for key in self._deleted_keys:
+                data.pop(key, None)
+            for key, value in self._added_uuids.items():
+                stored_uuid = data.setdefault(key, value)
+                if stored_uuid != value:
+                    conflicting_uuids[key] = stored_uuid
+            write_json_atomically(self.database_file, data)
+        self._index = data
+        self._added_uuids = {}
+        self._deleted_keys = set()
+        if conflicting_uuids:
+            raise ConflictingUuidsError(conflicting_uuids)
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+import typing as t
+
+try:
+    import fcntl
+except ImportError:  # fcntl is not available on Windows
+    fcntl = None  # type: ignore
+
+LOCK_FILE_EXTENSION = ".lock"
+
+
+@contextmanager
+def file_lock(path: str) -> t.Iterator[None]:
+    """
+    Holds an exclusive advisory lock on the file while the block runs, so that
+    concurrent processes do not interleave their read-modify-write of the file.
+    The lock is taken on a separate `.lock` file, since the file itself is replaced
+    on every write. Without fcntl, the block runs unlocked.
+
+    Args:
+        path (str): The path of the file to lock
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}{LOCK_FILE_EXTENSION}", "a", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
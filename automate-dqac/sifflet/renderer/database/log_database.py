@@ -0,0 +1,223 @@
+"""
+The database is an append-only log of records, one line per added or deleted
+monitor. The log is replayed into an in-memory index when the database is opened,
+and rewritten without the deleted monitors once they make up too much of it.
+
+Monitor names share long collection prefixes, so each record only stores the
+part of the name that differs from the name of the previous record:
+
+    +<TAB><length of the prefix shared with the previous name><TAB><suffix><TAB><uuid>
+    -<TAB><length of the prefix shared with the previous name><TAB><suffix>
+"""
+
+from contextlib import contextmanager
+import os
+import typing as t
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+from .base import Database
+from .json_database import allocate_missing_uuids, write_text_atomically
+from .locking import file_lock
+
+ADD_OPERATION = "+"
+DELETE_OPERATION = "-"
+FIELDS_SEPARATOR = "\t"
+# The log is compacted when this share of its records is deleted or overwritten
+COMPACTION_DEAD_RECORDS_RATIO = 0.25
+
+Record = Tuple[str, str, Optional[str]]
+
+
+def encode_record(record: Record, previous_key: str) -> str:
+    operation, monitor_key, monitor_uuid = record
+    if FIELDS_SEPARATOR in monitor_key or "\n" in monitor_key:
+        raise ValueError(f"Monitor {monitor_key!r} can not be stored in the log")
+    shared_length = len(os.path.commonprefix([previous_key, monitor_key]))
+    fields = [operation, str(shared_length), monitor_key[shared_length:]]
+    if monitor_uuid is not None:
+        fields.append(monitor_uuid)
+    return FIELDS_SEPARATOR.join(fields) + "\n"
+
+
+def decode_record(line: str, previous_key: str) -> Record:
+    operation, shared_length, suffix, *monitor_uuid = line.split(FIELDS_SEPARATOR)
+    monitor_key = previous_key[: int(shared_length)] + suffix
+    return operation, monitor_key, monitor_uuid[0] if monitor_uuid else None
+
+
+class LogDatabaseManager(Database):
+    """
+    Append-only log database. Each change is a single append to the log, made under
+    an exclusive lock after replaying the records appended by other processes.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        compaction_ratio: float = COMPACTION_DEAD_RECORDS_RATIO,
+    ) -> None:
+        self.database_file = log_path
+        self.compaction_ratio = compaction_ratio
+        self._index: Optional[Dict[str, str]] = None
+        self._number_of_records = 0
+        self._last_key = ""
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    @property
+    def index(self) -> Dict[str, str]:
+        """
+        The monitor key / uuid mapping, replayed from the log on first access.
+        """
+        if self._index is None:
+            self.replay()
+        return self._index  # type: ignore
+
+    def replay(self) -> None:
+        """
+        Applies to the index the records appended to the log since the last replay.
+        The whole log is replayed if it was compacted in the meantime.
+        """
+        try:
+            stat = os.stat(self.database_file)
+        except FileNotFoundError:
+            stat = None
+        if (
+            self._index is None
+            or stat is None
+            or stat.st_ino != self._inode
+            or stat.st_size < self._offset
+        ):
+            self._index = {}
+            self._number_of_records = 0
+            self._last_key = ""
+            self._offset = 0
+            self._inode = stat.st_ino if stat else None
+        if stat is None:
+            return
+
+        with open(self.database_file, "rb") as log:
+            log.seek(self._offset)
+            content = log.read()
+        # A record being appended by another process is replayed next time
+        content = content[: content.rfind(b"\n") + 1]
+        for line in content.decode("utf-8").splitlines():
+            self.apply_record(decode_record(line, self._last_key))
+        self._offset += len(content)
+
+    def apply_record(self, record: Record) -> None:
+        operation, monitor_key, monitor_uuid = record
+        if operation == ADD_OPERATION:
+            self.index[monitor_key] = monitor_uuid  # type: ignore
+        else:
+            self.index.pop(monitor_key, None)
+        self._number_of_records += 1
+        self._last_key = monitor_key
+
+    @contextmanager
+    def locked(self) -> t.Iterator[None]:
+        """
+        Holds the lock of the log and catches up with the records appended by other
+        processes. The log is compacted when the block ends, if needed.
+        """
+        dirs = os.path.dirname(self.database_file)
+        if dirs and not os.path.exists(dirs):
+            os.makedirs(dirs, exist_ok=True)
+        with file_lock(self.database_file):
+            self.replay()
+            yield
+            dead_records = self._number_of_records - len(self.index)
+            if dead_records > self.compaction_ratio * self._number_of_records:
+                self.compact()
+
+    def append_records(self, records: List[Record]) -> None:
+        """
+        Appends the records to the log in a single write. Must be called while
+        holding the lock, so that the bytes after the last replayed record can only
+        be a partial record left by a process that crashed while appending: they
+        are truncated first.
+        """
+        if not records:
+            return
+        lines = []
+        for record in records:
+            lines.append(encode_record(record, self._last_key))
+            self.apply_record(record)
+        content = "".join(lines).encode("utf-8")
+        with open(self.database_file, "ab") as log:
+            log.truncate(self._offset)
+            log.write(content)
+            self._inode = os.fstat(log.fileno()).st_ino
+        self._offset += len(content)
+
+    def compact(self) -> None:
+        """
+        Rewrites the log with a single record per monitor, sorted by name so that
+        records share the longest possible prefixes. Must be called while holding
+        the lock.
+        """
+        index = self.index
+        self._index = {}
+        self._number_of_records = 0
+        self._last_key = ""
+        lines = []
+        for monitor_key in sorted(index):
+            record = (ADD_OPERATION, monitor_key, index[monitor_key])
+            lines.append(encode_record(record, self._last_key))
+            self.apply_record(record)
+        content = "".join(lines)
+        write_text_atomically(self.database_file, content)
+        self._offset = len(content.encode("utf-8"))
+        self._inode = os.stat(self.database_file).st_ino
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        with self.locked():
+            if monitor_key in self.index:
+                raise ValueError(f"Monitor {monitor_key} already exists in database")
+            monitor_uuid = str(uuid.uuid4())
+            self.append_records([(ADD_OPERATION, monitor_key, monitor_uuid)])
+        return monitor_uuid  # type: ignore
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        return self.index.get(monitor_key)  # type: ignore
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        self.delete_many([monitor_key])
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        with self.locked():
+            records = [
+                (ADD_OPERATION, key, value)
+                for key, value in uuids.items()
+                if key not in self.index
+            ]
+            self.append_records(records)  # type: ignore
+        return len(records)
+
+    def get_monitor_keys(self) -> List[str]:
+        return list(self.index)
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        monitor_keys = list(monitor_keys)
+        with self.locked():
+            for key in monitor_keys:
+                if key not in self.index:
+                    raise ValueError(f"Monitor {key} does not exist in database")
+            self.append_records([(DELETE_OPERATION, key, None) for key in monitor_keys])
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        monitor_keys = list(monitor_keys)
+        if read_only or all(key in self.index for key in monitor_keys):
+            uuids, _ = allocate_missing_uuids(self.index, monitor_keys, read_only=True)
+            return uuids
+        with self.locked():
+            uuids, new_uuids = allocate_missing_uuids(
+                self.index, monitor_keys, read_only=False
+            )
+            self.append_records(
+                [(ADD_OPERATION, key, value) for key, value in new_uuids.items()]
+            )
+        return uuids
@@ -0,0 +1,176 @@
+"""
+The database is a folder of json files, one per root collection. A render only
+reads and writes the files of the root collections it touches, and the files of
+the root collections that were not registered are never read nor written, so that
+teams sharing the folder cannot modify each other's monitors.
+"""
+
+import os
+import typing as t
+from typing import Dict, List, Optional
+import uuid
+
+from .base import ConflictingUuidsError, Database
+from .json_database import BufferedDatabaseManager
+
+SHARD_EXTENSION = ".json"
+
+
+class ShardedDatabaseManager(Database):
+    """
+    Json database split into one file per root collection. The shard of a monitor
+    is the root collection prefixing its name, so root collections must be
+    registered with `register_root_collections` before the database is used.
+    Shards are loaded on first access only.
+    """
+
+    def __init__(self, database_folder: str) -> None:
+        self.database_folder = database_folder
+        self.root_collections: List[str] = []
+        self._shards: Dict[str, BufferedDatabaseManager] = {}
+
+    def register_root_collections(self, root_collections: List[str]) -> None:
+        # Longest names first, so that nested root collections get their own shard
+        self.root_collections = sorted(
+            set(self.root_collections) | set(root_collections), key=len, reverse=True
+        )
+
+    def find_shard_name(self, monitor_key: str) -> Optional[str]:
+        """
+        Returns:
+            str: The name of the root collection containing the monitor, if any
+        """
+        for root_collection in self.root_collections:
+            if monitor_key.startswith(f"{root_collection}."):
+                return root_collection
+        return None
+
+    def get_shard_name(self, monitor_key: str) -> str:
+        shard_name = self.find_shard_name(monitor_key)
+        if shard_name is None:
+            raise ValueError(
+                f"Monitor {monitor_key} is not in any of the registered root "
+                f"collections ({', '.join(self.root_collections)}) "
+                "of the sharded database"
+            )
+        return shard_name
+
+    def get_shard(self, shard_name: str) -> BufferedDatabaseManager:
+        if shard_name not in self._shards:
+            self._shards[shard_name] = BufferedDatabaseManager(
+                os.path.join(self.database_folder, f"{shard_name}{SHARD_EXTENSION}")
+            )
+        return self._shards[shard_name]
+
+    def get_shard_of_monitor(self, monitor_key: str) -> BufferedDatabaseManager:
+        return self.get_shard(self.get_shard_name(monitor_key))
+
+    def get_registered_shards(self) -> List[BufferedDatabaseManager]:
+        """
+        Returns:
+            list[BufferedDatabaseManager]: The shards of the registered root
+                collections. The shards of other root collections are ignored.
+        """
+        return [
+            self.get_shard(root_collection)
+            for root_collection in sorted(self.root_collections)
+        ]
+
+    def group_by_shard(self, monitor_keys: t.Iterable[str]) -> Dict[str, List[str]]:
+        keys_by_shard: Dict[str, List[str]] = {}
+        for key in monitor_keys:
+            keys_by_shard.setdefault(self.get_shard_name(key), []).append(key)
+        return keys_by_shard
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        return self.get_shard_of_monitor(monitor_key).add_uuid(monitor_key)
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        return self.get_shard_of_monitor(monitor_key).read_uuid(monitor_key)
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        self.get_shard_of_monitor(monitor_key).delete_uuid(monitor_key)
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        """
+        Monitors outside of the registered root collections are not imported.
+        """
+        uuids_by_shard: Dict[str, Dict[str, str]] = {}
+        for key, value in uuids.items():
+            shard_name = self.find_shard_name(key)
+            if shard_name is not None:
+                uuids_by_shard.setdefault(shard_name, {})[key] = value
+        return sum(
+            self.get_shard(shard_name).import_uuids(shard_uuids)
+            for shard_name, shard_uuids in uuids_by_shard.items()
+        )
+
+    def get_monitor_keys(self) -> List[str]:
+        """
+        Returns:
+            list[str]: The names of the monitors of the registered root collections
+        """
+        return [key for shard in self.get_registered_shards() for key in shard.index]
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        """
+        Raises:
+            ValueError: If a monitor is not in the registered root collections or
+                does not exist in database. Nothing is deleted then.
+        """
+        keys_by_shard = [
+            (self.get_shard(shard_name), shard_keys)
+            for shard_name, shard_keys in self.group_by_shard(
+                dict.fromkeys(monitor_keys)
+            ).items()
+        ]
+        missing_keys = [
+            key
+            for shard, shard_keys in keys_by_shard
+            for key in shard_keys
+            if key not in shard.index
+        ]
+        if missing_keys:
+            raise ValueError(
+                f"Monitor {sorted(missing_keys)[0]} does not exist in database"
+            )
+        for shard, shard_keys in keys_by_shard:
+            shard.delete_many(shard_keys)
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        keys = list(dict.fromkeys(monitor_keys))
+        uuids: Dict[str, str] = {}
+        for shard_name, shard_keys in self.group_by_shard(keys).items():
+            uuids.update(
+                self.get_shard(shard_name).read_or_add_many(shard_keys, read_only)
+            )
+        return {key: uuids[key] for key in keys}
+
+    def take_pending_uuids(self) -> Dict[str, str]:
+        pending_uuids: Dict[str, str] = {}
+        for shard in self._shards.values():
+            pending_uuids.update(shard.take_pending_uuids())
+        return pending_uuids
+
+    def add_pending_uuids(self, uuids: Dict[str, str]) -> None:
+        for shard_name, shard_keys in self.group_by_shard(uuids).items():
+            self.get_shard(shard_name).add_pending_uuids(
+                {key: uuids[key] for key in shard_keys}
+            )
+
+    def flush(self) -> None:
+        """
+        Raises:
+            ConflictingUuidsError: With the conflicts of all the shards, which are
+                all flushed
+        """
+        conflicting_uuids: Dict[str, str] = {}
+        for shard in self._shards.values():
+            try:
+                shard.flush()
+            except ConflictingUuidsError as error:
+                conflicting_uuids.update(error.conflicting_uuids)
+        if conflicting_uuids:
+            raise ConflictingUuidsError(conflicting_uuids)
@@ -0,0 +1,209 @@
+"""
+The database is a SQLite file with an indexed table of monitor names and uuids.
+The file is opened in WAL mode so that other processes can keep reading it
+while a render writes to it.
+"""
+
+from contextlib import contextmanager
+import os
+import sqlite3
+import typing as t
+from typing import Dict, List, Optional
+import uuid
+
+from .base import ConflictingUuidsError, Database, raise_missing_monitors
+
+SQLITE_TIMEOUT_SECONDS = 30
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS monitors (
+    monitor_key TEXT PRIMARY KEY,
+    uuid TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+# Stays under SQLITE_MAX_VARIABLE_NUMBER of old SQLite versions
+SELECT_UUIDS_BATCH_SIZE = 900
+
+INSERT_UUIDS_QUERY = "INSERT OR IGNORE INTO monitors (monitor_key, uuid) VALUES (?, ?)"
+
+
+class SqliteDatabaseManager(Database):
+    """
+    SQLite database. New uuids are kept in memory and inserted in a single
+    transaction when `flush` is called. A monitor added by another process in the
+    meantime keeps its stored uuid, and the flush fails, since the uuid returned
+    for it was already used.
+    """
+
+    def __init__(self, sqlite_path: str) -> None:
+        self.database_file = sqlite_path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending_uuids: Dict[str, str] = {}
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """
+        The connection to the database, opened on first access. The database
+        file and its table are created if they do not exist.
+        """
+        if self._connection is None:
+            dirs = os.path.dirname(self.database_file)
+            if dirs and not os.path.exists(dirs):
+                os.makedirs(dirs)
+            self._connection = sqlite3.connect(
+                self.database_file,
+                timeout=SQLITE_TIMEOUT_SECONDS,
+                isolation_level=None,
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(CREATE_TABLE_QUERY)
+        return self._connection
+
+    def __getstate__(self) -> Dict[str, t.Any]:
+        """
+        The connection is not pickled, copies open their own connection.
+        """
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def add_uuid(self, monitor_key: str) -> uuid.UUID:
+        if self.read_uuid(monitor_key):
+            raise ValueError(f"Monitor {monitor_key} already exists in database")
+        self._pending_uuids[monitor_key] = str(uuid.uuid4())
+        return self._pending_uuids[monitor_key]  # type: ignore
+
+    def read_uuid(self, monitor_key: str) -> Optional[uuid.UUID]:
+        if monitor_key in self._pending_uuids:
+            return self._pending_uuids[monitor_key]  # type: ignore
+        row = self.connection.execute(
+            "SELECT uuid FROM monitors WHERE monitor_key = ?", (monitor_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def delete_uuid(self, monitor_key: str) -> None:
+        if not self.read_uuid(monitor_key):
+            raise ValueError(f"Monitor {monitor_key} does not exist in database")
+        if self._pending_uuids.pop(monitor_key, None):
+            return
+        self.connection.execute(
+            "DELETE FROM monitors WHERE monitor_key = ?", (monitor_key,)
+        )
+
+    def import_uuids(self, uuids: Dict[str, str]) -> int:
+        self.flush()
+        with self.transaction() as connection:
+            number_of_monitors = connection.total_changes
+            connection.executemany(INSERT_UUIDS_QUERY, uuids.items())
+            return connection.total_changes - number_of_monitors
+
+    def get_monitor_keys(self) -> List[str]:
+        self.flush()
+        return [
+            row[0]
+            for row in self.connection.execute("SELECT monitor_key FROM monitors")
+        ]
+
+    def delete_many(self, monitor_keys: t.Iterable[str]) -> None:
+        self.flush()
+        monitor_keys = list(monitor_keys)
+        with self.transaction() as connection:
+            number_of_monitors = connection.total_changes
+            connection.executemany(
+                "DELETE FROM monitors WHERE monitor_key = ?",
+                ((key,) for key in monitor_keys),
+            )
+            if connection.total_changes - number_of_monitors != len(monitor_keys):
+                raise ValueError("Some monitors do not exist in database")
+        self.connection.execute("VACUUM")
+
+    def select_uuids(self, keys: List[str]) -> Dict[str, str]:
+        """
+        Returns:
+            dict: The stored uuids of the monitors found in the database
+        """
+        uuids: Dict[str, str] = {}
+        for index in range(0, len(keys), SELECT_UUIDS_BATCH_SIZE):
+            batch = keys[index : index + SELECT_UUIDS_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            uuids.update(
+                self.connection.execute(
+                    "SELECT monitor_key, uuid FROM monitors "
+                    f"WHERE monitor_key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            )
+        return uuids
+
+    def read_or_add_many(
+        self, monitor_keys: t.Iterable[str], read_only: bool = False
+    ) -> Dict[str, str]:
+        keys = list(dict.fromkeys(monitor_keys))
+        uuids = {
+            key: self._pending_uuids[key] for key in keys if key in self._pending_uuids
+        }
+        uuids.update(self.select_uuids(keys))
+        missing_keys = [key for key in keys if key not in uuids]
+        if read_only:
+            raise_missing_monitors(missing_keys)
+        new_uuids = {key: str(uuid.uuid4()) for key in missing_keys}
+        self._pending_uuids.update(new_uuids)
+        uuids.update(new_uuids)
+        return {key: uuids[key] for key in keys}
+
+    def flush(self) -> None:
+        """
+        Inserts the new uuids. The ones of the monitors that another process added
+        first are not inserted.
+
+        Raises:
+            ConflictingUuidsError: If monitors were added by another process with
+                other uuids
+        """
+        if not self._pending_uuids:
+            return
+        conflicting_uuids = {}
+        with self.transaction() as connection:
+            number_of_monitors = connection.total_changes
+            connection.executemany(INSERT_UUIDS_QUERY, self._pending_uuids.items())
+            if connection.total_changes - number_of_monitors != len(
+                self._pending_uuids
+            ):
+                stored_uuids = self.select_uuids(list(self._pending_uuids))
+                conflicting_uuids = {
+                    key: stored_uuids[key]
+                    for key, value in self._pending_uuids.items()
+                    if stored_uuids[key] != value
+                }
+        self._pending_uuids = {}
+        if conflicting_uuids:
+            raise ConflictingUuidsError(conflicting_uuids)
+
+    def take_pending_uuids(self) -> Dict[str, str]:
+        pending_uuids = self._pending_uuids
+        self._pending_uuids = {}
+        return pending_uuids
+
+    def add_pending_uuids(self, uuids: Dict[str, str]) -> None:
+        self._pending_uuids.update(uuids)
+
+    @contextmanager
+    def transaction(self) -> t.Iterator[sqlite3.Connection]:
+        """
+        Runs the block inside a write transaction, rolled back on error.
+        """
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,112 @@
+"""
+The render manifest maps each rendered file to a hash of its content, so that a
+render only writes the files whose content changed, and only removes the files of
+monitors that disappeared. Unchanged files keep their modification time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import typing as t
+from typing import Dict
+
+from sifflet.renderer.database import write_json_atomically
+
+MANIFEST_EXTENSION = ".manifest.json"
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+UNCHANGED = "unchanged"
+
+
+def get_manifest_file(rendered_folder: str) -> str:
+    """
+    Returns:
+        str: The path of the manifest of the rendered folder, stored next to it.
+    """
+    return os.path.normpath(rendered_folder) + MANIFEST_EXTENSION
+
+
+def hash_content(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class RenderManifest:
+    """
+    Writes the rendered monitors of a folder, comparing them with the hashes of the
+    previous render. Without a manifest, e.g. on the first render, the folder is
+    emptied like a full render.
+    """
+
+    def __init__(self, rendered_folder: str, manifest_file: t.Optional[str] = None):
+        self.rendered_folder = rendered_folder
+        self.manifest_file = manifest_file or get_manifest_file(rendered_folder)
+        self.previous_hashes = self.read_hashes()
+        self.hashes: Dict[str, str] = {}
+        self.summary = {ADDED: 0, CHANGED: 0, REMOVED: 0, UNCHANGED: 0}
+
+        if not self.previous_hashes:
+            shutil.rmtree(rendered_folder, ignore_errors=True)
+        os.makedirs(rendered_folder, exist_ok=True)
+
+    def read_hashes(self) -> Dict[str, str]:
+        if not os.path.isfile(self.manifest_file):
+            return {}
+        with open(self.manifest_file, "r", encoding="utf-8") as manifest:
+            return json.load(manifest)
+
+    def get_rendered_file(self, name: str) -> str:
+        return os.path.join(self.rendered_folder, f"{name}.yaml")
+
+    def add_file(self, name: str, content_hash: str) -> bool:
+        """
+        Records the hash of a rendered file.
+
+        Args:
+            name (str): The name of the file, without the yaml extension
+            content_hash (str): The sha256 of the rendered content
+
+        Returns:
+            bool: Whether the file must be written, i.e. it is new or changed
+        """
+        if self.hashes.get(name) == content_hash:
+            return False
+        self.hashes[name] = content_hash
+        previous_hash = self.previous_hashes.get(name)
+        if previous_hash == content_hash and os.path.isfile(
+            self.get_rendered_file(name)
+        ):
+            self.summary[UNCHANGED] += 1
+            return False
+        self.summary[CHANGED if previous_hash else ADDED] += 1
+        return True
+
+    def write_monitor(self, monitor_key: str, content: str) -> None:
+        """
+        Writes the rendered monitor, unless the file already has this content.
+
+        Args:
+            monitor_key (str): The monitor name (i.e. str(monitor))
+            content (str): The rendered yaml content of the monitor
+        """
+        if not self.add_file(monitor_key, hash_content(content)):
+            return
+        with open(
+            self.get_rendered_file(monitor_key), "w", encoding="utf-8"
+        ) as rendered_file:
+            rendered_file.write(content)
+
+    def save(self) -> None:
+        """
+        Removes the files that were not rendered this time, and writes the manifest.
+        """
+        for name in self.previous_hashes:
+            if name in self.hashes:
+                continue
+            try:
+                os.remove(self.get_rendered_file(name))
+            except FileNotFoundError:
+                pass
+            self.summary[REMOVED] += 1
+        write_json_atomically(self.manifest_file, self.hashes)
@@ -0,0 +1,106 @@
+"""
+The rendered monitors are written either to one file per monitor, or bundled in
+multi-document yaml files: one per collection, or a single one for the render.
+Bundles are written through a large buffer, so that a render performs a few large
+sequential writes instead of opening a file per monitor.
+"""
+
+import hashlib
+import os
+import typing as t
+
+from .manifest import RenderManifest
+
+FILES_OUTPUT = "files"
+COLLECTION_BUNDLE_OUTPUT = "collection"
+RENDER_BUNDLE_OUTPUT = "render"
+OUTPUT_MODES = (FILES_OUTPUT, COLLECTION_BUNDLE_OUTPUT, RENDER_BUNDLE_OUTPUT)
+
+# Name of the bundle of a render, without the yaml extension
+RENDER_BUNDLE_NAME = "monitors"
+DOCUMENT_SEPARATOR = "---\n"
+BUNDLE_BUFFER_SIZE = 1024 * 1024
+
+
+class BundleWriter:
+    """
+    Writes monitors to a multi-document yaml file. The documents are written to a
+    temporary file while they are hashed, and the file replaces the previous bundle
+    only if its content changed.
+    """
+
+    def __init__(self, manifest: RenderManifest, name: str) -> None:
+        self.manifest = manifest
+        self.name = name
+        self.monitors_keys: t.Set[str] = set()
+        self.content_hash = hashlib.sha256()
+        self.temporary_file = f"{manifest.get_rendered_file(name)}.tmp"
+        self.bundle = open(  # pylint: disable=consider-using-with
+            self.temporary_file, "w", encoding="utf-8", buffering=BUNDLE_BUFFER_SIZE
+        )
+
+    def write_monitor(self, monitor_key: str, content: str) -> None:
+        if monitor_key in self.monitors_keys:
+            return
+        self.monitors_keys.add(monitor_key)
+        document = f"{DOCUMENT_SEPARATOR}{content}"
+        self.content_hash.update(document.encode("utf-8"))
+        self.bundle.write(document)
+
+    def close(self) -> None:
+        self.bundle.close()
+        if self.manifest.add_file(self.name, self.content_hash.hexdigest()):
+            os.replace(self.temporary_file, self.manifest.get_rendered_file(self.name))
+        else:
+            os.remove(self.temporary_file)
+
+
+class RenderOutput:
+    """
+    Dispatches the rendered monitors to their files, depending on the output mode.
+
+    Args:
+        manifest (RenderManifest): The manifest of the rendered folder
+        output_mode (str): One of OUTPUT_MODES. Defaults to one file per monitor.
+    """
+
+    def __init__(
+        self, manifest: RenderManifest, output_mode: str = FILES_OUTPUT
+    ) -> None:
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(
+                f"Unknown output mode {output_mode}. "
+                f"Available modes: {', '.join(OUTPUT_MODES)}"
+            )
+        self.manifest = manifest
+        self.output_mode = output_mode
+        self.bundle: t.Optional[BundleWriter] = None
+
+    def start_collection(self, collection_name: str) -> None:
+        """
+        Called before writing the monitors of a collection.
+        """
+        if self.output_mode == COLLECTION_BUNDLE_OUTPUT:
+            self.close()
+            self.bundle = BundleWriter(self.manifest, collection_name)
+        elif self.output_mode == RENDER_BUNDLE_OUTPUT and self.bundle is None:
+            self.bundle = BundleWriter(self.manifest, RENDER_BUNDLE_NAME)
+
+    def write_monitor(self, monitor_key: str, content: str) -> None:
+        """
+        Args:
+            monitor_key (str): The monitor name (i.e. str(monitor))
+            content (str): The rendered yaml content of the monitor
+        """
+        if self.bundle is None:
+            self.manifest.write_monitor(monitor_key, content)
+        else:
+            self.bundle.write_monitor(monitor_key, content)
+
+    def close(self) -> None:
+        """
+        Writes the bundle being rendered, if any.
+        """
+        if self.bundle is not None:
+            self.bundle.close()
+            self.bundle = None
@@ -1,6 +1,34 @@
-from sifflet.renderer.database import DatabaseManager
+from functools import lru_cache
+
+from sifflet.renderer.database import DEFAULT_UUID_NAMESPACE, Database, get_database
 
 
 RENDERED_FOLDER = "./artefacts/rendered"
 WORKSPACE_COLLECTIONS_SETTING = "collections"
-DATABASE = DatabaseManager("./artefacts/database.json")
+# Cache of the parsed yaml files, set to None to disable it
+YAML_CACHE_FOLDER = "./artefacts/yaml_cache"
+DATABASE_BACKEND = "json"
+DATABASE_FILES = {
+    "json": "./artefacts/database.json",
+    "sqlite": "./artefacts/database.sqlite",
+    "sharded": "./artefacts/database",
+    "log": "./artefacts/database.log",
+    "deterministic": "./artefacts/pinned_uuids.json",
+}
+# Namespace of the uuids derived from the monitors names by the deterministic backend
+UUID_NAMESPACE = DEFAULT_UUID_NAMESPACE
+DATABASE_OPTIONS = {"deterministic": {"uuid_namespace": UUID_NAMESPACE}}
+
+
+@lru_cache(maxsize=None)
+def get_default_database() -> Database:
+    """
+    Returns:
+        Database: The database of the settings above. It is built on first use, so
+            that the commands that do not need it, e.g. check, create no file.
+    """
+    return get_database(
+        DATABASE_BACKEND,
+        DATABASE_FILES[DATABASE_BACKEND],
+        **DATABASE_OPTIONS.get(DATABASE_BACKEND, {}),
+    )
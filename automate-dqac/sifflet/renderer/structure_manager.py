@@ -1,18 +1,63 @@
 import os
 import typing as t
-from typing import List
+from typing import Dict, List, Optional
 
 from sifflet.utils import read_yaml_file
 from sifflet.renderer.database import Database
 from sifflet.collection_objects.collection import Collection
+from sifflet.collection_objects.collection_tree import CollectionTree
+from sifflet.collection_objects.discovery import get_workspace_ignore_rules
 from sifflet.collection_objects.errors.classes import check_data_structure
 from sifflet.collection_objects.types import CollectionsToRenderFileDict
 
 from .settings import WORKSPACE_COLLECTIONS_SETTING
 
 
+def raise_collection_not_found(collection_id: str) -> t.NoReturn:
+    raise FileNotFoundError(
+        f"Could not find collection {collection_id} "
+        "Please make sure the collection exists and is correctly setup."
+    )
+
+
+def read_collections_declaration_file(collections_yaml_file: str) -> List[str]:
+    """
+    Returns:
+        list[str]: The collections declared in the collections file
+    """
+    config = read_yaml_file(collections_yaml_file)
+    config = check_data_structure(
+        config,
+        CollectionsToRenderFileDict,
+        filepath=collections_yaml_file,
+    )
+    return config[WORKSPACE_COLLECTIONS_SETTING]
+
+
+def get_root_collections(collections_yaml_file: str) -> List[str]:
+    """
+    Returns:
+        list[str]: The paths of the root collections of the declared collections,
+            without reading the collections
+    """
+    collections_dir = os.path.dirname(collections_yaml_file)
+    roots = [
+        os.path.join(collections_dir, collection.split(".")[0])
+        for collection in read_collections_declaration_file(collections_yaml_file)
+    ]
+    return list(dict.fromkeys(roots))
+
+
 class StructureManager:
-    def __init__(self, collections_yaml_file: str, database: Database) -> None:
+    def __init__(
+        self,
+        collections_yaml_file: str,
+        database: Optional[Database],
+        load_monitors: bool = True,
+        lazy: bool = False,
+        index_monitors: bool = False,
+        collect_errors: bool = False,
+    ) -> None:
         """
         Initialize the StructureManager. This will read the workspace yaml file
         and initialize the list of root collections under the parameter
@@ -21,12 +66,65 @@ class StructureManager:
 
         Args:
             workspace (str): The path to the workspace yaml file
+            database (Database): The database storing the monitors uuids. None
+                when the uuids are not needed.
+            load_monitors (bool): Read the monitors files of the collections.
+                Defaults to True. When False, only the default values are read.
+            lazy (bool): Only build the collections when they are needed: the
+                collections to render and their children when `collections_to_render`
+                is first read, or a single collection with `get_collection`. Only the
+                default values of their parent collections are read. Defaults to
+                False, building all the collections of the root collections.
+            index_monitors (bool): Index the monitors of all the collections by key
+                in `tree.monitors`, checking that the keys are unique across
+                collections. Defaults to False.
+            collect_errors (bool): Record the errors raised while building the
+                declared collections and their children in `errors`, e.g. a wrong
+                default values file, and skip these collections and their children
+                instead of failing. Defaults to False.
         """
         self.database = database
-        self.collections = self.get_collections_from_workspace(collections_yaml_file)
-        self.collections_to_render = self.get_collections_to_render(
-            collections_yaml_file, self.collections
-        )
+        self.load_monitors = load_monitors
+        self.lazy = lazy
+        self.collections_yaml_file = collections_yaml_file
+        # The collections built so far, and the names of the ones whose monitors
+        # were read
+        self.tree = CollectionTree(index_monitors)
+        self.loaded_collections: t.Set[str] = set()
+        self.collect_errors = collect_errors
+        # The errors raised while building collections, by collection path
+        self.errors: Dict[str, Exception] = {}
+        self._collections_to_render: Optional[List[Collection]] = None
+        self.root_collections = self.get_root_collections(collections_yaml_file)
+        self.ignore_rules = get_workspace_ignore_rules(collections_yaml_file)
+        if self.database is not None:
+            self.database.register_root_collections(
+                [root.replace(os.sep, ".") for root in self.root_collections]
+            )
+        if not lazy:
+            self.get_collections_from_workspace(collections_yaml_file)
+            self._collections_to_render = self.get_collections_to_render(
+                collections_yaml_file
+            )
+
+    @property
+    def collections(self) -> List[Collection]:
+        """
+        The collections built so far, parents first.
+        """
+        return list(self.tree)
+
+    @property
+    def collections_to_render(self) -> List[Collection]:
+        """
+        The collections declared in the collections file, and their children.
+        """
+        if self._collections_to_render is None:
+            self.load_declared_collections(self.collections_yaml_file)
+            self._collections_to_render = self.get_collections_to_render(
+                self.collections_yaml_file
+            )
+        return self._collections_to_render
 
     def read_collections_declaration_file(
         self, collections_yaml_file: str
@@ -36,19 +134,13 @@ class StructureManager:
         Args:
             collections_yaml_file (str): The path to the collections declaration file
         """
-        config = read_yaml_file(collections_yaml_file)
-        config = check_data_structure(
-            config,
-            CollectionsToRenderFileDict,
-            filepath=collections_yaml_file,
-        )
-        return config[WORKSPACE_COLLECTIONS_SETTING]
+        return read_collections_declaration_file(collections_yaml_file)
 
     def get_collections_from_workspace(
         self, collections_yaml_file: str
     ) -> List[Collection]:
         """
-        Reads the workspace yaml file and returns the list of root and
+        Builds the root collections of the declared collections, and all their
         sub collections. If children collections are called, their parents
         will also be called to read default values.
 
@@ -56,61 +148,176 @@ class StructureManager:
             workspace (str): The path to the workspace yaml file
 
         Returns:
-            list[str]: all collections as relative paths
+            list[Collection]: all the collections, parents first
+        """
+        for root in self.root_collections:
+            self.load_collection(root, load_children=True)
+        return self.collections
+
+    def get_root_collections(self, collections_yaml_file: str) -> List[str]:
+        """
+        Returns:
+            list[str]: The paths of the root collections of the declared collections
         """
+        return get_root_collections(collections_yaml_file)
 
-        collections = self.read_collections_declaration_file(collections_yaml_file)
+    def load_declared_collections(self, collections_yaml_file: str) -> None:
+        """
+        Builds the declared collections with their children, and the parents they
+        inherit default values from. Parent collections are declared first, so that
+        a child collection is not built again.
+        """
         collections_dir = os.path.dirname(collections_yaml_file)
-        collections_root = [
-            os.path.join(collections_dir, collections.split(".")[0])
-            for collections in collections
-        ]
-        collections = [
-            Collection(collection, database=self.database)
-            for collection in collections_root
-        ]
-        for collection in collections:
-            self.add_child_collections(collection, collections)
-        return collections
+        declared_collections = sorted(
+            self.read_collections_declaration_file(collections_yaml_file),
+            key=lambda collection: collection.count("."),
+        )
+        for collection in declared_collections:
+            try:
+                self.load_collection(
+                    os.path.join(collections_dir, *collection.split(".")),
+                    load_children=True,
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self.raise_uncollected_error(error)
 
-    def get_collections_to_render(
-        self, collections_yaml_file: str, collections: List[Collection]
-    ) -> List[Collection]:
+    def load_collection(
+        self, collection_root: str, load_children: bool = False
+    ) -> Collection:
+        """
+        Builds a collection, and the chain of parent collections up to its root
+        collection without their monitors.
+
+        Args:
+            collection_root (str): The path to the collection
+            load_children (bool): Also build all the children of the collection
+
+        Returns:
+            Collection: The collection object
+        """
+        collection_id = collection_root.replace(os.sep, ".")
+        root = next(
+            (
+                root
+                for root in self.root_collections
+                if collection_root == root or collection_root.startswith(root + os.sep)
+            ),
+            None,
+        )
+        if root is None:
+            raise_collection_not_found(collection_id)
+        relative_path = os.path.relpath(collection_root, root)
+        collections_roots = [root]
+        if relative_path != os.curdir:
+            for folder in relative_path.split(os.sep):
+                collections_roots.append(os.path.join(collections_roots[-1], folder))
+
+        parent_collection = None
+        for parent_collection_root in collections_roots[:-1]:
+            parent_collection = self.build_collection(
+                parent_collection_root, parent_collection, load_monitors=False
+            )
+        collection = self.build_collection(
+            collections_roots[-1], parent_collection, load_monitors=self.load_monitors
+        )
+        if load_children:
+            self.load_child_collections(collection)
+        return collection
+
+    def build_collection(
+        self,
+        collection_root: str,
+        parent_collection: Optional[Collection],
+        load_monitors: bool,
+    ) -> Collection:
         """
-        Filter the collections to only render the one declared in the workspace yaml file.
+        Builds a collection, unless it was already built. Its monitors are read if
+        needed and not read yet.
+        """
+        collection_id = collection_root.replace(os.sep, ".")
+        collection = self.tree.get(collection_id)
+        if collection is None:
+            if not os.path.isdir(collection_root):
+                raise_collection_not_found(collection_id)
+            if collection_root in self.errors:
+                # Already collected, e.g. for a parent of several collections
+                raise self.errors[collection_root]
+            try:
+                collection = Collection(
+                    collection_root,
+                    database=self.database,
+                    parent_collection=parent_collection,
+                    load_monitors=load_monitors,
+                    ignore_rules=(
+                        self.ignore_rules if parent_collection is None else None
+                    ),
+                    tree_monitors=self.tree.monitors,
+                )
+            except Exception as error:
+                if self.collect_errors:
+                    self.errors[collection_root] = error
+                raise
+            self.tree.add(collection)
+        elif load_monitors and collection_id not in self.loaded_collections:
+            collection.load_monitors()
+        if load_monitors:
+            self.loaded_collections.add(collection_id)
+        return collection
+
+    def load_child_collections(self, collection: Collection) -> None:
+        """
+        Builds all the children of the collection recursively, as found when the
+        collection was built.
+        """
+        for child_collection_root in collection.child_collections_roots:
+            try:
+                child = self.build_collection(
+                    child_collection_root, collection, load_monitors=self.load_monitors
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                self.raise_uncollected_error(error)
+                continue
+            self.load_child_collections(child)
+
+    def raise_uncollected_error(self, error: Exception) -> None:
+        """
+        Raises the error again, unless it was collected while building a collection.
+        """
+        if not any(error is collected for collected in self.errors.values()):
+            raise error
+
+    def get_collections_to_render(self, collections_yaml_file: str) -> List[Collection]:
+        """
+        Select the built collections declared in the workspace yaml file.
         Children of called collections will also be called to be rendered.
 
         Args:
             workspace (str): The path to the workspace yaml file
 
         Returns:
-            list[str]: all collections as relative paths
+            list[Collection]: The declared collections and their children
         """
-
-        collections_to_render_names = [
-            os.path.join(os.path.dirname(collections_yaml_file), collection)
-            .replace("/", ".")
-            .split(".")
-            for collection in self.read_collections_declaration_file(
+        declared_names = [
+            os.path.join(
+                os.path.dirname(collections_yaml_file), collection_to_render
+            ).replace("/", ".")
+            for collection_to_render in self.read_collections_declaration_file(
                 collections_yaml_file
             )
         ]
-        collections_to_render = []
-
-        for collection in collections:
-            collection_name = str(collection).split(".")
-            for collection_to_render_name in collections_to_render_names:
-                # If the collection or a parent is called,
-                # add it to the list of collections to render
-                if len(collection_name) < len(collection_to_render_name):
-                    continue
-                if (
-                    collection_name[: len(collection_to_render_name)]
-                    == collection_to_render_name
-                ):
-                    collections_to_render.append(collection)
-
-        return collections_to_render
+        declared_collections = set(declared_names)
+        collections_to_render: Dict[str, Collection] = {}
+        for collection_to_render_name in declared_names:
+            declared_collection = self.tree.get(collection_to_render_name)
+            if declared_collection is None or any(
+                ancestor.name in declared_collections
+                for ancestor in declared_collection.iter_ancestors()
+            ):
+                # Not built, or already in the subtree of a declared parent
+                continue
+            for collection in declared_collection.iter_subtree():
+                collections_to_render.setdefault(str(collection), collection)
+        return list(collections_to_render.values())
 
     def get_collection(self, collection_id: str) -> Collection:
         """
@@ -123,38 +330,23 @@ class StructureManager:
         Returns:
             Collection: The collection object
         """
-        for collection in self.collections:
-            if str(collection) == collection_id:
-                return collection
-        raise FileNotFoundError(
-            f"Could not find collection {collection_id} "
-            "Please make sure the collection exists and is correctly setup."
-        )
-
-    def add_child_collections(
-        self, collection: Collection, collections: List[Collection]
-    ) -> None:
-        """
-        Add all the child collections recursively of the given collection to the collections list.
-        Args:
-            collection (str): The path to the collection
-            collections (list[str]): The list of collections
-
-        Returns:
-            list[str]: The list of collections with the child collections
-        """
-        for child_collection in os.listdir(collection.collection_root):
-            child_collection_root = os.path.join(
-                str(collection.collection_root), child_collection
-            )
-            if os.path.isdir(child_collection_root):
-                child_collection = Collection(
-                    child_collection_root,
-                    database=self.database,
-                    parent_collection=collection,
-                )
-                collections.append(child_collection)
-                self.add_child_collections(child_collection, collections)
+        collection = self.tree.get(collection_id)
+        if collection is not None and (
+            not self.load_monitors or collection_id in self.loaded_collections
+        ):
+            return collection
+        if self.lazy:
+            for root in self.root_collections:
+                root_id = root.replace(os.sep, ".")
+                if collection_id == root_id:
+                    return self.load_collection(root)
+                if collection_id.startswith(root_id + "."):
+                    return self.load_collection(
+                        os.path.join(
+                            root, *collection_id[len(root_id) + 1 :].split(".")
+                        )
+                    )
+        raise_collection_not_found(collection_id)
 
     def __getitem__(self, index: int) -> Collection:
         return self.collections[index]
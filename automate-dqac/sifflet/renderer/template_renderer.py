@@ -2,6 +2,8 @@ from collections import OrderedDict
 import jinja2
 import yaml
 
+from sifflet.yaml_backend import SafeLoader
+
 
 def render_jinja2_template_to_dict(template_path: str, env_vars: dict) -> OrderedDict:
     """
@@ -28,4 +30,4 @@ def render_jinja2_template_to_dict(template_path: str, env_vars: dict) -> Ordere
         ) from error
 
     # Convert the rendered content (in YAML format) to a Python dictionary
-    return OrderedDict(yaml.safe_load(rendered_content))
+    return OrderedDict(yaml.load(rendered_content, SafeLoader))
@@ -0,0 +1,86 @@
+"""
+Positions of the yaml mappings in their source file, recorded by the loader while
+it composes the documents. They are kept in a side index by object id, so that the
+loaded values stay plain OrderedDict, and errors can point to the exact line and
+column of a monitor without reading its file again. Entries are dropped when their
+mapping is garbage collected.
+"""
+
+from collections.abc import Mapping
+import typing as t
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import weakref
+
+from sifflet.layered_values import LayeredValues
+
+
+class SourceMark(NamedTuple):
+    # Both start at 1, like in editors
+    line: int
+    column: int
+
+
+class MarkReference(weakref.ref):  # pylint: disable=too-few-public-methods
+    """
+    Weak reference to a marked mapping, carrying its mark and its key in the index.
+    """
+
+    __slots__ = ("key", "mark")
+
+    def __new__(cls, value: t.Any, mark: SourceMark) -> "MarkReference":
+        reference = super().__new__(cls, value, forget_source_mark)
+        reference.key = id(value)
+        reference.mark = mark
+        return reference
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, value: t.Any, mark: SourceMark
+    ) -> None:
+        pass
+
+
+SOURCE_MARKS: Dict[int, MarkReference] = {}
+
+
+def forget_source_mark(reference: MarkReference) -> None:
+    if SOURCE_MARKS.get(reference.key) is reference:
+        del SOURCE_MARKS[reference.key]
+
+
+def set_source_mark(value: t.Any, mark: SourceMark) -> None:
+    SOURCE_MARKS[id(value)] = MarkReference(value, mark)
+
+
+def get_source_mark(value: t.Any) -> Optional[SourceMark]:
+    """
+    Returns:
+        SourceMark: The position of the mapping in its file, or None if it was not
+            loaded from a file. The position of a view of merged values is the one
+            of its last layer, e.g. the values written for a monitor.
+    """
+    if isinstance(value, LayeredValues):
+        value = value.layers[-1]
+    reference = SOURCE_MARKS.get(id(value))
+    if reference is None or reference() is not value:
+        return None
+    return reference.mark
+
+
+def collect_source_marks(content: t.Any) -> List[Tuple[t.Any, SourceMark]]:
+    """
+    Returns:
+        list: The marked mappings of a document and their marks, e.g. to persist
+            them with the document
+    """
+    marks = []
+    values = [content]
+    while values:
+        value = values.pop()
+        if isinstance(value, Mapping):
+            mark = get_source_mark(value)
+            if mark is not None:
+                marks.append((value, mark))
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+    return marks
@@ -0,0 +1,138 @@
+"""
+Memory used by each Monitor object, on top of its values, for a render of 100k
+monitors. Compares the compact Monitor with a replica of the previous one, which
+had an instance dict and its own copy of the dataset id, and built its name on
+each call.
+
+Run from the automate-dqac folder:
+
+    python -m sifflet.tests.benchmarks.monitor_memory [number_of_monitors]
+"""
+
+from collections import OrderedDict
+import sys
+import time
+import tracemalloc
+import typing as t
+
+from sifflet.collection_objects import Monitor
+from sifflet.layered_values import layer_values
+
+NUMBER_OF_MONITORS = 100_000
+NUMBER_OF_DATASETS = 100
+MONITORS_BY_COLLECTION = 1_000
+STR_ROUNDS = 10
+
+
+class DictMonitor:
+    """
+    The previous Monitor, without the structure check.
+    """
+
+    def __init__(self, monitor: t.Any, collection: t.Any, dataset: str) -> None:
+        self.values = monitor
+        self.collection = collection
+        self.dataset = dataset
+
+    def __str__(self) -> str:
+        return f"{str(self.collection)}.{self.values['identifier']}"
+
+
+class BenchmarkCollection:
+    """
+    Stands for a collection, which only gives its name to the monitors.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = sys.intern(name)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def build_collections(number_of_collections: int) -> t.List[t.Any]:
+    return [
+        BenchmarkCollection(f"workspace.collections.team_{index}")
+        for index in range(number_of_collections)
+    ]
+
+
+def build_values(number_of_monitors: int) -> t.List[t.Any]:
+    default_values = OrderedDict(
+        kind="Monitor",
+        version=1,
+        incident=OrderedDict(severity="Low", message="Monitor failed"),
+    )
+    return [
+        layer_values(
+            default_values,
+            OrderedDict(
+                identifier=f"monitor_{index}",
+                name=f"Monitor {index}",
+                parameters=OrderedDict(kind="Freshness"),
+            ),
+        )
+        for index in range(number_of_monitors)
+    ]
+
+
+def build_datasets(number_of_monitors: int) -> t.List[str]:
+    # The dataset ids are parsed again from each file, so monitors do not share them
+    return [
+        f"c8a95817-c7b3-427a-9350-{index % NUMBER_OF_DATASETS:012d}"
+        for index in range(number_of_monitors)
+    ]
+
+
+def measure(
+    monitor_class: t.Callable[..., t.Any],
+    values: t.List[t.Any],
+    collections: t.List[t.Any],
+) -> t.Tuple[float, float, float]:
+    """
+    Returns:
+        tuple: The bytes used by each monitor, including its dataset id, before and
+            after their names were read, and the seconds spent reading the names STR_ROUNDS times
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    datasets = build_datasets(len(values))
+    monitors = [
+        monitor_class(
+            monitor_values,
+            collections[index // MONITORS_BY_COLLECTION],
+            datasets[index],
+        )
+        for index, monitor_values in enumerate(values)
+    ]
+    del datasets
+    built = tracemalloc.get_traced_memory()[0]
+    started_at = time.perf_counter()
+    for _ in range(STR_ROUNDS):
+        for monitor in monitors:
+            str(monitor)
+    str_seconds = time.perf_counter() - started_at
+    named = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (
+        (built - start) / len(monitors),
+        (named - start) / len(monitors),
+        str_seconds,
+    )
+
+
+def main() -> None:
+    number_of_monitors = int(sys.argv[1]) if len(sys.argv) > 1 else NUMBER_OF_MONITORS
+    values = build_values(number_of_monitors)
+    collections = build_collections(-(-number_of_monitors // MONITORS_BY_COLLECTION))
+    print(f"{number_of_monitors} monitors, bytes per monitor on top of its values:")
+    for label, monitor_class in [("before", DictMonitor), ("after", Monitor)]:
+        built, named, str_seconds = measure(monitor_class, values, collections)
+        print(
+            f"{label:>6}: {built:6.0f} built, {named:6.0f} after str(), "
+            f"{str_seconds:.2f}s for {STR_ROUNDS} str() rounds"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+
+import pytest
+from sifflet.commands import COMMANDS_DESCRIPTION, run_command_from_args
+from sifflet.renderer.commands import check_collections
+from sifflet.tests.settings import RENDER_FOLDER
+
+TEST_COLLECTIONS_PATH = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+
+
+@pytest.fixture
+def collections_path(tmp_path) -> str:
+    shutil.copytree(
+        os.path.join(RENDER_FOLDER, "collections"),
+        os.path.join(tmp_path, "collections"),
+    )
+    shutil.copy(TEST_COLLECTIONS_PATH, tmp_path)
+    return os.path.join(tmp_path, "test_collections.yaml")
+
+
+def write_file(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_check_collections(jobs: int, collections_path: str, monkeypatch, capsys):
+    workspace_folder = os.path.dirname(collections_path)
+    monkeypatch.chdir(workspace_folder)
+    args = COMMANDS_DESCRIPTION.parse_args(
+        ["check", collections_path, "--jobs", str(jobs)]
+    )
+    assert run_command_from_args(args) == 0
+    assert "Checked 20 monitors in 5 files from 5 collections" in (
+        capsys.readouterr().out
+    )
+    # Neither the database nor the yaml cache are written
+    assert not os.path.exists(os.path.join(workspace_folder, "artefacts"))
+
+
+def test_check_collections_reports_all_errors(collections_path: str, capsys):
+    collection_2 = os.path.join(os.path.dirname(collections_path), "collections")
+    collection_2 = os.path.join(collection_2, "collection_2")
+    write_file(
+        os.path.join(collection_2, "wrong_monitors.yaml"),
+        """datasets:
+  - dataset: f260a19c-1665-4351-b237-df9d095a869d
+    monitors:
+      - identifier: monitor 1
+        parameters:
+          kind: "Freshness"
+      - identifier: wrong monitor 1
+        schedule: ["not", "a", "schedule"]
+      - identifier: wrong monitor 2
+        unknown_key: value
+""",
+    )
+    write_file(os.path.join(collection_2, "wrong_file.yaml"), "datasets: value\n")
+
+    with pytest.raises(ValueError, match="Found 5 errors in 3 of 7 files"):
+        check_collections(collections_path, jobs=2)
+    output = capsys.readouterr().out
+    wrong_monitors_output = output[output.index("wrong_monitors.yaml (3 errors)") :]
+    assert "wrong monitor 1" in wrong_monitors_output
+    assert "Extra key: unknown_key" in wrong_monitors_output
+    assert "Monitor identifier monitor 1 is not unique" in output
+    assert "sales.yaml (1 error)" in output
+    assert "wrong_file.yaml (1 error)" in output
+
+
+def test_check_collections_reports_wrong_default_values(collections_path: str, capsys):
+    collections = os.path.join(os.path.dirname(collections_path), "collections")
+    team_b = os.path.join(collections, "collection_1", "teamB")
+    write_file(os.path.join(team_b, "$default.yaml"), "description: [unclosed\n")
+    write_file(
+        os.path.join(collections, "collection_2", "wrong_file.yaml"),
+        "datasets: value\n",
+    )
+
+    with pytest.raises(ValueError, match="Found 2 errors in 2 of 6 files"):
+        check_collections(collections_path, jobs=1)
+    output = capsys.readouterr().out
+    assert f"{team_b} (1 error)" in output
+    assert "wrong_file.yaml (1 error)" in output
+
+
+def test_check_collections_wrong_jobs():
+    with pytest.raises(ValueError, match="at least 1"):
+        check_collections(TEST_COLLECTIONS_PATH, jobs=0)
@@ -0,0 +1,66 @@
+import json
+import multiprocessing
+import os
+from typing import Dict, List, Tuple
+
+import pytest
+from sifflet.renderer.database import (
+    BufferedDatabaseManager,
+    ConflictingUuidsError,
+    DatabaseManager,
+)
+
+NUMBER_OF_WRITERS = 16
+MONITORS_PER_WRITER = 25
+SHARED_MONITORS = [f"shared.monitor {index}" for index in range(5)]
+
+
+def run_writer(
+    database_class, database_path: str, writer: int
+) -> Tuple[Dict[str, str], Dict[str, str], List[str]]:
+    """
+    Returns:
+        tuple: The uuids returned while adding the monitors, the uuids read back
+            after the flush, and the monitors whose uuid conflicted on flush
+    """
+    database = database_class(database_path)
+    own_monitors = [
+        f"writer_{writer}.monitor {index}" for index in range(MONITORS_PER_WRITER)
+    ]
+    uuids = {}
+    for monitor_key in own_monitors[:5]:
+        uuids[monitor_key] = database.add_uuid(monitor_key)
+    uuids.update(database.read_or_add_many(own_monitors[5:] + SHARED_MONITORS))
+    conflicting_keys: List[str] = []
+    try:
+        database.flush()
+    except ConflictingUuidsError as error:
+        conflicting_keys = list(error.conflicting_uuids)
+    stored_uuids = database.read_or_add_many(list(uuids), read_only=True)
+    return uuids, stored_uuids, conflicting_keys
+
+
+@pytest.mark.parametrize("database_class", [DatabaseManager, BufferedDatabaseManager])
+def test_concurrent_writers_do_not_lose_monitors(database_class, tmp_path):
+    database_path = os.path.join(tmp_path, "database.json")
+    context = multiprocessing.get_context("fork")
+    with context.Pool(NUMBER_OF_WRITERS) as pool:
+        results = pool.starmap(
+            run_writer,
+            [
+                (database_class, database_path, writer)
+                for writer in range(NUMBER_OF_WRITERS)
+            ],
+        )
+
+    with open(database_path, encoding="utf-8") as database:
+        data = json.load(database)
+    assert len(data) == NUMBER_OF_WRITERS * MONITORS_PER_WRITER + len(SHARED_MONITORS)
+    for uuids, stored_uuids, conflicting_keys in results:
+        # Only the monitors added by several writers can conflict, and the writers
+        # read the stored uuid back
+        assert set(conflicting_keys) <= set(SHARED_MONITORS)
+        assert stored_uuids == {key: data[key] for key in uuids}
+        for monitor_key, monitor_uuid in uuids.items():
+            if monitor_key not in conflicting_keys:
+                assert data[monitor_key] == monitor_uuid
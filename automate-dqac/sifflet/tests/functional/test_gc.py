@@ -0,0 +1,58 @@
+import os
+import shutil
+
+import pytest
+from sifflet.renderer.commands import collect_garbage
+from sifflet.renderer.database import BufferedDatabaseManager
+from sifflet.tests.settings import RENDER_FOLDER, TEST_FOLDER
+
+TEST_COLLECTIONS_PATH = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+LIVE_KEYS_PREFIX = "sifflet.tests.data.render_monitors.collections.collection_"
+OTHER_ROOT_PREFIX = "sifflet.tests.data.collection_"
+LIVE_KEYS = [f"{LIVE_KEYS_PREFIX}1.teamA.monitor {index}" for index in (1, 2, 3, 5)] + [
+    f"{LIVE_KEYS_PREFIX}1.teamB.monitor {index}" for index in range(1, 5)
+]
+
+
+@pytest.fixture
+def test_database(tmp_path) -> BufferedDatabaseManager:
+    database_path = os.path.join(tmp_path, "database.json")
+    shutil.copy(os.path.join(TEST_FOLDER, "test_database.json"), database_path)
+    return BufferedDatabaseManager(database_path)
+
+
+def test_collect_garbage_dry_run(test_database: BufferedDatabaseManager):
+    database_keys = test_database.get_monitor_keys()
+    collect_garbage(TEST_COLLECTIONS_PATH, dry_run=True, database=test_database)
+    assert BufferedDatabaseManager(test_database.database_file).get_monitor_keys() == (
+        database_keys
+    )
+
+
+def test_collect_garbage(test_database: BufferedDatabaseManager):
+    collect_garbage(TEST_COLLECTIONS_PATH, database=test_database)
+    database_keys = BufferedDatabaseManager(
+        test_database.database_file
+    ).get_monitor_keys()
+    declared_root_keys = [
+        key for key in database_keys if key.startswith(LIVE_KEYS_PREFIX)
+    ]
+    assert len(declared_root_keys) == 20
+    assert set(LIVE_KEYS) <= set(declared_root_keys)
+
+
+def test_collect_garbage_keeps_other_root_collections(
+    test_database: BufferedDatabaseManager,
+):
+    other_root_keys = [
+        key
+        for key in test_database.get_monitor_keys()
+        if key.startswith(OTHER_ROOT_PREFIX)
+    ]
+    assert len(other_root_keys) == 20
+    collect_garbage(TEST_COLLECTIONS_PATH, database=test_database)
+    database_keys = BufferedDatabaseManager(
+        test_database.database_file
+    ).get_monitor_keys()
+    assert set(other_root_keys) <= set(database_keys)
+    assert len(database_keys) == 40
@@ -0,0 +1,32 @@
+import json
+import os
+from unittest.mock import patch
+
+from sifflet.renderer.commands import import_database
+from sifflet.renderer.database import ShardedDatabaseManager
+from sifflet.tests.settings import RENDER_FOLDER
+
+TEST_COLLECTIONS_PATH = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+ROOT_COLLECTION = "sifflet.tests.data.render_monitors.collections"
+
+
+def test_import_database_registers_root_collections(tmp_path):
+    json_database_file = os.path.join(tmp_path, "database.json")
+    with open(json_database_file, "w", encoding="utf-8") as json_database:
+        json.dump(
+            {
+                f"{ROOT_COLLECTION}.collection_1.monitor 1": "uuid-1",
+                "other_root.monitor 1": "uuid-2",
+            },
+            json_database,
+        )
+    database = ShardedDatabaseManager(os.path.join(tmp_path, "database"))
+
+    with patch("sifflet.renderer.structure_manager.Collection") as collection:
+        import_database(json_database_file, TEST_COLLECTIONS_PATH, database)
+    # The collections are not built to find the root collections
+    collection.assert_not_called()
+    assert database.root_collections == [ROOT_COLLECTION]
+    assert ShardedDatabaseManager(os.path.join(tmp_path, "database")).get_shard(
+        ROOT_COLLECTION
+    ).index == {f"{ROOT_COLLECTION}.collection_1.monitor 1": "uuid-1"}
@@ -1,9 +1,18 @@
 import os
 import shutil
+import tempfile
 import unittest
 
+from sifflet.collection_objects.errors.classes import WrongCollectionMonitorFormatError
 from sifflet.renderer.commands import render_monitors
-from sifflet.renderer.database import DatabaseManager
+from sifflet.renderer.database import BufferedDatabaseManager, DatabaseManager
+from sifflet.renderer.manifest import get_manifest_file
+from sifflet.renderer.output import (
+    COLLECTION_BUNDLE_OUTPUT,
+    DOCUMENT_SEPARATOR,
+    RENDER_BUNDLE_NAME,
+    RENDER_BUNDLE_OUTPUT,
+)
 from sifflet.tests.settings import RENDER_FOLDER, TEST_FOLDER
 from sifflet.tests.utils import compare_folders
 
@@ -38,6 +47,178 @@ class FunctionalTestRender(unittest.TestCase):
         render_monitors(self.test_database, rendered_folder, test_collections_path)
         compare_folders(self, rendered_folder, correct_rendered_folder)
 
+    def test_render_monitors_read_only(self):
+        """
+        Test rendering monitors that are all in the database without modifying it.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitors")
+        correct_rendered_folder = os.path.join(RENDER_FOLDER, "correct_rendered")
+        test_collections_path = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+        render_monitors(
+            self.test_database, rendered_folder, test_collections_path, read_only=True
+        )
+        compare_folders(self, rendered_folder, correct_rendered_folder)
+
+    def test_render_monitors_incrementally(self):
+        """
+        Test rendering unchanged monitors again without rewriting their files.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitors")
+        correct_rendered_folder = os.path.join(RENDER_FOLDER, "correct_rendered")
+        test_collections_path = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+        render_monitors(self.test_database, rendered_folder, test_collections_path)
+        modification_times = {
+            rendered_file: os.stat(
+                os.path.join(rendered_folder, rendered_file)
+            ).st_mtime_ns
+            for rendered_file in os.listdir(rendered_folder)
+        }
+
+        render_monitors(self.test_database, rendered_folder, test_collections_path)
+        compare_folders(self, rendered_folder, correct_rendered_folder)
+        for rendered_file, modification_time in modification_times.items():
+            self.assertEqual(
+                os.stat(os.path.join(rendered_folder, rendered_file)).st_mtime_ns,
+                modification_time,
+            )
+
+    def test_render_monitors_in_parallel(self):
+        """
+        Test rendering monitors in several processes, with the same output
+        as a serial render.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitors")
+        correct_rendered_folder = os.path.join(RENDER_FOLDER, "correct_rendered")
+        test_collections_path = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+        render_monitors(
+            self.test_database, rendered_folder, test_collections_path, jobs=4
+        )
+        compare_folders(self, rendered_folder, correct_rendered_folder)
+
+    def test_render_monitors_streaming(self):
+        """
+        Test rendering monitors one file at a time, with the same output
+        as a full render.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitor_from_child")
+        correct_rendered_folder = os.path.join(
+            RENDER_FOLDER, "correct_rendered_monitors_from_child"
+        )
+        test_collections_path = os.path.join(
+            RENDER_FOLDER, "test_collections_from_child.yaml"
+        )
+        render_monitors(
+            self.test_database, rendered_folder, test_collections_path, stream=True
+        )
+        compare_folders(self, rendered_folder, correct_rendered_folder)
+
+    def test_render_monitors_to_bundles(self):
+        """
+        Test rendering monitors to a multi-document file per collection, and to a
+        single multi-document file.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitors")
+        correct_rendered_folder = os.path.join(RENDER_FOLDER, "correct_rendered")
+        test_collections_path = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+        correct_documents = set()
+        for rendered_file in os.listdir(correct_rendered_folder):
+            with open(
+                os.path.join(correct_rendered_folder, rendered_file), encoding="utf-8"
+            ) as correct_rendered:
+                correct_documents.add(correct_rendered.read())
+
+        for output_mode in [COLLECTION_BUNDLE_OUTPUT, RENDER_BUNDLE_OUTPUT]:
+            render_monitors(
+                self.test_database,
+                rendered_folder,
+                test_collections_path,
+                output_mode=output_mode,
+            )
+            documents = []
+            for bundle_file in os.listdir(rendered_folder):
+                self.assertTrue(bundle_file.endswith(".yaml"))
+                with open(
+                    os.path.join(rendered_folder, bundle_file), encoding="utf-8"
+                ) as bundle:
+                    documents.extend(bundle.read().split(DOCUMENT_SEPARATOR)[1:])
+            self.assertEqual(len(documents), len(correct_documents))
+            self.assertEqual(set(documents), correct_documents)
+        self.assertEqual(os.listdir(rendered_folder), [f"{RENDER_BUNDLE_NAME}.yaml"])
+
+    def test_render_monitors_in_parallel_adds_missing_uuids(self):
+        """
+        Test that the uuids added by the render processes are all stored in the
+        database.
+        """
+        rendered_folder = os.path.join(RENDER_FOLDER, "rendered_monitors")
+        test_collections_path = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+        with tempfile.TemporaryDirectory() as database_folder:
+            database = BufferedDatabaseManager(
+                os.path.join(database_folder, "database.json")
+            )
+            render_monitors(database, rendered_folder, test_collections_path, jobs=4)
+            rendered_files = {
+                rendered_file: os.stat(
+                    os.path.join(rendered_folder, rendered_file)
+                ).st_mtime_ns
+                for rendered_file in os.listdir(rendered_folder)
+            }
+            self.assertEqual(
+                len(BufferedDatabaseManager(database.database_file).index),
+                len(rendered_files),
+            )
+
+            render_monitors(
+                BufferedDatabaseManager(database.database_file),
+                rendered_folder,
+                test_collections_path,
+                read_only=True,
+            )
+            for rendered_file, modification_time in rendered_files.items():
+                self.assertEqual(
+                    os.stat(os.path.join(rendered_folder, rendered_file)).st_mtime_ns,
+                    modification_time,
+                )
+
+    def test_render_monitors_in_parallel_raises_wrong_monitor_error(self):
+        """
+        Test that the format error of a monitor rendered by another process is raised
+        with its message and position, instead of breaking the process pool.
+        """
+        with tempfile.TemporaryDirectory() as workspace_folder:
+            shutil.copytree(
+                os.path.join(RENDER_FOLDER, "collections"),
+                os.path.join(workspace_folder, "collections"),
+            )
+            shutil.copy(
+                os.path.join(RENDER_FOLDER, "test_collections.yaml"), workspace_folder
+            )
+            wrong_monitors_file = os.path.join(
+                workspace_folder, "collections", "collection_2", "wrong_monitors.yaml"
+            )
+            with open(wrong_monitors_file, "w", encoding="utf-8") as wrong_monitors:
+                wrong_monitors.write(
+                    """datasets:
+  - dataset: f260a19c-1665-4351-b237-df9d095a869d
+    monitors:
+      - identifier: wrong monitor
+        schedule: ["not", "a", "schedule"]
+"""
+                )
+            with self.assertRaises(WrongCollectionMonitorFormatError) as error:
+                render_monitors(
+                    BufferedDatabaseManager(
+                        os.path.join(workspace_folder, "database.json")
+                    ),
+                    os.path.join(workspace_folder, "rendered_monitors"),
+                    os.path.join(workspace_folder, "test_collections.yaml"),
+                    jobs=2,
+                )
+        message = str(error.exception)
+        self.assertIn("identifier: wrong monitor", message)
+        self.assertIn("schedule", message)
+        self.assertTrue(message.endswith("wrong_monitors.yaml, line 4, column 9"))
+
     def tearDown(self):
         """
         Database is not removed to allow UUID to persist between tests
@@ -51,3 +232,9 @@ class FunctionalTestRender(unittest.TestCase):
             os.path.join(RENDER_FOLDER, "rendered_monitor_from_child"),
             ignore_errors=True,
         )
+        for rendered_folder in ["rendered_monitors", "rendered_monitor_from_child"]:
+            manifest_file = get_manifest_file(
+                os.path.join(RENDER_FOLDER, rendered_folder)
+            )
+            if os.path.exists(manifest_file):
+                os.remove(manifest_file)
@@ -1,5 +1,6 @@
 # pylint: disable=redefined-outer-name
 
+from collections import OrderedDict
 import os
 from unittest.mock import Mock, patch
 
@@ -9,6 +10,7 @@ from sifflet.collection_objects.errors.classes import (
     WrongCollectionMonitorsFileFormatError,
 )
 from sifflet.tests.settings import TEST_FOLDER
+from sifflet.layered_values import layer_values
 
 TEST_COLLECTION = os.path.join(TEST_FOLDER, "render_monitors/collections/collection_2")
 
@@ -38,19 +40,57 @@ def test_check_monitors_unicity_fail(mock_collection: Collection) -> None:
         mock_collection.check_monitors_unicity()
 
 
+def mock_monitor(key: str) -> Mock:
+    monitor = Mock(name=key)
+    monitor.__str__ = Mock(return_value=key)
+    return monitor
+
+
+def test_index_monitor(mock_collection: Collection) -> None:
+    monitor = mock_monitor("monitor1")
+    mock_collection.index_monitor(monitor)
+    assert mock_collection.monitors_by_key["monitor1"] is monitor
+    with pytest.raises(ValueError, match="must be unique"):
+        mock_collection.index_monitor(mock_monitor("monitor1"))
+    new_monitor = mock_monitor("monitor1")
+    mock_collection.index_monitor(new_monitor, replaced_monitor=monitor)
+    assert mock_collection.monitors_by_key["monitor1"] is new_monitor
+
+
+def test_index_monitor_in_tree(mock_database) -> None:
+    tree_monitors: dict = {}
+    collection = Collection(
+        TEST_COLLECTION, mock_database, load_monitors=False, tree_monitors=tree_monitors
+    )
+    other_collection = Collection(
+        TEST_COLLECTION, mock_database, load_monitors=False, tree_monitors=tree_monitors
+    )
+    monitor = mock_monitor("collection.monitor1")
+    collection.index_monitor(monitor)
+    assert tree_monitors == {"collection.monitor1": monitor}
+    with pytest.raises(ValueError, match="declared in both collections"):
+        other_collection.index_monitor(mock_monitor("collection.monitor1"))
+    assert other_collection.monitors_by_key == {}
+
+    # Reloading the monitors replaces them in the tree
+    collection.monitors = [mock_monitor("collection.monitor2")]  # type: ignore
+    collection.check_monitors_unicity()
+    assert list(tree_monitors) == ["collection.monitor2"]
+
+
 def test_get_default_values_no_parent_no_file(mock_collection: Collection):
-    with patch("os.path.exists", return_value=False):
-        result = mock_collection.get_default_values(None)
+    mock_collection.has_default_values = False
+    result = mock_collection.get_default_values(None)
     assert result == {}
 
 
 def test_get_default_values_with_file(mock_collection: Collection):
-    with patch("os.path.exists", return_value=True):
-        with patch(
-            "sifflet.collection_objects.collection.read_yaml_file",
-            return_value={"key": "value"},
-        ):
-            result = mock_collection.get_default_values(None)
+    mock_collection.has_default_values = True
+    with patch(
+        "sifflet.collection_objects.collection.read_yaml_file",
+        return_value={"key": "value"},
+    ):
+        result = mock_collection.get_default_values(None)
     assert result == {"key": "value"}
 
 
@@ -62,12 +102,12 @@ def test_get_default_values_with_file_and_parent_collection(
         default_values={"key": "parent_value", "key_parent": "value"},
     )
 
-    with patch("os.path.exists", return_value=True):
-        with patch(
-            "sifflet.collection_objects.collection.read_yaml_file",
-            return_value={"key": "child_value", "key_child": "value"},
-        ):
-            result = mock_collection.get_default_values(mock_parent_collection)
+    mock_collection.has_default_values = True
+    with patch(
+        "sifflet.collection_objects.collection.read_yaml_file",
+        return_value={"key": "child_value", "key_child": "value"},
+    ):
+        result = mock_collection.get_default_values(mock_parent_collection)
     assert result == {
         "key": "child_value",
         "key_parent": "value",
@@ -105,3 +145,126 @@ def test_check_files_format_invalid_format():
     ):
         with pytest.raises(WrongCollectionMonitorsFileFormatError):
             Collection.check_files_format(mock_collection, [mock_file])
+
+
+def test_iter_monitors_by_file(mock_database) -> None:
+    collection = Collection(TEST_COLLECTION, mock_database, load_monitors=False)
+    assert collection.monitors == []
+
+    monitors_by_file = list(collection.iter_monitors_by_file())
+    assert len(monitors_by_file) == len(collection.get_monitors_files())
+    assert [str(monitor) for monitors in monitors_by_file for monitor in monitors] == [
+        str(monitor) for monitor in Collection(TEST_COLLECTION, mock_database)
+    ]
+
+
+def test_iter_monitors_by_file_duplicates(mock_database) -> None:
+    collection = Collection(TEST_COLLECTION, mock_database, load_monitors=False)
+    with patch.object(
+        Collection, "get_monitors_files", return_value=["sales.yaml"] * 2
+    ):
+        with pytest.raises(ValueError):
+            list(collection.iter_monitors_by_file())
+
+
+def write_yaml(path, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        yaml_file.write(content)
+
+
+@pytest.fixture
+def layered_collection(tmp_path, mock_database) -> Collection:
+    parent_root = tmp_path / "parent"
+    child_root = parent_root / "child"
+    child_root.mkdir(parents=True)
+    write_yaml(
+        parent_root / "$default.yaml",
+        "kind: Monitor\nversion: 1\nincident:\n  severity: Low\n  message: parent\n",
+    )
+    write_yaml(child_root / "$default.yaml", "incident:\n  severity: Moderate\n")
+    write_yaml(
+        child_root / "monitors.yaml",
+        "default_values:\n"
+        "  description: from file\n"
+        "  incident:\n"
+        "    message: file\n"
+        "datasets:\n"
+        "  - dataset: aa\n"
+        "    monitors:\n"
+        "      - identifier: m1\n"
+        "        name: m1\n"
+        "        parameters:\n"
+        "          kind: Freshness\n"
+        "      - identifier: m2\n"
+        "        name: m2\n"
+        "        incident:\n"
+        "          severity: High\n"
+        "        parameters:\n"
+        "          kind: Completeness\n",
+    )
+    write_yaml(
+        child_root / "other.yaml",
+        "datasets:\n"
+        "  - dataset: bb\n"
+        "    monitors:\n"
+        "      - identifier: m3\n"
+        "        name: m3\n"
+        "        parameters:\n"
+        "          kind: Freshness\n",
+    )
+    parent = Collection(str(parent_root), mock_database, load_monitors=False)
+    return Collection(str(child_root), mock_database, parent_collection=parent)
+
+
+def test_file_default_values_layers(layered_collection: Collection) -> None:
+    monitors = {monitor.values["identifier"]: monitor for monitor in layered_collection}
+    assert monitors["m1"].values["description"] == "from file"
+    assert dict(monitors["m1"].values["incident"]) == {
+        "severity": "Moderate",
+        "message": "file",
+    }
+    assert dict(monitors["m2"].values["incident"]) == {
+        "severity": "High",
+        "message": "file",
+    }
+    assert monitors["m1"].values["kind"] == "Monitor"
+    # Files without default values only use the collection's ones
+    assert "description" not in monitors["m3"].values
+    assert dict(monitors["m3"].values["incident"]) == {
+        "severity": "Moderate",
+        "message": "parent",
+    }
+    assert list(layered_collection.iter_monitors_by_file())[0][0].values == (
+        monitors["m1"].values
+    )
+
+
+def test_file_default_values_memoized(layered_collection: Collection) -> None:
+    file_default_values = {"description": "from file"}
+    with patch(
+        "sifflet.collection_objects.collection.layer_values",
+        wraps=layer_values,
+    ) as merge:
+        first = layered_collection.get_file_default_values(
+            "monitors.yaml", file_default_values
+        )
+        second = layered_collection.get_file_default_values(
+            "monitors.yaml", dict(file_default_values)
+        )
+        assert second is first
+        assert merge.call_count == 1
+
+        changed = layered_collection.get_file_default_values(
+            "monitors.yaml", {"description": "changed"}
+        )
+        assert changed["description"] == "changed"
+        assert merge.call_count == 2
+
+        layered_collection.default_values = OrderedDict(
+            layered_collection.default_values, version=2
+        )
+        replaced = layered_collection.get_file_default_values(
+            "monitors.yaml", {"description": "changed"}
+        )
+        assert replaced["version"] == 2
+        assert merge.call_count == 3
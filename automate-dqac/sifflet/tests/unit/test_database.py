@@ -0,0 +1,452 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from sifflet.renderer.database import (
+    BufferedDatabaseManager,
+    ConflictingUuidsError,
+    DatabaseManager,
+    DeterministicDatabaseManager,
+    LogDatabaseManager,
+    ShardedDatabaseManager,
+    SqliteDatabaseManager,
+)
+
+
+def read_json(path) -> dict:
+    with open(path, encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+@pytest.fixture
+def database_path(tmp_path) -> str:
+    path = os.path.join(tmp_path, "database.json")
+    with open(path, "w", encoding="utf-8") as database:
+        json.dump({"collection.monitor 1": "uuid-1"}, database)
+    return path
+
+
+def test_buffered_database_reads_existing_uuids(database_path: str):
+    database = BufferedDatabaseManager(database_path)
+    assert database.read_uuid("collection.monitor 1") == "uuid-1"
+    assert database.read_uuid("collection.monitor 2") is None
+
+
+def test_buffered_database_writes_only_on_flush(database_path: str):
+    database = BufferedDatabaseManager(database_path)
+    new_uuid = database.add_uuid("collection.monitor 2")
+    database.delete_uuid("collection.monitor 1")
+    assert read_json(database_path) == {"collection.monitor 1": "uuid-1"}
+
+    database.flush()
+    assert read_json(database_path) == {"collection.monitor 2": new_uuid}
+
+
+def test_buffered_database_read_or_add_many_writes_only_on_flush(
+    database_path: str,
+):
+    database = BufferedDatabaseManager(database_path)
+    for index in range(2, 5):
+        database.read_or_add_many([f"collection.monitor {index}"])
+    assert read_json(database_path) == {"collection.monitor 1": "uuid-1"}
+    with patch(
+        "sifflet.renderer.database.json_database.write_json_atomically"
+    ) as write_json:
+        database.flush()
+    write_json.assert_called_once()
+
+
+def test_buffered_database_flush_reads_conflicting_uuids_back(database_path: str):
+    database = BufferedDatabaseManager(database_path)
+    other_database = BufferedDatabaseManager(database_path)
+    new_uuid = database.add_uuid("collection.monitor 2")
+    other_uuids = other_database.read_or_add_many(
+        ["collection.monitor 2", "collection.monitor 3"]
+    )
+    other_database.flush()
+
+    with pytest.raises(ConflictingUuidsError) as error:
+        database.flush()
+    stored_uuid = other_uuids["collection.monitor 2"]
+    assert stored_uuid != new_uuid
+    assert error.value.conflicting_uuids == {"collection.monitor 2": stored_uuid}
+    assert database.read_uuid("collection.monitor 2") == stored_uuid
+    assert read_json(database_path)["collection.monitor 2"] == stored_uuid
+
+
+@pytest.mark.parametrize(
+    "database_class, filename",
+    [(BufferedDatabaseManager, "database.json"), (SqliteDatabaseManager, "db.sqlite")],
+)
+def test_pending_uuids_moved_between_copies(database_class, filename, tmp_path):
+    path = os.path.join(tmp_path, filename)
+    worker_database = database_class(path)
+    uuids = worker_database.read_or_add_many(["collection.monitor 2"])
+    pending_uuids = worker_database.take_pending_uuids()
+    assert pending_uuids == uuids
+    assert worker_database.take_pending_uuids() == {}
+
+    database = database_class(path)
+    database.add_pending_uuids(pending_uuids)
+    database.flush()
+    assert database_class(path).read_uuid("collection.monitor 2") == (
+        uuids["collection.monitor 2"]
+    )
+
+
+def test_buffered_database_add_existing_key(database_path: str):
+    database = BufferedDatabaseManager(database_path)
+    with pytest.raises(ValueError):
+        database.add_uuid("collection.monitor 1")
+
+
+def test_buffered_database_failed_flush_keeps_previous_file(database_path: str):
+    database = BufferedDatabaseManager(database_path)
+    database.add_uuid("collection.monitor 2")
+    with patch("os.fsync", side_effect=OSError):
+        with pytest.raises(OSError):
+            database.flush()
+
+    assert read_json(database_path) == {"collection.monitor 1": "uuid-1"}
+    assert not [
+        filename
+        for filename in os.listdir(os.path.dirname(database_path))
+        if filename.endswith(".tmp")
+    ]
+
+
+@pytest.fixture
+def sqlite_database(tmp_path):
+    database = SqliteDatabaseManager(os.path.join(tmp_path, "database.sqlite"))
+    yield database
+    database.close()
+
+
+def test_sqlite_database_writes_on_flush(sqlite_database: SqliteDatabaseManager):
+    new_uuid = sqlite_database.add_uuid("collection.monitor 1")
+    assert sqlite_database.read_uuid("collection.monitor 1") == new_uuid
+
+    reader = SqliteDatabaseManager(sqlite_database.database_file)
+    assert reader.read_uuid("collection.monitor 1") is None
+    sqlite_database.flush()
+    assert reader.read_uuid("collection.monitor 1") == new_uuid
+    reader.close()
+
+
+def test_sqlite_database_flush_detects_concurrent_writers(
+    sqlite_database: SqliteDatabaseManager,
+):
+    new_uuid = sqlite_database.add_uuid("collection.monitor 1")
+    sqlite_database.add_uuid("collection.monitor 2")
+    writer = SqliteDatabaseManager(sqlite_database.database_file)
+    writer.add_uuid("collection.monitor 1")
+    writer.flush()
+    writer.close()
+
+    with pytest.raises(
+        ValueError, match="1 monitors were added to the database by another process"
+    ):
+        sqlite_database.flush()
+    stored_uuid = sqlite_database.read_uuid("collection.monitor 1")
+    assert stored_uuid is not None and stored_uuid != new_uuid
+    assert sqlite_database.read_uuid("collection.monitor 2") is not None
+    sqlite_database.flush()
+
+
+def test_sqlite_database_uses_wal_mode(sqlite_database: SqliteDatabaseManager):
+    journal_mode = sqlite_database.connection.execute("PRAGMA journal_mode").fetchone()
+    assert journal_mode == ("wal",)
+
+
+def test_sqlite_database_delete(sqlite_database: SqliteDatabaseManager):
+    sqlite_database.add_uuid("collection.monitor 1")
+    sqlite_database.flush()
+    sqlite_database.delete_uuid("collection.monitor 1")
+    assert sqlite_database.read_uuid("collection.monitor 1") is None
+    with pytest.raises(ValueError):
+        sqlite_database.delete_uuid("collection.monitor 1")
+
+
+def test_sqlite_database_import_json_database(
+    sqlite_database: SqliteDatabaseManager, database_path: str
+):
+    sqlite_database.add_uuid("collection.monitor 2")
+    imported = sqlite_database.import_uuids(read_json(database_path))
+    assert imported == 1
+    assert sqlite_database.read_uuid("collection.monitor 1") == "uuid-1"
+    assert sqlite_database.import_uuids(read_json(database_path)) == 0
+
+
+@pytest.mark.parametrize("database_class", [DatabaseManager, BufferedDatabaseManager])
+def test_json_database_read_or_add_many(database_class, database_path: str):
+    database = database_class(database_path)
+    uuids = database.read_or_add_many(["collection.monitor 1", "collection.monitor 2"])
+    assert uuids["collection.monitor 1"] == "uuid-1"
+    database.flush()
+    assert read_json(database_path) == uuids
+
+
+@pytest.mark.parametrize("database_class", [DatabaseManager, BufferedDatabaseManager])
+def test_json_database_read_or_add_many_read_only(database_class, database_path):
+    database = database_class(database_path)
+    assert database.read_or_add_many(["collection.monitor 1"], read_only=True) == {
+        "collection.monitor 1": "uuid-1"
+    }
+    with pytest.raises(ValueError, match="collection.monitor 2"):
+        database.read_or_add_many(
+            ["collection.monitor 1", "collection.monitor 2"], read_only=True
+        )
+    database.flush()
+    assert read_json(database_path) == {"collection.monitor 1": "uuid-1"}
+
+
+def test_sqlite_database_read_or_add_many(sqlite_database: SqliteDatabaseManager):
+    sqlite_database.import_uuids({"collection.monitor 1": "uuid-1"})
+    keys = [f"collection.monitor {index}" for index in range(2000)]
+    with pytest.raises(ValueError, match="1999 monitors are missing"):
+        sqlite_database.read_or_add_many(keys, read_only=True)
+
+    uuids = sqlite_database.read_or_add_many(keys)
+    assert list(uuids) == keys
+    assert uuids["collection.monitor 1"] == "uuid-1"
+    sqlite_database.flush()
+    assert sqlite_database.read_or_add_many(keys, read_only=True) == uuids
+
+
+@pytest.mark.parametrize("database_class", [DatabaseManager, BufferedDatabaseManager])
+def test_json_database_delete_many(database_class, database_path: str):
+    database = database_class(database_path)
+    database.read_or_add_many(["collection.monitor 2", "collection.monitor 3"])
+    with pytest.raises(ValueError):
+        database.delete_many(["collection.monitor 1", "collection.monitor 4"])
+    database.delete_many(["collection.monitor 1", "collection.monitor 3"])
+    database.flush()
+    assert list(read_json(database_path)) == ["collection.monitor 2"]
+
+
+def test_sqlite_database_delete_many(sqlite_database: SqliteDatabaseManager):
+    sqlite_database.read_or_add_many(["collection.monitor 1", "collection.monitor 2"])
+    with pytest.raises(ValueError):
+        sqlite_database.delete_many(["collection.monitor 1", "collection.monitor 3"])
+    assert len(sqlite_database.get_monitor_keys()) == 2
+    sqlite_database.delete_many(["collection.monitor 1"])
+    assert sqlite_database.get_monitor_keys() == ["collection.monitor 2"]
+
+
+@pytest.fixture
+def sharded_database(tmp_path) -> ShardedDatabaseManager:
+    database = ShardedDatabaseManager(os.path.join(tmp_path, "database"))
+    database.register_root_collections(["collection_1", "collection_2"])
+    return database
+
+
+def test_sharded_database_writes_one_file_per_root_collection(
+    sharded_database: ShardedDatabaseManager,
+):
+    uuids = sharded_database.read_or_add_many(
+        ["collection_1.teamA.monitor 1", "collection_2.monitor 1"]
+    )
+    sharded_database.flush()
+    assert read_json(
+        os.path.join(sharded_database.database_folder, "collection_1.json")
+    ) == {"collection_1.teamA.monitor 1": uuids["collection_1.teamA.monitor 1"]}
+    assert read_json(
+        os.path.join(sharded_database.database_folder, "collection_2.json")
+    ) == {"collection_2.monitor 1": uuids["collection_2.monitor 1"]}
+
+
+def test_sharded_database_only_loads_touched_shards(
+    sharded_database: ShardedDatabaseManager,
+):
+    sharded_database.read_or_add_many(["collection_1.monitor 1"])
+    sharded_database.flush()
+
+    database = ShardedDatabaseManager(sharded_database.database_folder)
+    database.register_root_collections(["collection_1", "collection_2"])
+    database.read_or_add_many(["collection_2.monitor 1"])
+    database.flush()
+    assert list(database._shards) == [
+        "collection_2"
+    ]  # pylint: disable=protected-access
+
+
+def test_sharded_database_ignores_unregistered_shards(
+    sharded_database: ShardedDatabaseManager,
+):
+    other_team = ShardedDatabaseManager(sharded_database.database_folder)
+    other_team.register_root_collections(["collection_3"])
+    other_team.read_or_add_many(["collection_3.monitor 1"])
+    other_team.flush()
+    sharded_database.read_or_add_many(["collection_1.monitor 1"])
+    sharded_database.flush()
+
+    assert sharded_database.get_monitor_keys() == ["collection_1.monitor 1"]
+    with pytest.raises(ValueError, match="registered root collections"):
+        sharded_database.delete_many(
+            ["collection_1.monitor 1", "collection_3.monitor 1"]
+        )
+    sharded_database.flush()
+    assert other_team.get_monitor_keys() == ["collection_3.monitor 1"]
+    assert sharded_database.get_monitor_keys() == ["collection_1.monitor 1"]
+
+
+def test_sharded_database_nested_root_collections(
+    sharded_database: ShardedDatabaseManager,
+):
+    sharded_database.register_root_collections(["collection_1.teamA"])
+    assert sharded_database.get_shard_name("collection_1.teamA.monitor") == (
+        "collection_1.teamA"
+    )
+    assert sharded_database.get_shard_name("collection_1.monitor") == "collection_1"
+    with pytest.raises(ValueError):
+        sharded_database.get_shard_name("collection_3.monitor")
+
+
+def test_sharded_database_delete_many(sharded_database: ShardedDatabaseManager):
+    sharded_database.import_uuids(
+        {
+            "collection_1.monitor 1": "uuid-1",
+            "collection_2.monitor 1": "uuid-2",
+            "collection_3.monitor 1": "uuid-3",
+        }
+    )
+    assert sorted(sharded_database.get_monitor_keys()) == [
+        "collection_1.monitor 1",
+        "collection_2.monitor 1",
+    ]
+    sharded_database.delete_many(["collection_1.monitor 1"])
+    assert sharded_database.get_monitor_keys() == ["collection_2.monitor 1"]
+
+
+@pytest.fixture
+def deterministic_database(tmp_path) -> DeterministicDatabaseManager:
+    return DeterministicDatabaseManager(
+        os.path.join(tmp_path, "pinned_uuids.json"),
+        uuid_namespace="74b4c161-024f-4cbd-a8a8-379770c1a9b6",
+    )
+
+
+def test_deterministic_database_derives_uuids(
+    deterministic_database: DeterministicDatabaseManager,
+):
+    uuids = deterministic_database.read_or_add_many(["collection.monitor 1"])
+    assert uuids == {"collection.monitor 1": "118bc136-d6d0-5d1f-ae77-3785ca24a043"}
+    assert deterministic_database.read_uuid("collection.monitor 1") == (
+        uuids["collection.monitor 1"]
+    )
+    deterministic_database.flush()
+    assert deterministic_database.get_monitor_keys() == []
+
+
+def test_deterministic_database_monitors_already_exist(
+    deterministic_database: DeterministicDatabaseManager,
+):
+    with pytest.raises(ValueError, match="Monitor collection.monitor 1 already exists"):
+        deterministic_database.add_uuid("collection.monitor 1")
+    deterministic_database.import_uuids({"collection.monitor 2": "uuid-2"})
+    with pytest.raises(ValueError, match="Monitor collection.monitor 2 already exists"):
+        deterministic_database.add_uuid("collection.monitor 2")
+
+
+def test_deterministic_database_pins_imported_uuids(
+    deterministic_database: DeterministicDatabaseManager, database_path: str
+):
+    derived_uuid = deterministic_database.derive_uuid("collection.monitor 2")
+    pinned = deterministic_database.import_uuids(
+        {"collection.monitor 1": "uuid-1", "collection.monitor 2": derived_uuid}
+    )
+    assert pinned == 1
+    assert deterministic_database.read_or_add_many(
+        ["collection.monitor 1", "collection.monitor 2"], read_only=True
+    ) == {"collection.monitor 1": "uuid-1", "collection.monitor 2": derived_uuid}
+
+    deterministic_database.delete_many(["collection.monitor 1"])
+    assert deterministic_database.read_uuid("collection.monitor 1") == (
+        deterministic_database.derive_uuid("collection.monitor 1")
+    )
+
+
+@pytest.fixture
+def log_path(tmp_path) -> str:
+    return os.path.join(tmp_path, "database.log")
+
+
+def test_log_database_replays_records(log_path: str):
+    database = LogDatabaseManager(log_path)
+    database.import_uuids({"collection.monitor 1": "uuid-1"})
+    new_uuid = database.add_uuid("collection.monitor 2")
+
+    reopened_database = LogDatabaseManager(log_path)
+    assert reopened_database.read_uuid("collection.monitor 1") == "uuid-1"
+    assert reopened_database.read_uuid("collection.monitor 2") == new_uuid
+
+
+def test_log_database_shares_key_prefixes(log_path: str):
+    database = LogDatabaseManager(log_path)
+    database.import_uuids({"collection.monitor 1": "uuid-1"})
+    database.import_uuids({"collection.monitor 2": "uuid-2"})
+
+    with open(log_path, encoding="utf-8") as log:
+        assert log.read() == (
+            "+\t0\tcollection.monitor 1\tuuid-1\n" "+\t19\t2\tuuid-2\n"
+        )
+
+
+def test_log_database_delete_many(log_path: str):
+    database = LogDatabaseManager(log_path, compaction_ratio=1)
+    database.read_or_add_many(["collection.monitor 1", "collection.monitor 2"])
+    database.delete_many(["collection.monitor 1"])
+    with pytest.raises(ValueError):
+        database.delete_many(["collection.monitor 2", "collection.monitor 3"])
+
+    reopened_database = LogDatabaseManager(log_path)
+    assert reopened_database.get_monitor_keys() == ["collection.monitor 2"]
+
+
+def test_log_database_compacts_deleted_records(log_path: str):
+    database = LogDatabaseManager(log_path, compaction_ratio=0.7)
+    database.import_uuids({"collection.monitor 2": "uuid-2"})
+    database.import_uuids({"collection.monitor 1": "uuid-1"})
+    database.delete_uuid("collection.monitor 2")
+    with open(log_path, encoding="utf-8") as log:
+        assert len(log.readlines()) == 3
+
+    database.import_uuids({"collection.monitor 3": "uuid-3"})
+    database.delete_uuid("collection.monitor 3")
+    with open(log_path, encoding="utf-8") as log:
+        assert log.read() == "+\t0\tcollection.monitor 1\tuuid-1\n"
+    assert LogDatabaseManager(log_path).get_monitor_keys() == ["collection.monitor 1"]
+
+
+def test_log_database_catches_up_with_other_writers(log_path: str):
+    database = LogDatabaseManager(log_path, compaction_ratio=0)
+    other_database = LogDatabaseManager(log_path, compaction_ratio=0)
+    database.import_uuids({"collection.monitor 1": "uuid-1"})
+    other_database.import_uuids({"collection.monitor 2": "uuid-2"})
+    # Compacts the log, which must be fully replayed by the other database
+    database.delete_uuid("collection.monitor 1")
+
+    uuids = other_database.read_or_add_many(["collection.monitor 3"])
+    assert other_database.get_monitor_keys() == [
+        "collection.monitor 2",
+        "collection.monitor 3",
+    ]
+    database.replay()
+    assert database.read_uuid("collection.monitor 3") == uuids["collection.monitor 3"]
+
+
+def test_log_database_truncates_partial_record_before_appending(log_path: str):
+    LogDatabaseManager(log_path).import_uuids({"collection.monitor 1": "uuid-1"})
+    # A process crashed while appending a record
+    with open(log_path, "a", encoding="utf-8") as log:
+        log.write("+\t11\tmonitor 2\tuu")
+
+    database = LogDatabaseManager(log_path)
+    database.import_uuids({"collection.monitor 3": "uuid-3"})
+    with open(log_path, encoding="utf-8") as log:
+        assert log.read() == ("+\t0\tcollection.monitor 1\tuuid-1\n+\t19\t3\tuuid-3\n")
+    assert LogDatabaseManager(log_path).index == {
+        "collection.monitor 1": "uuid-1",
+        "collection.monitor 3": "uuid-3",
+    }
@@ -0,0 +1,86 @@
+import os
+from unittest.mock import Mock, patch
+
+from sifflet.collection_objects.collection import Collection
+from sifflet.collection_objects.discovery import (
+    IgnoreRules,
+    get_workspace_ignore_rules,
+    scan_collection,
+)
+
+
+def make_collection_folder(root, files=(), folders=(), ignore=None):
+    os.makedirs(root, exist_ok=True)
+    for folder in folders:
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+    for file in files:
+        with open(os.path.join(root, file), "w", encoding="utf-8") as f:
+            f.write("datasets: []\n")
+    if ignore is not None:
+        with open(os.path.join(root, ".dqacignore"), "w", encoding="utf-8") as f:
+            f.write(ignore)
+
+
+def test_scan_collection(tmp_path):
+    root = str(tmp_path / "collection")
+    make_collection_folder(
+        root,
+        files=["b.yaml", "a.yml", "$default.yaml", "README.md", ".hidden.yaml"],
+        folders=["teamB", "teamA", ".git", "other.yaml"],
+    )
+    entries = scan_collection(root)
+    assert entries.child_collections_roots == [
+        os.path.join(root, "other.yaml"),
+        os.path.join(root, "teamA"),
+        os.path.join(root, "teamB"),
+    ]
+    assert entries.monitors_files == ["a.yml", "b.yaml"]
+    assert entries.has_default_values
+    assert entries.ignore_rules == IgnoreRules()
+
+
+def test_scan_collection_ignore_file(tmp_path):
+    root = str(tmp_path / "collection")
+    make_collection_folder(
+        root,
+        files=["monitors.yaml", "generated.yaml", "build.yaml"],
+        folders=["build", "teamA", "teamA_old"],
+        ignore="# comment\n\ngenerated.yaml\nbuild*/\n*_old\n",
+    )
+    entries = scan_collection(root)
+    assert entries.child_collections_roots == [os.path.join(root, "teamA")]
+    assert entries.monitors_files == ["build.yaml", "monitors.yaml"]
+
+
+def test_ignore_rules_apply_to_subfolders(tmp_path):
+    root = str(tmp_path / "collection")
+    make_collection_folder(root, folders=["teamA"], ignore="*.draft.yaml\nteamA/old/\n")
+    make_collection_folder(
+        os.path.join(root, "teamA"),
+        files=["monitors.yaml", "monitors.draft.yaml"],
+        folders=["old", "new"],
+    )
+    rules = scan_collection(root).ignore_rules
+    entries = scan_collection(os.path.join(root, "teamA"), rules)
+    assert entries.child_collections_roots == [os.path.join(root, "teamA", "new")]
+    assert entries.monitors_files == ["monitors.yaml"]
+
+
+def test_workspace_ignore_rules(tmp_path):
+    assert get_workspace_ignore_rules(str(tmp_path / "collections.yaml")) == (
+        IgnoreRules()
+    )
+    make_collection_folder(str(tmp_path), ignore="drafts/\n")
+    rules = get_workspace_ignore_rules(str(tmp_path / "collections.yaml"))
+    assert rules.is_ignored(str(tmp_path / "collection" / "drafts"), True)
+    assert not rules.is_ignored(str(tmp_path / "collection" / "drafts"), False)
+
+
+def test_collection_lists_its_folder_once(tmp_path):
+    root = str(tmp_path / "collection")
+    make_collection_folder(root, files=["monitors.yaml"], folders=["teamA"])
+    with patch("os.scandir", wraps=os.scandir) as scandir:
+        collection = Collection(root, Mock())
+        assert collection.get_monitors_files() == ["monitors.yaml"]
+        assert collection.child_collections_roots == [os.path.join(root, "teamA")]
+    scandir.assert_called_once_with(root)
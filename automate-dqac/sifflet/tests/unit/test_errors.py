@@ -1,6 +1,9 @@
 from copy import deepcopy
 import unittest
-from sifflet.collection_objects.types import CollectionMonitorDict
+from sifflet.collection_objects.types import (
+    CollectionMonitorDict,
+    CollectionMonitorsFileDict,
+)
 from sifflet.collection_objects.errors import check_structure_and_type
 
 GOOD_MONITOR: CollectionMonitorDict = {
@@ -121,6 +124,21 @@ class TestTypedDictValidation(unittest.TestCase):
             ],
         )
 
+    def test_file_default_values(self):
+        data = {
+            "default_values": {"incident": {"severity": "Low"}},
+            "datasets": [],
+        }
+        errors = check_structure_and_type(data, CollectionMonitorsFileDict)
+        self.assertEqual(errors, [])
+
+        data["default_values"] = "Low"
+        errors = check_structure_and_type(data, CollectionMonitorsFileDict)
+        self.assertEqual(
+            errors,
+            ["Expected <class 'dict'> at default_values, but got <class 'str'>"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import unittest
+
+from sifflet.layered_values import LayeredValues, layer_values, materialize
+from sifflet.utils import merge_yaml_files, ordered_dump, ordered_load
+
+PARENT_DEFAULT_VALUES = ordered_load(
+    """
+kind: Monitor
+version: 1
+incident:
+  severity: Low
+  message: parent
+tags:
+  - name: tag1
+    kind: Tag
+notifications: null
+parameters:
+  kind: Freshness
+"""
+)
+DEFAULT_VALUES = ordered_load(
+    """
+incident:
+  severity: Moderate
+notifications:
+  kind: Email
+  name: team
+schedule: "@daily"
+"""
+)
+MONITOR = ordered_load(
+    """
+identifier: monitor
+name: monitor
+incident: null
+parameters:
+  kind: Completeness
+  timeWindow:
+    field: date
+notifications:
+  name: other
+"""
+)
+
+
+class TestLayeredValues(unittest.TestCase):
+    def test_same_values_as_merge(self):
+        merged = merge_yaml_files(
+            merge_yaml_files(PARENT_DEFAULT_VALUES, DEFAULT_VALUES), MONITOR
+        )
+        layered = layer_values(
+            layer_values(PARENT_DEFAULT_VALUES, DEFAULT_VALUES), MONITOR
+        )
+        self.assertEqual(list(layered), list(merged))
+        self.assertEqual(materialize(layered), merged)
+        self.assertEqual(ordered_dump(layered), ordered_dump(merged))
+
+    def test_layers_are_shared(self):
+        layered = layer_values(
+            layer_values(PARENT_DEFAULT_VALUES, DEFAULT_VALUES), MONITOR
+        )
+        self.assertEqual(
+            layered.layers, (PARENT_DEFAULT_VALUES, DEFAULT_VALUES, MONITOR)
+        )
+        self.assertIs(layered["tags"], PARENT_DEFAULT_VALUES["tags"])
+        self.assertIs(
+            layered["parameters"]["timeWindow"], MONITOR["parameters"]["timeWindow"]
+        )
+        self.assertIsInstance(layered["notifications"], LayeredValues)
+
+    def test_mapping_interface(self):
+        layered = layer_values(DEFAULT_VALUES, MONITOR)
+        self.assertIn("schedule", layered)
+        self.assertNotIn("unknown", layered)
+        self.assertEqual(len(layered), 6)
+        self.assertIsNone(layered["incident"])
+        with self.assertRaises(KeyError):
+            layered["unknown"]  # pylint: disable=pointless-statement
+
+    def test_materialize_copies(self):
+        values = OrderedDict(identifier="monitor")
+        materialized = materialize(values)
+        materialized["identifier"] = "other"
+        self.assertEqual(values["identifier"], "monitor")
+
+
+if __name__ == "__main__":
+    unittest.main()
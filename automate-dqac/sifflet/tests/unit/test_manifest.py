@@ -0,0 +1,116 @@
+import os
+
+from sifflet.renderer.manifest import RenderManifest, get_manifest_file
+from sifflet.renderer.output import (
+    COLLECTION_BUNDLE_OUTPUT,
+    RENDER_BUNDLE_OUTPUT,
+    RenderOutput,
+)
+
+
+def read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def test_manifest_file_is_next_to_rendered_folder(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered/")
+    assert get_manifest_file(rendered_folder) == os.path.join(
+        tmp_path, "rendered.manifest.json"
+    )
+
+
+def test_manifest_first_render_empties_folder(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered")
+    os.makedirs(rendered_folder)
+    stale_file = os.path.join(rendered_folder, "stale.yaml")
+    with open(stale_file, "w", encoding="utf-8") as file:
+        file.write("stale")
+
+    manifest = RenderManifest(rendered_folder)
+    manifest.write_monitor("collection.monitor 1", "name: monitor 1\n")
+    manifest.save()
+
+    assert os.listdir(rendered_folder) == ["collection.monitor 1.yaml"]
+    assert manifest.summary == {"added": 1, "changed": 0, "removed": 0, "unchanged": 0}
+
+
+def test_manifest_only_writes_changed_files(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered")
+    manifest = RenderManifest(rendered_folder)
+    manifest.write_monitor("collection.monitor 1", "name: monitor 1\n")
+    manifest.write_monitor("collection.monitor 2", "name: monitor 2\n")
+    manifest.write_monitor("collection.monitor 3", "name: monitor 3\n")
+    manifest.save()
+    unchanged_file = os.path.join(rendered_folder, "collection.monitor 1.yaml")
+    os.utime(unchanged_file, ns=(0, 0))
+
+    manifest = RenderManifest(rendered_folder)
+    manifest.write_monitor("collection.monitor 1", "name: monitor 1\n")
+    manifest.write_monitor("collection.monitor 2", "name: monitor two\n")
+    manifest.write_monitor("collection.monitor 4", "name: monitor 4\n")
+    manifest.save()
+
+    assert manifest.summary == {"added": 1, "changed": 1, "removed": 1, "unchanged": 1}
+    assert os.stat(unchanged_file).st_mtime_ns == 0
+    assert sorted(os.listdir(rendered_folder)) == [
+        "collection.monitor 1.yaml",
+        "collection.monitor 2.yaml",
+        "collection.monitor 4.yaml",
+    ]
+    assert read_file(os.path.join(rendered_folder, "collection.monitor 2.yaml")) == (
+        "name: monitor two\n"
+    )
+
+
+def test_manifest_rewrites_deleted_files(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered")
+    manifest = RenderManifest(rendered_folder)
+    manifest.write_monitor("collection.monitor 1", "name: monitor 1\n")
+    manifest.save()
+    os.remove(os.path.join(rendered_folder, "collection.monitor 1.yaml"))
+
+    manifest = RenderManifest(rendered_folder)
+    manifest.write_monitor("collection.monitor 1", "name: monitor 1\n")
+    manifest.save()
+
+    assert manifest.summary["changed"] == 1
+    assert os.listdir(rendered_folder) == ["collection.monitor 1.yaml"]
+
+
+def test_bundle_only_written_when_changed(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered")
+    for content in ["name: monitor 1\n", "name: monitor 1\n", "name: monitor one\n"]:
+        manifest = RenderManifest(rendered_folder)
+        output = RenderOutput(manifest, COLLECTION_BUNDLE_OUTPUT)
+        output.start_collection("collection")
+        output.write_monitor("collection.monitor 1", content)
+        output.write_monitor("collection.monitor 2", "name: monitor 2\n")
+        output.close()
+        manifest.save()
+        if content == "name: monitor 1\n":
+            os.utime(os.path.join(rendered_folder, "collection.yaml"), ns=(0, 0))
+
+    assert manifest.summary == {"added": 0, "changed": 1, "removed": 0, "unchanged": 0}
+    assert os.listdir(rendered_folder) == ["collection.yaml"]
+    assert read_file(os.path.join(rendered_folder, "collection.yaml")) == (
+        "---\nname: monitor one\n---\nname: monitor 2\n"
+    )
+
+
+def test_unchanged_bundle_keeps_modification_time(tmp_path):
+    rendered_folder = os.path.join(tmp_path, "rendered")
+    bundle_file = os.path.join(rendered_folder, "monitors.yaml")
+    for _ in range(2):
+        manifest = RenderManifest(rendered_folder)
+        output = RenderOutput(manifest, RENDER_BUNDLE_OUTPUT)
+        output.start_collection("collection")
+        output.write_monitor("collection.monitor 1", "name: monitor 1\n")
+        output.close()
+        manifest.save()
+        if manifest.summary["added"]:
+            os.utime(bundle_file, ns=(0, 0))
+
+    assert manifest.summary["unchanged"] == 1
+    assert os.stat(bundle_file).st_mtime_ns == 0
+    assert os.listdir(rendered_folder) == ["monitors.yaml"]
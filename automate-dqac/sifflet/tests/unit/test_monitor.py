@@ -5,6 +5,7 @@ import uuid
 from sifflet.collection_objects import Monitor, Collection
 from sifflet.collection_objects.errors.classes import WrongCollectionMonitorFormatError
 from sifflet.collection_objects.settings import COLLECTION_MONITOR_IDENTIFIER_KEY
+from sifflet.tests.benchmarks import monitor_memory
 
 
 class MockCollection:
@@ -128,3 +129,27 @@ class UnitTestMonitor(unittest.TestCase):
         result = monitor.clear_fields_for_api()
         self.assertNotIn("setting_name", result)
         self.assertEqual(result["datasets"], [{"id": str(self.dataset)}])
+
+    def test_compact_record(self):
+        monitor = Monitor(self.valid_monitor_config, self.collection, self.dataset)
+        other_monitor = Monitor(
+            self.valid_monitor_config,
+            self.collection,
+            self.dataset[:8] + self.dataset[8:],
+        )
+        self.assertFalse(hasattr(monitor, "__dict__"))
+        self.assertIs(monitor.dataset, other_monitor.dataset)
+        self.assertEqual(monitor.identifier, "sample_monitor_identifier")
+        self.assertIs(str(monitor), str(monitor))
+
+    def test_compact_record_uses_less_memory(self):
+        """
+        Runs the memory benchmark on a few monitors, so that changes to the objects
+        built for each monitor do not silently cancel the gain of the compact record.
+        """
+        values = monitor_memory.build_values(2_000)
+        collections = monitor_memory.build_collections(2)
+        before = monitor_memory.measure(monitor_memory.DictMonitor, values, collections)
+        after = monitor_memory.measure(Monitor, values, collections)
+        self.assertLess(after[0], before[0])
+        self.assertLess(after[1], before[1])
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+import gc
+import os
+
+import pytest
+import yaml
+from sifflet.collection_objects.errors import check_data_structure
+from sifflet.collection_objects.errors.classes import WrongCollectionMonitorFormatError
+from sifflet.collection_objects.types import CollectionMonitorDict
+from sifflet.layered_values import layer_values
+from sifflet.source_marks import (
+    SOURCE_MARKS,
+    SourceMark,
+    collect_source_marks,
+    get_source_mark,
+)
+from sifflet.utils import ordered_load
+from sifflet.yaml_cache import YamlCache
+
+MONITORS_FILE = """datasets:
+  - dataset: dataset 1
+    monitors:
+      - identifier: monitor 10
+        name: first monitor
+      -   identifier: monitor 1
+          schedule: ["not", "a", "schedule"]
+"""
+
+
+@pytest.mark.parametrize("loader", [None, yaml.SafeLoader])
+def test_loader_records_source_marks(loader):
+    content = ordered_load(MONITORS_FILE, loader)
+    monitors = content["datasets"][0]["monitors"]
+    assert get_source_mark(content) == SourceMark(1, 1)
+    assert get_source_mark(content["datasets"][0]) == SourceMark(2, 5)
+    assert get_source_mark(monitors[0]) == SourceMark(4, 9)
+    assert get_source_mark(monitors[1]) == SourceMark(6, 11)
+    # Views of merged values have the position of the monitor's values
+    assert get_source_mark(layer_values(OrderedDict(), monitors[1])) == (
+        SourceMark(6, 11)
+    )
+    assert get_source_mark(OrderedDict(monitors[1])) is None
+
+
+def test_source_marks_dropped_with_mappings():
+    content = ordered_load(MONITORS_FILE)
+    marked_ids = [id(value) for value, _ in collect_source_marks(content)]
+    assert len(marked_ids) == 4
+    del content
+    gc.collect()
+    assert not any(key in SOURCE_MARKS for key in marked_ids)
+
+
+def test_source_marks_kept_on_yaml_cache_hits(tmp_path):
+    path = os.path.join(tmp_path, "monitors.yaml")
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        yaml_file.write(MONITORS_FILE)
+    cache = YamlCache(os.path.join(tmp_path, "yaml_cache"))
+    cache.load(path, ordered_load)
+    cached_content = cache.load(path, ordered_load)
+    monitor = cached_content["datasets"][0]["monitors"][1]
+    assert get_source_mark(monitor) == SourceMark(6, 11)
+
+
+def test_error_points_to_the_monitor():
+    content = ordered_load(MONITORS_FILE)
+    # The identifier of the first monitor starts with the one of the wrong monitor
+    wrong_monitor = content["datasets"][0]["monitors"][1]
+    with pytest.raises(WrongCollectionMonitorFormatError) as error:
+        check_data_structure(
+            layer_values(OrderedDict(), wrong_monitor),
+            CollectionMonitorDict,
+            filepath="monitors.yaml",
+        )
+    assert str(error.value).endswith("monitors.yaml, line 6, column 11")
@@ -0,0 +1,131 @@
+# pylint: disable=redefined-outer-name
+
+import os
+from unittest.mock import Mock
+
+import pytest
+from sifflet.renderer.structure_manager import StructureManager
+from sifflet.tests.settings import RENDER_FOLDER
+
+COLLECTIONS_PREFIX = "sifflet.tests.data.render_monitors.collections"
+
+
+@pytest.fixture
+def mock_database():
+    return Mock()
+
+
+def test_lazy_structure_manager_only_builds_declared_collections(mock_database):
+    collections_manager = StructureManager(
+        os.path.join(RENDER_FOLDER, "test_collections_from_child.yaml"),
+        mock_database,
+        lazy=True,
+    )
+    assert collections_manager.collections == []
+    mock_database.register_root_collections.assert_called_once_with(
+        [f"{COLLECTIONS_PREFIX}.collection_1"]
+    )
+
+    assert [str(c) for c in collections_manager.collections_to_render] == [
+        f"{COLLECTIONS_PREFIX}.collection_1.teamA"
+    ]
+    # The parent collection is only built for its default values
+    assert [str(c) for c in collections_manager.collections] == [
+        f"{COLLECTIONS_PREFIX}.collection_1",
+        f"{COLLECTIONS_PREFIX}.collection_1.teamA",
+    ]
+    assert collections_manager.loaded_collections == {
+        f"{COLLECTIONS_PREFIX}.collection_1.teamA"
+    }
+
+
+def test_lazy_structure_manager_renders_same_collections(mock_database):
+    collections_file = os.path.join(RENDER_FOLDER, "test_collections.yaml")
+    lazy_manager = StructureManager(collections_file, mock_database, lazy=True)
+    manager = StructureManager(collections_file, mock_database)
+
+    def get_monitors(collections):
+        return {
+            str(monitor): monitor.clear_fields_for_api("uuid")
+            for collection in collections
+            for monitor in collection
+        }
+
+    assert get_monitors(lazy_manager.collections_to_render) == get_monitors(
+        manager.collections_to_render
+    )
+
+
+def test_lazy_structure_manager_get_collection(mock_database):
+    collections_manager = StructureManager(
+        os.path.join(RENDER_FOLDER, "test_collections.yaml"),
+        mock_database,
+        lazy=True,
+    )
+    collection = collections_manager.get_collection(
+        f"{COLLECTIONS_PREFIX}.collection_1.teamB"
+    )
+    assert len(collection) == 4
+    assert [str(c) for c in collections_manager.collections] == [
+        COLLECTIONS_PREFIX,
+        f"{COLLECTIONS_PREFIX}.collection_1",
+        f"{COLLECTIONS_PREFIX}.collection_1.teamB",
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        collections_manager.get_collection(f"{COLLECTIONS_PREFIX}.collection_3")
+    with pytest.raises(FileNotFoundError):
+        collections_manager.get_collection("unknown.collection")
+
+
+def test_structure_manager_builds_each_collection_once(mock_database):
+    collections_manager = StructureManager(
+        os.path.join(RENDER_FOLDER, "test_collections.yaml"), mock_database
+    )
+    names = [str(c) for c in collections_manager.collections_to_render]
+    assert len(names) == len(set(names)) == 5
+    assert sum(len(c) for c in collections_manager.collections_to_render) == 20
+
+
+def test_collection_tree_links(mock_database):
+    collections_manager = StructureManager(
+        os.path.join(RENDER_FOLDER, "test_collections.yaml"), mock_database
+    )
+    tree = collections_manager.tree
+    parent = tree.get(f"{COLLECTIONS_PREFIX}.collection_1")
+    child = tree.get(f"{COLLECTIONS_PREFIX}.collection_1.teamA")
+    assert child.parent_collection is parent
+    assert parent.child_collections["teamA"] is child
+    assert child.name_parts[-2:] == ("collection_1", "teamA")
+    assert [str(c) for c in tree.get_subtree(f"{COLLECTIONS_PREFIX}.collection_1")] == [
+        f"{COLLECTIONS_PREFIX}.collection_1",
+        f"{COLLECTIONS_PREFIX}.collection_1.teamA",
+        f"{COLLECTIONS_PREFIX}.collection_1.teamB",
+    ]
+    assert [str(c) for c in tree.get_ancestors(str(child))] == [
+        f"{COLLECTIONS_PREFIX}.collection_1",
+        COLLECTIONS_PREFIX,
+    ]
+    assert list(tree.root_collections) == [COLLECTIONS_PREFIX]
+    assert tree.get_subtree("unknown.collection") == []
+
+
+def test_structure_manager_indexes_monitors(mock_database):
+    collections_manager = StructureManager(
+        os.path.join(RENDER_FOLDER, "test_collections.yaml"),
+        mock_database,
+        index_monitors=True,
+    )
+    tree_monitors = collections_manager.tree.monitors
+    assert len(tree_monitors) == 20
+    for collection in collections_manager:
+        assert collection.tree_monitors is tree_monitors
+        for monitor in collection:
+            assert tree_monitors[str(monitor)] is monitor
+            assert collection.monitors_by_key[str(monitor)] is monitor
+    assert (
+        StructureManager(
+            os.path.join(RENDER_FOLDER, "test_collections.yaml"), mock_database
+        ).tree.monitors
+        is None
+    )
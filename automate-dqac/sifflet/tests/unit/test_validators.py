@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from copy import deepcopy
+import unittest
+
+from sifflet.collection_objects.errors import check_structure_and_type, get_validator
+from sifflet.collection_objects.types import (
+    CollectionMonitorDict,
+    CollectionMonitorsFileDict,
+    CollectionsToRenderFileDict,
+)
+from sifflet.layered_values import layer_values
+from sifflet.tests.unit.test_errors import GOOD_MONITOR
+
+WRONG_VALUES = [None, 1, 1.5, True, "value", [], ["value", 1], {}, {"key": "value"}]
+
+
+def iter_paths(data, path=()):
+    """
+    Yields the path of every value nested in the data.
+    """
+    yield path
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from iter_paths(value, path + (key,))
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            yield from iter_paths(value, path + (index,))
+
+
+def replace(data, path, value):
+    data = deepcopy(data)
+    parent = data
+    for key in path[:-1]:
+        parent = parent[key]
+    parent[path[-1]] = value
+    return data
+
+
+class TestCompiledValidators(unittest.TestCase):
+    def assert_same_errors(self, data, expected_type):
+        def check(validate):
+            try:
+                return validate(data, expected_type)
+            except Exception as error:  # pylint: disable=broad-except
+                return repr(error)
+
+        self.assertEqual(
+            check(lambda data, expected_type: get_validator(expected_type)(data, "")),
+            check(check_structure_and_type),
+        )
+
+    def test_same_errors_as_check_structure_and_type(self):
+        for path in iter_paths(GOOD_MONITOR):
+            if not path:
+                continue
+            for wrong_value in WRONG_VALUES:
+                with self.subTest(path=path, value=wrong_value):
+                    self.assert_same_errors(
+                        replace(GOOD_MONITOR, path, wrong_value), CollectionMonitorDict
+                    )
+
+    def test_same_errors_for_missing_and_extra_keys(self):
+        for path in iter_paths(GOOD_MONITOR):
+            if not path or isinstance(path[-1], int):
+                continue
+            data = deepcopy(GOOD_MONITOR)
+            parent = data
+            for key in path[:-1]:
+                parent = parent[key]
+            del parent[path[-1]]
+            parent["extra"] = "value"
+            with self.subTest(path=path):
+                self.assert_same_errors(data, CollectionMonitorDict)
+
+    def test_same_errors_for_merged_values(self):
+        monitor = deepcopy(GOOD_MONITOR)
+        default_values = OrderedDict(
+            incident=monitor.pop("incident"), version="1", extra={"key": "value"}
+        )
+        self.assert_same_errors(
+            layer_values(default_values, monitor), CollectionMonitorDict
+        )
+
+    def test_same_errors_for_files(self):
+        for data in [
+            {"datasets": [{"dataset": "uuid", "monitors": []}]},
+            {"datasets": [{"dataset": 1}], "default_values": "value"},
+            {"datasets": "value", "other": 1},
+            [],
+        ]:
+            with self.subTest(data=data):
+                self.assert_same_errors(data, CollectionMonitorsFileDict)
+        for data in [{"collections": ["a", 1]}, {"collections": "a"}, {}]:
+            with self.subTest(data=data):
+                self.assert_same_errors(data, CollectionsToRenderFileDict)
+
+    def test_validators_compiled_once(self):
+        self.assertIs(
+            get_validator(CollectionMonitorDict), get_validator(CollectionMonitorDict)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+import yaml
+from sifflet.tests.settings import RENDER_FOLDER
+from sifflet.yaml_backend import (
+    LIBYAML_AVAILABLE,
+    OrderedDumper,
+    OrderedLoader,
+    PureOrderedDumper,
+    PureOrderedLoader,
+)
+
+CORRECT_RENDERED_FOLDER = os.path.join(RENDER_FOLDER, "correct_rendered")
+CORRECT_RENDERED_FILES = sorted(os.listdir(CORRECT_RENDERED_FOLDER))
+
+
+def read_correct_rendered_file(rendered_file: str) -> str:
+    with open(
+        os.path.join(CORRECT_RENDERED_FOLDER, rendered_file), encoding="utf-8"
+    ) as correct_rendered:
+        return correct_rendered.read()
+
+
+def test_libyaml_is_used_when_available():
+    if LIBYAML_AVAILABLE:
+        assert issubclass(OrderedLoader, yaml.CSafeLoader)
+        assert issubclass(OrderedDumper, yaml.CSafeDumper)
+    else:
+        assert issubclass(OrderedLoader, yaml.SafeLoader)
+        assert issubclass(OrderedDumper, yaml.SafeDumper)
+
+
+@pytest.mark.parametrize("rendered_file", CORRECT_RENDERED_FILES)
+@pytest.mark.parametrize("loader", [OrderedLoader, PureOrderedLoader])
+@pytest.mark.parametrize("dumper", [OrderedDumper, PureOrderedDumper])
+def test_round_trip_is_byte_identical(rendered_file: str, loader, dumper):
+    content = read_correct_rendered_file(rendered_file)
+    assert yaml.dump(yaml.load(content, loader), None, dumper) == content
+
+
+@pytest.mark.parametrize("rendered_file", CORRECT_RENDERED_FILES)
+def test_loaders_read_same_data(rendered_file: str):
+    content = read_correct_rendered_file(rendered_file)
+    assert yaml.load(content, OrderedLoader) == yaml.load(content, PureOrderedLoader)
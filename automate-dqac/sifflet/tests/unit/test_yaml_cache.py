@@ -0,0 +1,137 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+from sifflet.utils import ordered_load, read_yaml_file
+from sifflet.yaml_cache import (
+    RACY_MODIFICATION_WINDOW_NS,
+    YamlCache,
+    get_active_yaml_cache,
+    use_yaml_cache,
+)
+
+
+@pytest.fixture
+def yaml_path(tmp_path) -> str:
+    path = os.path.join(tmp_path, "monitors.yaml")
+    write_yaml(path, "datasets:\n- dataset: dataset 1\n")
+    return path
+
+
+def write_yaml(path: str, content: str, mtime_ns: int = 10**18) -> None:
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        yaml_file.write(content)
+    # A modification time far from the caching time, so that it is trusted
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def cache_folder(tmp_path) -> str:
+    return os.path.join(tmp_path, "artefacts", "yaml_cache")
+
+
+def test_yaml_cache_persists_parsed_files(yaml_path: str, cache_folder: str):
+    cache = YamlCache(cache_folder)
+    content = cache.load(yaml_path, ordered_load)
+    cache.save()
+
+    parse = Mock(side_effect=ordered_load)
+    cached_content = YamlCache(cache_folder).load(yaml_path, parse)
+    assert cached_content == content
+    parse.assert_not_called()
+
+
+def test_yaml_cache_returns_copies(yaml_path: str, cache_folder: str):
+    cache = YamlCache(cache_folder)
+    cache.load(yaml_path, ordered_load)["datasets"].append("modified")
+    assert cache.load(yaml_path, ordered_load)["datasets"] == [{"dataset": "dataset 1"}]
+
+
+def test_yaml_cache_checks_content_hash_of_touched_files(
+    yaml_path: str, cache_folder: str
+):
+    cache = YamlCache(cache_folder)
+    cache.load(yaml_path, ordered_load)
+    write_yaml(yaml_path, "datasets:\n- dataset: dataset 1\n", mtime_ns=2 * 10**18)
+
+    parse = Mock(side_effect=ordered_load)
+    assert cache.load(yaml_path, parse) == {"datasets": [{"dataset": "dataset 1"}]}
+    parse.assert_not_called()
+
+
+def test_yaml_cache_parses_modified_files(yaml_path: str, cache_folder: str):
+    cache = YamlCache(cache_folder)
+    cache.load(yaml_path, ordered_load)
+    # Same size and modification time, only the content hash changes
+    write_yaml(yaml_path, "datasets:\n- dataset: dataset 2\n")
+    cache.entries[os.path.abspath(yaml_path)] = cache.entries[
+        os.path.abspath(yaml_path)
+    ]._replace(cached_at_ns=10**18 + RACY_MODIFICATION_WINDOW_NS // 2)
+
+    assert cache.load(yaml_path, ordered_load) == {
+        "datasets": [{"dataset": "dataset 2"}]
+    }
+
+
+def test_yaml_cache_ignores_corrupted_files(yaml_path: str, cache_folder: str):
+    cache = YamlCache(cache_folder)
+    cache.load(yaml_path, ordered_load)
+    cache.save()
+    content_hash = cache.entries[os.path.abspath(yaml_path)].content_hash
+    with open(cache.get_content_file(content_hash), "wb") as content_file:
+        content_file.write(b"not a pickle")
+    assert YamlCache(cache_folder).load(yaml_path, ordered_load) == {
+        "datasets": [{"dataset": "dataset 1"}]
+    }
+
+    with open(cache.index_file, "wb") as index:
+        index.write(b"not a pickle")
+    assert YamlCache(cache_folder).entries == {}
+
+
+def test_yaml_cache_keeps_contents_out_of_memory(
+    yaml_path: str, cache_folder: str, tmp_path
+):
+    other_path = os.path.join(tmp_path, "other_monitors.yaml")
+    write_yaml(other_path, "datasets:\n- dataset: dataset 2\n")
+    cache = YamlCache(cache_folder)
+    cache.load(yaml_path, ordered_load)
+    cache.load(other_path, ordered_load)
+    # Only the modification time, size and content hash of the files are indexed
+    assert all(
+        isinstance(value, (int, str))
+        for entry in cache.entries.values()
+        for value in entry
+    )
+    assert len(os.listdir(cache_folder)) == 2
+
+    os.remove(other_path)
+    cache.save()
+    assert sorted(os.listdir(cache_folder)) == sorted(
+        [
+            "index.pickle",
+            os.path.basename(
+                cache.get_content_file(
+                    cache.entries[os.path.abspath(yaml_path)].content_hash
+                )
+            ),
+        ]
+    )
+
+
+def test_yaml_cache_loads_empty_files(tmp_path, cache_folder: str):
+    path = os.path.join(tmp_path, "empty.yaml")
+    write_yaml(path, "")
+    cache = YamlCache(cache_folder)
+    assert cache.load(path, ordered_load) is None
+    parse = Mock(side_effect=ordered_load)
+    assert cache.load(path, parse) is None
+    parse.assert_not_called()
+
+
+def test_read_yaml_file_uses_active_cache(yaml_path: str, cache_folder: str):
+    with use_yaml_cache(cache_folder) as cache:
+        assert get_active_yaml_cache() is cache
+        assert read_yaml_file(yaml_path) == {"datasets": [{"dataset": "dataset 1"}]}
+    assert get_active_yaml_cache() is None
+    assert os.path.abspath(yaml_path) in YamlCache(cache_folder).entries
@@ -5,32 +5,33 @@ import yaml
 
 from termcolor import colored
 
+from sifflet.yaml_backend import (
+    OrderedDumper,
+    OrderedLoader,
+    build_ordered_dumper,
+    build_ordered_loader,
+)
+from sifflet.yaml_cache import get_active_yaml_cache
 
-def ordered_load(stream, loader=yaml.SafeLoader) -> OrderedDict:
-    class OrderedLoader(loader):
-        pass
 
-    def construct_mapping(loader, node):
-        loader.flatten_mapping(node)
-        return OrderedDict(loader.construct_pairs(node))
-
-    OrderedLoader.add_constructor(
-        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping
-    )
-    return yaml.load(stream, OrderedLoader)
+def ordered_load(stream, loader=None) -> OrderedDict:
+    """
+    Loads a yaml document, reading mappings as OrderedDict. The loader built at
+    import time is used, unless another base loader is given.
+    """
+    ordered_loader = OrderedLoader if loader is None else build_ordered_loader(loader)
+    return yaml.load(stream, ordered_loader)
 
 
 def ordered_dump(
-    data: t.Union[OrderedDict, t.TypedDict], stream=None, dumper=yaml.SafeDumper, **kwds
+    data: t.Union[OrderedDict, t.TypedDict], stream=None, dumper=None, **kwds
 ) -> str:
-    class OrderedDumper(dumper):
-        pass
-
-    def _ordered_dict_representer(dumper, data):
-        return dumper.represent_dict(data.items())
-
-    OrderedDumper.add_representer(OrderedDict, _ordered_dict_representer)
-    return yaml.dump(data, stream, OrderedDumper, **kwds)
+    """
+    Dumps a yaml document, writing OrderedDict as plain mappings. The dumper built
+    at import time is used, unless another base dumper is given.
+    """
+    ordered_dumper = OrderedDumper if dumper is None else build_ordered_dumper(dumper)
+    return yaml.dump(data, stream, ordered_dumper, **kwds)
 
 
 def dump_dict_to_yaml_file(file: str, data: t.Union[OrderedDict, t.TypedDict]) -> None:
@@ -47,9 +48,13 @@ def read_yaml_file(file: str) -> OrderedDict:
         raise FileNotFoundError(
             f"Could not find file {file}. Please make sure the file exists."
         )
+    yaml_cache = get_active_yaml_cache()
     try:
-        with open(file, "r", encoding="utf-8") as file_loaded:
-            file_content = ordered_load(file_loaded)
+        if yaml_cache is not None:
+            file_content = yaml_cache.load(file, ordered_load)
+        else:
+            with open(file, "r", encoding="utf-8") as file_loaded:
+                file_content = ordered_load(file_loaded)
     except Exception as exc:
         raise Exception(  # pylint: disable=broad-exception-raised
             f"Error loading file {file}. Please make sure the file has a valid format."
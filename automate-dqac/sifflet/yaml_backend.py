@@ -0,0 +1,71 @@
+"""
+The yaml loader and dumper used by the project. They are built once, on top of the
+libyaml C implementation when PyYAML was compiled with it, and on top of the pure
+Python implementation otherwise. Both produce the same documents.
+"""
+
+from collections import OrderedDict
+import typing as t
+
+import yaml
+
+from sifflet.layered_values import LayeredValues
+from sifflet.source_marks import SourceMark, set_source_mark
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+
+    LIBYAML_AVAILABLE = True
+except ImportError:  # PyYAML was installed without libyaml
+    from yaml import SafeDumper, SafeLoader  # type: ignore
+
+    LIBYAML_AVAILABLE = False
+
+
+def build_ordered_loader(loader: t.Type[t.Any]) -> t.Type[t.Any]:
+    """
+    Returns:
+        type: A subclass of the loader reading mappings as OrderedDict, and
+            recording their positions in the source marks index
+    """
+
+    class OrderedLoader(loader):  # type: ignore
+        pass
+
+    def construct_mapping(loader, node):
+        loader.flatten_mapping(node)
+        mapping = OrderedDict(loader.construct_pairs(node))
+        set_source_mark(
+            mapping, SourceMark(node.start_mark.line + 1, node.start_mark.column + 1)
+        )
+        return mapping
+
+    OrderedLoader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, construct_mapping
+    )
+    return OrderedLoader
+
+
+def build_ordered_dumper(dumper: t.Type[t.Any]) -> t.Type[t.Any]:
+    """
+    Returns:
+        type: A subclass of the dumper writing OrderedDict and merged values views
+            as plain mappings
+    """
+
+    class OrderedDumper(dumper):  # type: ignore
+        pass
+
+    def _ordered_dict_representer(dumper, data):
+        return dumper.represent_dict(data.items())
+
+    OrderedDumper.add_representer(OrderedDict, _ordered_dict_representer)
+    OrderedDumper.add_representer(LayeredValues, _ordered_dict_representer)
+    return OrderedDumper
+
+
+OrderedLoader = build_ordered_loader(SafeLoader)
+OrderedDumper = build_ordered_dumper(SafeDumper)
+# Pure Python versions, used when the C implementation is not available
+PureOrderedLoader = build_ordered_loader(yaml.SafeLoader)
+PureOrderedDumper = build_ordered_dumper(yaml.SafeDumper)
@@ -0,0 +1,207 @@
+"""
+Cache of the parsed yaml files, persisted between commands in a folder. The index
+only holds the modification time, size and content hash of each file, and the
+parsed content of each file is pickled in its own file of the folder, named after
+the content hash. Contents are read from the folder when they are needed, so the
+memory used by the cache does not grow with the number of files read.
+
+A file whose modification time and size did not change is not read at all.
+Otherwise, e.g. after a fresh checkout that touched every file, its content hash
+is checked before parsing it again. The positions of the mappings in the file are
+stored with the content, so that errors can point to them on cache hits too.
+"""
+
+from contextlib import contextmanager
+import hashlib
+import os
+import pickle
+import time
+import typing as t
+from typing import Dict, NamedTuple, Optional
+
+from sifflet.renderer.database import write_bytes_atomically
+from sifflet.source_marks import collect_source_marks, set_source_mark
+
+CACHE_VERSION = 3
+INDEX_FILENAME = "index.pickle"
+CONTENT_EXTENSION = ".pickle"
+# Files modified this close to their caching may be modified again without their
+# modification time changing, so their content hash is always checked
+RACY_MODIFICATION_WINDOW_NS = 2 * 10**9
+# Returned for the contents missing from the cache, as a yaml file may be empty
+MISSING = object()
+
+
+class CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+    cached_at_ns: int
+
+
+def load_content(pickled_content: bytes) -> t.Any:
+    """
+    Returns:
+        Any: The unpickled content, with the positions of its mappings recorded
+    """
+    content, source_marks = pickle.loads(pickled_content)
+    for value, mark in source_marks:
+        set_source_mark(value, mark)
+    return content
+
+
+class YamlCache:
+    """
+    Parsed yaml files, by absolute path. Every lookup returns a new copy of the
+    content, so that callers can modify it.
+
+    Args:
+        cache_folder (str): The path of the folder persisting the cache
+    """
+
+    def __init__(self, cache_folder: str) -> None:
+        self.cache_folder = cache_folder
+        self.index_file = os.path.join(cache_folder, INDEX_FILENAME)
+        self.entries = self.read_entries()
+        self.modified = False
+
+    def read_entries(self) -> Dict[str, CacheEntry]:
+        """
+        Returns:
+            dict: The persisted entries. The cache starts empty if the index is
+                missing, corrupted or written by another version.
+        """
+        try:
+            with open(self.index_file, "rb") as index:
+                version, entries = pickle.load(index)
+        except Exception:  # pylint: disable=broad-except
+            return {}
+        if version != CACHE_VERSION:
+            return {}
+        return {path: CacheEntry(*entry) for path, entry in entries.items()}
+
+    def get_content_file(self, content_hash: str) -> str:
+        return os.path.join(self.cache_folder, f"{content_hash}{CONTENT_EXTENSION}")
+
+    def read_content(self, content_hash: str) -> t.Any:
+        """
+        Returns:
+            Any: The cached content, or MISSING if its file is missing or corrupted
+        """
+        try:
+            with open(self.get_content_file(content_hash), "rb") as content_file:
+                return load_content(content_file.read())
+        except Exception:  # pylint: disable=broad-except
+            return MISSING
+
+    def write_content(self, content_hash: str, content: t.Any) -> None:
+        """
+        Writes the content through a renamed temporary file, without waiting for it
+        to reach the disk: a content lost in a crash is only parsed again.
+        """
+        if not os.path.exists(self.cache_folder):
+            os.makedirs(self.cache_folder, exist_ok=True)
+        content_file = self.get_content_file(content_hash)
+        tmp_file = f"{content_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "wb") as cache:
+            # The marked mappings are pickled once, and shared with the content
+            pickle.dump(
+                (content, collect_source_marks(content)), cache, pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_file, content_file)
+
+    def load(self, path: str, parse: t.Callable[[str], t.Any]) -> t.Any:
+        """
+        Returns the parsed content of a yaml file, from the cache if the file did not
+        change.
+
+        Args:
+            path (str): The path of the yaml file
+            parse (Callable): Parses the content of the file on cache misses
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if (
+            entry is not None
+            and entry.mtime_ns == stat.st_mtime_ns
+            and entry.size == stat.st_size
+            and entry.mtime_ns + RACY_MODIFICATION_WINDOW_NS < entry.cached_at_ns
+        ):
+            content = self.read_content(entry.content_hash)
+            if content is not MISSING:
+                return content
+
+        with open(path, "rb") as yaml_file:
+            raw_content = yaml_file.read()
+        content_hash = hashlib.sha256(raw_content).hexdigest()
+        # Contents are stored by hash, so they may have been cached for another path
+        content = self.read_content(content_hash)
+        if content is MISSING:
+            content = parse(raw_content.decode("utf-8"))
+            self.write_content(content_hash, content)
+        self.entries[path] = CacheEntry(
+            stat.st_mtime_ns, stat.st_size, content_hash, time.time_ns()
+        )
+        self.modified = True
+        return content
+
+    def save(self) -> None:
+        """
+        Persists the index, without the files that were deleted, and removes the
+        contents that are not indexed anymore.
+        """
+        if not self.modified:
+            return
+        self.entries = {
+            path: entry for path, entry in self.entries.items() if os.path.isfile(path)
+        }
+        if not os.path.exists(self.cache_folder):
+            os.makedirs(self.cache_folder, exist_ok=True)
+        entries = {path: tuple(entry) for path, entry in self.entries.items()}
+        write_bytes_atomically(
+            self.index_file,
+            pickle.dumps((CACHE_VERSION, entries), pickle.HIGHEST_PROTOCOL),
+        )
+        content_files = {
+            os.path.basename(self.get_content_file(entry.content_hash))
+            for entry in self.entries.values()
+        }
+        for filename in os.listdir(self.cache_folder):
+            if (
+                filename.endswith(CONTENT_EXTENSION)
+                and filename != INDEX_FILENAME
+                and filename not in content_files
+            ):
+                os.remove(os.path.join(self.cache_folder, filename))
+        self.modified = False
+
+
+# Cache used by read_yaml_file, if any
+ACTIVE_YAML_CACHE: Optional[YamlCache] = None
+
+
+def get_active_yaml_cache() -> Optional[YamlCache]:
+    return ACTIVE_YAML_CACHE
+
+
+@contextmanager
+def use_yaml_cache(cache_folder: Optional[str]) -> t.Iterator[Optional[YamlCache]]:
+    """
+    Caches the yaml files read while the block runs, and persists the cache when
+    it ends. Nothing is cached if cache_folder is None.
+
+    Args:
+        cache_folder (str): The path of the folder persisting the cache
+    """
+    global ACTIVE_YAML_CACHE  # pylint: disable=global-statement
+    if cache_folder is None:
+        yield None
+        return
+    previous_cache = ACTIVE_YAML_CACHE
+    ACTIVE_YAML_CACHE = YamlCache(cache_folder)
+    try:
+        yield ACTIVE_YAML_CACHE
+        ACTIVE_YAML_CACHE.save()
+    finally:
+        ACTIVE_YAML_CACHE = previous_cache